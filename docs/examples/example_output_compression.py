@@ -0,0 +1,182 @@
+"""Benchmark of the compression, quantization and filter options of ParticleFile output.
+
+Runs the same diffusion simulation with each of the encodings in ENCODINGS, and reports
+the write throughput (of the uncompressed output) and the size reduction of the store.
+"""
+
+import tempfile
+import time
+from argparse import ArgumentParser
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+import xarray as xr
+import zarr
+
+import parcels
+
+ptype = {"scipy": parcels.ScipyParticle, "jit": parcels.JITParticle}
+
+zstd = {"compressor": "zstd", "clevel": 5, "shuffle": "bit"}
+ENCODINGS = {
+    "default": ("dense", None),
+    "zstd-bitshuffle": (
+        "dense",
+        {var: zstd for var in ["lon", "lat", "depth", "time"]},
+    ),
+    "quantize-4": (
+        "dense",
+        {
+            "lon": {"quantize": 4, **zstd},
+            "lat": {"quantize": 4, **zstd},
+            "time": {"delta": True, **zstd},
+        },
+    ),
+    "bitround-12": (
+        "dense",
+        {
+            "lon": {"bitround": 12, **zstd},
+            "lat": {"bitround": 12, **zstd},
+            "time": {"delta": True, **zstd},
+        },
+    ),
+    "ragged-quantize-4-delta": (
+        "ragged",
+        {
+            "lon": {"quantize": 4, **zstd},
+            "lat": {"quantize": 4, **zstd},
+            "time": {"delta": True, **zstd},
+            "id": {"delta": True, **zstd},
+        },
+    ),
+}
+
+
+class TimedParticleFile(parcels.ParticleFile):
+    """ParticleFile that records the time that is spent writing its output."""
+
+    write_time = 0.0
+
+    def write(self, *args, **kwargs):
+        tic = time.perf_counter()
+        super().write(*args, **kwargs)
+        self.write_time += time.perf_counter() - tic
+
+    def flush(self):
+        tic = time.perf_counter()
+        super().flush()
+        self.write_time += time.perf_counter() - tic
+
+
+def diffusion_output(store, mode, npart, nobs, layout, encoding):
+    """Write the trajectories of npart diffusing particles at nobs outputs to store.
+
+    Returns the number of bytes of the (uncompressed) output, the number of bytes of
+    the store and the time spent writing.
+    """
+    fieldset = parcels.FieldSet.from_data(
+        {"U": 0, "V": 0}, {"lon": 0, "lat": 0}, mesh="spherical"
+    )
+    fieldset.add_field(parcels.Field("Kh_zonal", 100, lon=0, lat=0, mesh="spherical"))
+    fieldset.add_field(
+        parcels.Field("Kh_meridional", 100, lon=0, lat=0, mesh="spherical")
+    )
+    parcels.ParcelsRandom.seed(1234)
+    pset = parcels.ParticleSet(
+        fieldset=fieldset,
+        pclass=ptype[mode],
+        lon=np.linspace(-1, 1, npart),
+        lat=np.zeros(npart),
+    )
+    pfile = TimedParticleFile(
+        store,
+        pset,
+        outputdt=timedelta(hours=1),
+        chunks=(npart, 10),
+        layout=layout,
+        encoding=encoding,
+    )
+    pset.execute(
+        parcels.DiffusionUniformKh,
+        runtime=timedelta(hours=nobs - 1),
+        dt=timedelta(hours=1),
+        output_file=pfile,
+    )
+    pfile.close()
+
+    Z = zarr.open_group(store, mode="r")
+    nbytes = sum(a.nbytes for _, a in Z.arrays())
+    nbytes_stored = sum(a.nbytes_stored for _, a in Z.arrays())
+    return nbytes, nbytes_stored, pfile.write_time
+
+
+@pytest.mark.parametrize("mode", ["scipy", "jit"])
+def test_output_compression(mode, tmp_path):
+    sizes = {}
+    for name in ["default", "quantize-4", "ragged-quantize-4-delta"]:
+        layout, encoding = ENCODINGS[name]
+        store = tmp_path / f"{name}.zarr"
+        sizes[name] = diffusion_output(store, mode, 100, 20, layout, encoding)[1]
+        ds = xr.open_zarr(store)
+        if name == "default":
+            lon, times = ds["lon"].values, ds["time"].values
+        elif layout == "dense":
+            np.testing.assert_allclose(ds["lon"].values, lon, atol=1e-4)
+            # the delta encoding of the times is exact
+            np.testing.assert_array_equal(ds["time"].values, times)
+        else:
+            dense = parcels.RaggedTrajectories(store).to_dense()
+            # the dense layout is padded with NaN up to its chunks of observations
+            nobs = dense.sizes["obs"]
+            assert np.all(np.isnan(lon[:, nobs:]))
+            np.testing.assert_allclose(dense["lon"].values, lon[:, :nobs], atol=1e-4)
+            np.testing.assert_array_equal(dense["time"].values, times[:, :nobs])
+    assert sizes["quantize-4"] < sizes["default"]
+
+
+def main(args=None):
+    p = ArgumentParser(description="Benchmark of the encodings of ParticleFile output")
+    p.add_argument(
+        "mode",
+        choices=("scipy", "jit"),
+        nargs="?",
+        default="jit",
+        help="Execution mode for performing computation",
+    )
+    p.add_argument(
+        "-p", "--particles", type=int, default=1000, help="Number of particles"
+    )
+    p.add_argument("-n", "--nobs", type=int, default=50, help="Number of output steps")
+    p.add_argument(
+        "-o",
+        "--outdir",
+        default=None,
+        help="Directory in which the stores are kept (default: a temporary one)",
+    )
+    args = p.parse_args(args)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        outdir = Path(args.outdir or tmpdir)
+        print(
+            f"{'encoding':<25} {'MB':>8} {'stored MB':>10} {'reduction':>10} "
+            f"{'MB/s':>8}"
+        )
+        for name, (layout, encoding) in ENCODINGS.items():
+            nbytes, nbytes_stored, write_time = diffusion_output(
+                outdir / f"{name}.zarr",
+                args.mode,
+                args.particles,
+                args.nobs,
+                layout,
+                encoding,
+            )
+            print(
+                f"{name:<25} {nbytes / 1e6:8.2f} {nbytes_stored / 1e6:10.2f} "
+                f"{nbytes / nbytes_stored:9.1f}x {nbytes / 1e6 / write_time:8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
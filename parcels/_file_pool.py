@@ -0,0 +1,88 @@
+"""Pool of open datasets that the FileBuffers of Fields share, with the metadata decoded from them.
+
+See :meth:`parcels.fieldset.FieldSet.set_file_pool`.
+"""
+
+import threading
+from collections import OrderedDict
+
+__all__: list[str] = []
+
+
+class _FilePool:
+    """Reference-counted pool of open (xarray) datasets, keyed by (file name, netcdf engine, chunks, locking).
+
+    Datasets that are not used by any FileBuffer are kept open, up to max_open of them, and the least
+    recently used of them are closed when that number is exceeded. Datasets that are in use are never
+    closed by the pool, and do not count towards max_open.
+
+    The pool also keeps the time, coordinates and chunking that are decoded from each file (see
+    NetcdfFileBuffer.time, NetcdfFileBuffer.latlon and DaskFileBuffer.__enter__), so that these are
+    decoded once for all Fields that read from the same file, also after the dataset itself was closed.
+
+    Parameters
+    ----------
+    max_open : int
+        Maximum number of datasets that are kept open when they are not in use
+    """
+
+    def __init__(self, max_open=16):
+        self.max_open = max_open
+        self._datasets = OrderedDict()  # key -> dataset
+        self._refcount = {}  # key -> number of FileBuffers that use the dataset
+        self._metadata = {}  # (file name, netcdf engine, item) -> decoded time, coordinates or chunking
+        self._lock = threading.RLock()  # FileBuffers are also opened on the prefetch thread
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._datasets)
+
+    def acquire(self, key, open_dataset):
+        """Return the open dataset for key, opening it with open_dataset() if it is not in the pool."""
+        with self._lock:
+            if key in self._datasets:
+                self._datasets.move_to_end(key)
+                self._refcount[key] = self._refcount.get(key, 0) + 1
+                self.hits += 1
+                return self._datasets[key]
+        dataset = open_dataset()  # without the lock, so that different files can be opened in parallel
+        with self._lock:
+            if key in self._datasets:  # opened by another thread in the meantime
+                dataset.close()
+                self._datasets.move_to_end(key)
+            else:
+                self._datasets[key] = dataset
+            self._refcount[key] = self._refcount.get(key, 0) + 1
+            self.misses += 1
+            self._close_unused()
+            return self._datasets[key]
+
+    def release(self, key):
+        """Release a dataset that was returned by acquire, closing unused datasets if there are too many."""
+        with self._lock:
+            self._refcount[key] -= 1
+            if self._refcount[key] == 0:
+                del self._refcount[key]
+            self._close_unused()
+
+    def _close_unused(self):
+        unused = [key for key in self._datasets if key not in self._refcount]
+        for key in unused[: max(0, len(unused) - self.max_open)]:
+            self._datasets.pop(key).close()
+
+    def metadata(self, key, compute):
+        """Return the metadata for key, computing it with compute() the first time that it is requested."""
+        with self._lock:
+            if key in self._metadata:
+                return self._metadata[key]
+        metadata = compute()
+        with self._lock:
+            return self._metadata.setdefault(key, metadata)
+
+    def clear(self):
+        """Close all datasets that are not in use, and forget the decoded metadata."""
+        with self._lock:
+            for key in [key for key in self._datasets if key not in self._refcount]:
+                self._datasets.pop(key).close()
+            self._metadata.clear()
@@ -11,6 +11,7 @@ from parcels._typing import (
 from parcels.tools.statuscodes import (
     FieldOutOfBoundError,
     FieldOutOfBoundSurfaceError,
+    StatusCode,
     _raise_field_out_of_bound_error,
     _raise_field_out_of_bound_surface_error,
     _raise_field_sampling_error,
@@ -18,11 +19,26 @@ from parcels.tools.statuscodes import (
 
 from .grid import GridType
 
+# Number of steps after which the walk through a curvilinear grid jumps to the cell given by its search index
+_SEARCH_INDEX_MAX_WALK = 10
+
 if TYPE_CHECKING:
     from .field import Field
     from .grid import Grid
 
 
+def _search_axis_index(coords: np.ndarray, value: float) -> int:
+    """Index of the cell of the monotonic coordinate array coords that contains value, found by bisection.
+
+    Values beyond the ends of coords are assigned to the first or last cell.
+    """
+    if coords[-1] >= coords[0]:
+        i = np.searchsorted(coords, value, side="left")
+    else:
+        i = len(coords) - np.searchsorted(coords[::-1], value, side="right")
+    return int(np.clip(i - 1, 0, len(coords) - 2))
+
+
 def search_indices_vertical_z(grid: Grid, gridindexingtype: GridIndexingType, z: float):
     if grid.depth[-1] > grid.depth[0]:
         if z < grid.depth[0]:
@@ -36,21 +52,13 @@ def search_indices_vertical_z(grid: Grid, gridindexingtype: GridIndexingType, z:
             if gridindexingtype in ["croco"] and z < 0:
                 return (-2, 1)
             _raise_field_out_of_bound_error(z, None, None)
-        depth_indices = grid.depth < z
-        if z >= grid.depth[-1]:
-            zi = len(grid.depth) - 2
-        else:
-            zi = depth_indices.argmin() - 1 if z > grid.depth[0] else 0
+        zi = _search_axis_index(grid.depth, z)
     else:
         if z > grid.depth[0]:
             _raise_field_out_of_bound_surface_error(z, None, None)
         elif z < grid.depth[-1]:
             _raise_field_out_of_bound_error(z, None, None)
-        depth_indices = grid.depth > z
-        if z <= grid.depth[-1]:
-            zi = len(grid.depth) - 2
-        else:
-            zi = depth_indices.argmin() - 1 if z < grid.depth[0] else 0
+        zi = _search_axis_index(grid.depth, z)
     zeta = (z - grid.depth[zi]) / (grid.depth[zi + 1] - grid.depth[zi])
     while zeta > 1:
         zi += 1
@@ -111,21 +119,13 @@ def search_indices_vertical_s(
             _raise_field_out_of_bound_error(z, None, None)
         elif z > depth_vector[-1]:
             _raise_field_out_of_bound_error(z, None, None)
-        depth_indices = depth_vector < z
-        if z >= depth_vector[-1]:
-            zi = len(depth_vector) - 2
-        else:
-            zi = depth_indices.argmin() - 1 if z > depth_vector[0] else 0
+        zi = _search_axis_index(depth_vector, z)
     else:
         if z > depth_vector[0]:
             _raise_field_out_of_bound_error(z, None, None)
         elif z < depth_vector[-1]:
             _raise_field_out_of_bound_error(z, None, None)
-        depth_indices = depth_vector > z
-        if z <= depth_vector[-1]:
-            zi = len(depth_vector) - 2
-        else:
-            zi = depth_indices.argmin() - 1 if z < depth_vector[0] else 0
+        zi = _search_axis_index(depth_vector, z)
     zeta = (z - depth_vector[zi]) / (depth_vector[zi + 1] - depth_vector[zi])
     while zeta > 1:
         zi += 1
@@ -149,11 +149,7 @@ def _search_indices_rectilinear(
 
     if grid.xdim > 1:
         if grid.mesh != "spherical":
-            lon_index = grid.lon < x
-            if lon_index.all():
-                xi = len(grid.lon) - 2
-            else:
-                xi = lon_index.argmin() - 1 if lon_index.any() else 0
+            xi = _search_axis_index(grid.lon, x)
             xsi = (x - grid.lon[xi]) / (grid.lon[xi + 1] - grid.lon[xi])
             if xsi < 0:
                 xi -= 1
@@ -169,11 +165,7 @@ def _search_indices_rectilinear(
             if x < lon_fixed[0]:
                 lon_fixed -= 360
 
-            lon_index = lon_fixed < x
-            if lon_index.all():
-                xi = len(lon_fixed) - 2
-            else:
-                xi = lon_index.argmin() - 1 if lon_index.any() else 0
+            xi = _search_axis_index(lon_fixed, x)
             xsi = (x - lon_fixed[xi]) / (lon_fixed[xi + 1] - lon_fixed[xi])
             if xsi < 0:
                 xi -= 1
@@ -185,11 +177,7 @@ def _search_indices_rectilinear(
         xi, xsi = -1, 0
 
     if grid.ydim > 1:
-        lat_index = grid.lat < y
-        if lat_index.all():
-            yi = len(grid.lat) - 2
-        else:
-            yi = lat_index.argmin() - 1 if lat_index.any() else 0
+        yi = _search_axis_index(grid.lat, y)
 
         eta = (y - grid.lat[yi]) / (grid.lat[yi + 1] - grid.lat[yi])
         if eta < 0:
@@ -225,15 +213,103 @@ def _search_indices_rectilinear(
     return (zeta, eta, xsi, zi, yi, xi)
 
 
+def _search_sorted_axis(coords: np.ndarray, values: np.ndarray):
+    """Index of the cell in the increasing coordinate array coords containing each of values, and the relative position in that cell."""
+    i = np.clip(np.searchsorted(coords, values, side="left") - 1, 0, len(coords) - 2)
+    return i, (values - coords[i]) / (coords[i + 1] - coords[i])
+
+
+def _search_indices_vertical_z_array(grid: Grid, gridindexingtype: GridIndexingType, z: np.ndarray, flag):
+    """Vectorized version of search_indices_vertical_z, flagging the StatusCode of positions outside the depth range."""
+    depth = grid.depth
+    if depth[-1] > depth[0]:
+        above = z < depth[0]
+        if gridindexingtype == "mom5":
+            # Since MOM5 is indexed at cell bottom, allow z at depth[0] - dz where dz = (depth[1] - depth[0])
+            mom5_top = above & (z > 2 * depth[0] - depth[1])
+            above &= ~mom5_top
+        flag(above, StatusCode.ErrorThroughSurface)
+        flag(z > depth[-1], StatusCode.ErrorOutOfBounds)
+        zi, zeta = _search_sorted_axis(depth, z)
+        if gridindexingtype == "mom5":
+            zi = np.where(mom5_top, -1, zi)
+            zeta = np.where(mom5_top, z / depth[0], zeta)
+    else:
+        flag(z > depth[0], StatusCode.ErrorThroughSurface)
+        flag(z < depth[-1], StatusCode.ErrorOutOfBounds)
+        zi, zeta = _search_sorted_axis(-depth, -z)
+    return zi, zeta
+
+
+def _search_indices_rectilinear_array(field: Field, z: np.ndarray, y: np.ndarray, x: np.ndarray, search2D=False):
+    """Vectorized version of _search_indices_rectilinear for arrays of positions on a RectilinearZGrid.
+
+    Instead of raising an error, the StatusCode of positions that can not be found in the grid
+    is returned in an array of errors (StatusCode.Success for positions that are found).
+    """
+    grid = field.grid
+    errors = np.full(x.shape, StatusCode.Success, dtype=np.int32)
+
+    def flag(mask, code):
+        errors[mask & (errors == StatusCode.Success)] = code
+
+    if grid.xdim > 1 and (not grid.zonal_periodic):
+        flag((x < grid.lonlat_minmax[0]) | (x > grid.lonlat_minmax[1]), StatusCode.ErrorOutOfBounds)
+    if grid.ydim > 1:
+        flag((y < grid.lonlat_minmax[2]) | (y > grid.lonlat_minmax[3]), StatusCode.ErrorOutOfBounds)
+
+    if grid.xdim > 1:
+        lon = grid.lon
+        if grid.mesh == "spherical":
+            lon = grid.lon.copy()
+            indices = lon >= lon[0]
+            if not indices.all():
+                lon[indices.argmin() :] += 360
+            x = np.where(x < lon[0], x + 360, x)
+        xi, xsi = _search_sorted_axis(lon, x)
+    else:
+        xi, xsi = np.full(x.shape, -1), np.zeros(x.shape)
+
+    if grid.ydim > 1:
+        yi, eta = _search_sorted_axis(grid.lat, y)
+    else:
+        yi, eta = np.full(y.shape, -1), np.zeros(y.shape)
+
+    if grid.zdim > 1 and not search2D:
+        zi, zeta = _search_indices_vertical_z_array(grid, field.gridindexingtype, z, flag)
+    else:
+        zi, zeta = np.full(z.shape, -1), np.zeros(z.shape)
+
+    flag(~((0 <= xsi) & (xsi <= 1) & (0 <= eta) & (eta <= 1) & (0 <= zeta) & (zeta <= 1)), StatusCode.Error)
+
+    return (zeta, eta, xsi, zi, yi, xi, errors)
+
+
+def _rectilinear_axes_increasing(grid: Grid) -> bool:
+    """Whether the (unwrapped) coordinates of a rectilinear grid are increasing, as _search_indices_rectilinear_array assumes."""
+    lon, lat, depth = (np.atleast_1d(c) for c in (grid.lon, grid.lat, grid.depth))
+    if grid.mesh == "spherical":
+        lon = lon.copy()
+        indices = lon >= lon[0]
+        if not indices.all():
+            lon[indices.argmin() :] += 360
+    if depth[-1] < depth[0]:
+        depth = -depth
+    return all(np.all(np.diff(c) > 0) for c in [lon, lat, depth])
+
+
 def _search_indices_curvilinear(field: Field, time, z, y, x, ti=-1, particle=None, search2D=False):
+    grid = field.grid
     if particle:
         xi = particle.xi[field.igrid]
         yi = particle.yi[field.igrid]
     else:
-        xi = int(field.grid.xdim / 2) - 1
-        yi = int(field.grid.ydim / 2) - 1
+        xi = yi = -1
+    # New particles (with xi = yi = -1, i.e. not searched before) start their walk from the search index of the grid
+    guessed = xi < 0 or yi < 0
+    if guessed:
+        (yi, xi) = (int(i) for i in grid.search_index.guess(x, y))
     xsi = eta = -1.0
-    grid = field.grid
     invA = np.array([[1, 0, 0, 0], [-1, 1, 0, 0], [-1, 0, 0, 1], [1, -1, 1, -1]])
     maxIterSearch = 1e6
     it = 0
@@ -248,6 +324,9 @@ def _search_indices_curvilinear(field: Field, time, z, y, x, ti=-1, particle=Non
         _raise_field_out_of_bound_error(z, y, x)
 
     while xsi < -tol or xsi > 1 + tol or eta < -tol or eta > 1 + tol:
+        if it == _SEARCH_INDEX_MAX_WALK and not guessed:
+            (yi, xi) = (int(i) for i in grid.search_index.guess(x, y))
+            guessed = True
         px = np.array([grid.lon[yi, xi], grid.lon[yi, xi + 1], grid.lon[yi + 1, xi + 1], grid.lon[yi + 1, xi]])
         if grid.mesh == "spherical":
             px[0] = px[0] + 360 if px[0] < x - 225 else px[0]
@@ -317,6 +396,113 @@ def _search_indices_curvilinear(field: Field, time, z, y, x, ti=-1, particle=Non
     return (zeta, eta, xsi, zi, yi, xi)
 
 
+def _search_indices_curvilinear_array(
+    field: Field, z: np.ndarray, y: np.ndarray, x: np.ndarray, xi=None, yi=None, search2D=False
+):
+    """Vectorized version of _search_indices_curvilinear for arrays of positions on a CurvilinearZGrid.
+
+    All positions walk through the grid at once, starting from the cells xi and yi (if given) or otherwise
+    from the centre of the grid. As in _search_indices_rectilinear_array, the StatusCode of positions
+    that can not be found in the grid is returned in an array of errors.
+    """
+    grid = field.grid
+    errors = np.full(x.shape, StatusCode.Success, dtype=np.int32)
+
+    def flag(mask, code):
+        errors[mask & (errors == StatusCode.Success)] = code
+
+    xi = np.full(x.shape, -1, dtype=np.intp) if xi is None else np.asarray(xi, dtype=np.intp)
+    yi = np.full(x.shape, -1, dtype=np.intp) if yi is None else np.asarray(yi, dtype=np.intp)
+    # Positions without a cell to start from (with xi or yi = -1) start their walk from the search index of the grid
+    guessed = (xi < 0) | (yi < 0)
+    xi, yi = np.clip(xi, 0, grid.xdim - 2), np.clip(yi, 0, grid.ydim - 2)
+    yi[guessed], xi[guessed] = grid.search_index.guess(x[guessed], y[guessed])
+    xsi = np.full(x.shape, -1.0)
+    eta = np.full(x.shape, -1.0)
+    invA = np.array([[1, 0, 0, 0], [-1, 1, 0, 0], [-1, 0, 0, 1], [1, -1, 1, -1]])
+    maxIterSearch = 1e6
+    tol = 1.0e-10
+    if not grid.zonal_periodic:
+        outside = (x < grid.lonlat_minmax[0]) | (x > grid.lonlat_minmax[1])
+        if grid.lon[0, 0] < grid.lon[0, -1]:
+            flag(outside, StatusCode.ErrorOutOfBounds)
+        else:  # This prevents from crashing in [160, -160]
+            flag(outside & (x < grid.lon[0, 0]) & (x > grid.lon[0, -1]), StatusCode.ErrorOutOfBounds)
+    flag(
+        (y < grid.lonlat_minmax[2]) | (y > grid.lonlat_minmax[3]) | np.isnan(x) | np.isnan(y),
+        StatusCode.ErrorOutOfBounds,
+    )
+
+    active = np.flatnonzero(errors == StatusCode.Success)
+    it = 0
+    while len(active) > 0:
+        if it == _SEARCH_INDEX_MAX_WALK:
+            jump = active[~guessed[active]]
+            yi[jump], xi[jump] = grid.search_index.guess(x[jump], y[jump])
+            guessed[jump] = True
+        xa, ya, i, j = x[active], y[active], xi[active], yi[active]
+        px = np.array([grid.lon[j, i], grid.lon[j, i + 1], grid.lon[j + 1, i + 1], grid.lon[j + 1, i]])
+        if grid.mesh == "spherical":
+            px[0] = np.where(px[0] < xa - 225, px[0] + 360, px[0])
+            px[0] = np.where(px[0] > xa + 225, px[0] - 360, px[0])
+            px[1:] = np.where(px[1:] - px[0] > 180, px[1:] - 360, px[1:])
+            px[1:] = np.where(-px[1:] + px[0] > 180, px[1:] + 360, px[1:])
+        py = np.array([grid.lat[j, i], grid.lat[j, i + 1], grid.lat[j + 1, i + 1], grid.lat[j + 1, i]])
+        a = np.dot(invA, px)
+        b = np.dot(invA, py)
+
+        aa = a[3] * b[2] - a[2] * b[3]
+        bb = a[3] * b[0] - a[0] * b[3] + a[1] * b[2] - a[2] * b[1] + xa * b[3] - ya * a[3]
+        cc = a[1] * b[0] - a[0] * b[1] + xa * b[1] - ya * a[1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            det2 = bb * bb - 4 * aa * cc
+            e = np.where(det2 > 0, (-bb + np.sqrt(np.abs(det2))) / (2 * aa), eta[active])
+            e = np.where(np.abs(aa) < 1e-12, -cc / bb, e)  # Rectilinear cell, or quasi
+            xs = np.where(
+                np.abs(a[1] + a[3] * e) < 1e-12,  # this happens when recti cell rotated of 90deg
+                ((ya - py[0]) / (py[1] - py[0]) + (ya - py[3]) / (py[2] - py[3])) * 0.5,
+                (xa - a[0] - a[2] * e) / (a[1] + a[3] * e),
+            )
+        xsi[active] = xs
+        eta[active] = e
+        errors[active[(xs < 0) & (e < 0) & (i == 0) & (j == 0)]] = StatusCode.ErrorOutOfBounds
+        errors[active[(xs > 1) & (e > 1) & (i == grid.xdim - 1) & (j == grid.ydim - 1)]] = StatusCode.ErrorOutOfBounds
+
+        i = np.where(xs < -tol, i - 1, np.where(xs > 1 + tol, i + 1, i))
+        j = np.where(e < -tol, j - 1, np.where(e > 1 + tol, j + 1, j))
+        # Vectorized version of _reconnect_bnd_indices
+        i = np.where(i < 0, grid.xdim - 2 if grid.mesh == "spherical" else 0, i)
+        i = np.where(i > grid.xdim - 2, 0 if grid.mesh == "spherical" else grid.xdim - 2, i)
+        j = np.where(j < 0, 0, j)
+        if grid.mesh == "spherical":
+            i = np.minimum(np.where(j > grid.ydim - 2, grid.xdim - i, i), grid.xdim - 2)
+        j = np.where(j > grid.ydim - 2, grid.ydim - 2, j)
+        xi[active] = i
+        yi[active] = j
+
+        found = (xs >= -tol) & (xs <= 1 + tol) & (e >= -tol) & (e <= 1 + tol)
+        active = active[~found & (errors[active] == StatusCode.Success)]
+        it += 1
+        if it > maxIterSearch:
+            print(f"Correct cell not found after {maxIterSearch} iterations")
+            errors[active] = StatusCode.ErrorOutOfBounds
+            break
+    xsi = np.clip(xsi, 0.0, 1.0)
+    eta = np.clip(eta, 0.0, 1.0)
+
+    if grid.zdim > 1 and not search2D:
+        zi, zeta = _search_indices_vertical_z_array(grid, field.gridindexingtype, z, flag)
+    else:
+        zi, zeta = np.full(z.shape, -1), np.zeros(z.shape)
+
+    flag(~((0 <= zeta) & (zeta <= 1)), StatusCode.Error)
+    errors_found = errors != StatusCode.Success
+    xi[errors_found] = np.clip(xi[errors_found], 0, grid.xdim - 2)
+    yi[errors_found] = np.clip(yi[errors_found], 0, grid.ydim - 2)
+
+    return (zeta, eta, xsi, zi, yi, xi, errors)
+
+
 def _reconnect_bnd_indices(yi: int, xi: int, ydim: int, xdim: int, sphere_mesh: bool):
     if xi < 0:
         if sphere_mesh:
@@ -79,6 +79,31 @@ _interpolator_registry_2d: dict[str, Callable[[InterpolationContext2D], float]]
 _interpolator_registry_3d: dict[str, Callable[[InterpolationContext3D], float]] = {}
 
 
+# Interpolation methods whose interpolators also work on arrays of indices and coordinates
+_ARRAY_INTERP_METHODS_2D = {
+    "nearest",
+    "linear",
+    "linear_invdist_land_tracer",
+    "bgrid_velocity",
+    "partialslip",
+    "freeslip",
+    "cgrid_tracer",
+    "bgrid_tracer",
+}
+_ARRAY_INTERP_METHODS_3D = {
+    "nearest",
+    "linear",
+    "linear_invdist_land_tracer",
+    "partialslip",
+    "freeslip",
+    "cgrid_velocity",
+    "bgrid_velocity",
+    "bgrid_w_velocity",
+    "cgrid_tracer",
+    "bgrid_tracer",
+}
+
+
 def get_2d_interpolator_registry() -> Mapping[str, Callable[[InterpolationContext2D], float]]:
     # See Discussion on Python Discord for more context (function prevents re-alias of global variable)
     # _interpolator_registry_2d etc shouldn't be imported directly
@@ -108,8 +133,8 @@ def register_3d_interpolator(name: str):
 
 @register_2d_interpolator("nearest")
 def _nearest_2d(ctx: InterpolationContext2D) -> float:
-    xii = ctx.xi if ctx.xsi <= 0.5 else ctx.xi + 1
-    yii = ctx.yi if ctx.eta <= 0.5 else ctx.yi + 1
+    xii = np.where(ctx.xsi <= 0.5, ctx.xi, ctx.xi + 1)
+    yii = np.where(ctx.eta <= 0.5, ctx.yi, ctx.yi + 1)
     return ctx.data[ctx.ti, yii, xii]
 
 
@@ -139,6 +164,9 @@ def _linear_invdist_land_tracer_2d(ctx: InterpolationContext2D) -> float:
     yi = ctx.yi
     xi = ctx.xi
     ti = ctx.ti
+    if np.ndim(xi) > 0:
+        corners = [(0, j, i) for j in range(2) for i in range(2)]
+        return _linear_invdist_land_tracer_array(ctx.data[ti][np.newaxis], 0, eta, xsi, 0, yi, xi, corners)
     land = np.isclose(data[ti, yi : yi + 2, xi : xi + 2], 0.0)
     nb_land = np.sum(land)
 
@@ -171,9 +199,9 @@ def _tracer_2d(ctx: InterpolationContext2D) -> float:
 
 @register_3d_interpolator("nearest")
 def _nearest_3d(ctx: InterpolationContext3D) -> float:
-    xii = ctx.xi if ctx.xsi <= 0.5 else ctx.xi + 1
-    yii = ctx.yi if ctx.eta <= 0.5 else ctx.yi + 1
-    zii = ctx.zi if ctx.zeta <= 0.5 else ctx.zi + 1
+    xii = np.where(ctx.xsi <= 0.5, ctx.xi, ctx.xi + 1)
+    yii = np.where(ctx.eta <= 0.5, ctx.yi, ctx.yi + 1)
+    zii = np.where(ctx.zeta <= 0.5, ctx.zi, ctx.zi + 1)
     return ctx.data[ctx.ti, zii, yii, xii]
 
 
@@ -191,6 +219,11 @@ def _cgrid_velocity_3d(ctx: InterpolationContext3D) -> float:
 
 @register_3d_interpolator("linear_invdist_land_tracer")
 def _linear_invdist_land_tracer_3d(ctx: InterpolationContext3D) -> float:
+    if np.ndim(ctx.xi) > 0:
+        corners = [(k, j, i) for k in range(2) for j in range(2) for i in range(2)]
+        return _linear_invdist_land_tracer_array(
+            ctx.data[ctx.ti], ctx.zeta, ctx.eta, ctx.xsi, ctx.zi, ctx.yi, ctx.xi, corners
+        )
     land = np.isclose(ctx.data[ctx.ti, ctx.zi : ctx.zi + 2, ctx.yi : ctx.yi + 2, ctx.xi : ctx.xi + 2], 0.0)
     nb_land = np.sum(land)
     if nb_land == 8:
@@ -221,15 +254,51 @@ def _linear_invdist_land_tracer_3d(ctx: InterpolationContext3D) -> float:
         return (1 - ctx.zeta) * f0 + ctx.zeta * f1
 
 
+def _linear_invdist_land_tracer_array(data, zeta, eta, xsi, zi, yi, xi, corners):
+    """Vectorized version of the linear_invdist_land_tracer interpolators, for arrays of indices.
+
+    Values at the corners (k, j, i) of the cells are weighted by inverse distance, leaving out land (zero)
+    values, if some but not all corners are land. Otherwise, the cells are interpolated (bi-)linearly.
+    """
+    vals = np.array([data[zi + k, yi + j, xi + i] for k, j, i in corners], dtype=np.float64)
+    land = np.isclose(vals, 0.0)
+    nb_land = land.sum(axis=0)
+    distance = np.array([(zeta - k) ** 2 + (eta - j) ** 2 + (xsi - i) ** 2 for k, j, i in corners])
+    on_corner = np.isclose(distance, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weights = np.where(land | on_corner, 0.0, 1 / distance)
+        invdist = (weights * vals).sum(axis=0) / weights.sum(axis=0)
+    # index search led us directly onto a corner: use its value (zero if it is land)
+    corner_val = np.take_along_axis(np.where(land, 0.0, vals), np.argmax(on_corner, axis=0)[np.newaxis], axis=0)[0]
+    invdist = np.where(on_corner.any(axis=0), corner_val, invdist)
+
+    v = vals.reshape(-1, 4, *vals.shape[1:])  # layers of corners (j, i) = (0, 0), (0, 1), (1, 0), (1, 1)
+    f = (1 - xsi) * (1 - eta) * v[:, 0] + xsi * (1 - eta) * v[:, 1] + xsi * eta * v[:, 3] + (1 - xsi) * eta * v[:, 2]
+    linear = f[0] if len(f) == 1 else (1 - zeta) * f[0] + zeta * f[1]
+    return np.where(nb_land == len(corners), 0.0, np.where(nb_land > 0, invdist, linear))
+
+
+def _interp_on_unit_square_layer(*, eta: float, xsi: float, data: np.ndarray, zi: int, yi: int, xi: int) -> float:
+    """Interpolation on a unit square in layer zi of 3D data. Unlike slicing out the layer first, this also works for arrays of indices."""
+    return (
+        (1 - xsi) * (1 - eta) * data[zi, yi, xi]
+        + xsi * (1 - eta) * data[zi, yi, xi + 1]
+        + xsi * eta * data[zi, yi + 1, xi + 1]
+        + (1 - xsi) * eta * data[zi, yi + 1, xi]
+    )
+
+
 def _get_3d_f0_f1(*, eta: float, xsi: float, data: np.ndarray, zi: int, yi: int, xi: int) -> tuple[float, float | None]:
-    data_2d = data[zi, :, :]
-    f0 = _interp_on_unit_square(eta=eta, xsi=xsi, data=data_2d, yi=yi, xi=xi)
-    try:
-        data_2d = data[zi + 1, :, :]
-    except IndexError:
+    f0 = _interp_on_unit_square_layer(eta=eta, xsi=xsi, data=data, zi=zi, yi=yi, xi=xi)
+    if np.ndim(zi) > 0:
+        # POP indexing at edge of domain is handled per position in _z_layer_interp
+        f1 = _interp_on_unit_square_layer(
+            eta=eta, xsi=xsi, data=data, zi=np.minimum(zi + 1, data.shape[0] - 1), yi=yi, xi=xi
+        )
+    elif zi + 1 >= data.shape[0]:
         f1 = None  # POP indexing at edge of domain
     else:
-        f1 = _interp_on_unit_square(eta=eta, xsi=xsi, data=data_2d, yi=yi, xi=xi)
+        f1 = _interp_on_unit_square_layer(eta=eta, xsi=xsi, data=data, zi=zi + 1, yi=yi, xi=xi)
 
     return f0, f1
 
@@ -237,6 +306,14 @@ def _get_3d_f0_f1(*, eta: float, xsi: float, data: np.ndarray, zi: int, yi: int,
 def _z_layer_interp(
     *, zeta: float, f0: float, f1: float | None, zi: int, zdim: int, gridindexingtype: GridIndexingType
 ):
+    if np.ndim(zi) > 0:
+        assert f1 is not None, "f1 is the next layer (clipped to the last one) for arrays of positions"
+        values = np.asarray((1 - zeta) * f0 + zeta * f1)
+        if gridindexingtype == "pop":
+            values = np.where(zi >= zdim - 2, (1 - zeta) * f0, values)
+        elif gridindexingtype == "mom5":
+            values = np.where(zi == -1, zeta * f1, values)
+        return values
     if gridindexingtype == "pop" and zi >= zdim - 2:
         # Since POP is indexed at cell top, allow linear interpolation of W to zero in lowest cell
         return (1 - zeta) * f0
@@ -0,0 +1,225 @@
+"""Persistent index of the time stamps, coordinates and variables of the data files of Fields.
+
+Reading the time axis of every data file when a FieldSet is created can take minutes for datasets with
+thousands of files. The index stores the decoded time stamps of each file in a JSON file per file set,
+so that later runs only open the files that were added or changed since the index was written.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import uuid
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from parcels.fieldfilebuffer import _netcdf_lock
+from parcels.tools.warnings import FileWarning
+
+__all__: list[str] = []
+
+MAX_SCAN_WORKERS = 8
+
+
+def _file_stat(fname):
+    stat = os.stat(fname)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _encode_time(time):
+    """JSON representation of the time stamps of a file, or None if they can not be stored (e.g. cftime dates)."""
+    time = np.asarray(time)
+    if np.issubdtype(time.dtype, np.datetime64):
+        return {"dtype": str(time.dtype), "values": time.astype(np.int64).tolist()}
+    if np.issubdtype(time.dtype, np.number):
+        return {"dtype": str(time.dtype), "values": time.tolist()}
+    return None
+
+
+def _decode_time(encoded):
+    if np.issubdtype(np.dtype(encoded["dtype"]), np.datetime64):
+        return np.array(encoded["values"], dtype=np.int64).astype(encoded["dtype"])
+    return np.array(encoded["values"], dtype=encoded["dtype"])
+
+
+def _coordinate_hash(values):
+    values = np.ascontiguousarray(values)
+    h = hashlib.sha256(str(values.shape).encode("utf-8"))
+    h.update(values.tobytes())
+    return h.hexdigest()
+
+
+def _scan_file(_grid_fb_class, fname, dimensions, indices, netcdf_engine, file_pool=None):
+    """Open fname, and return its time stamps and its index entry (None if the time stamps can not be stored).
+
+    This is a module-level function, so that it can also run in the worker processes of _indexed_file_times.
+    """
+    with _grid_fb_class(fname, dimensions, indices, netcdf_engine=netcdf_engine, file_pool=file_pool) as filebuffer:
+        time = filebuffer.time
+        encoded = _encode_time(time)
+        if encoded is None:
+            return time, None
+        with filebuffer._file_lock():
+            dataset = filebuffer.dataset
+            coords = {}
+            for dim in ["lon", "lat", "depth"]:
+                name = dimensions.get(dim)
+                if isinstance(name, str) and name in dataset.variables:
+                    coords[name] = _coordinate_hash(dataset[name].values)
+            variables = {
+                name: {"dims": list(var.dims), "shape": list(var.shape), "dtype": str(var.dtype)}
+                for name, var in dataset.data_vars.items()
+                if name != "decoded"
+            }
+    return time, {"stat": _file_stat(fname), "time": encoded, "coords": coords, "variables": variables}
+
+
+class _MetadataIndex:
+    """Index of the time stamps, coordinates and variables of a set of data files, stored as JSON in directory.
+
+    Each file has an entry with its modification time and size (which invalidate the entry when the
+    file changes), its decoded time stamps, hashes of its lon, lat and depth coordinates, and the
+    dimensions, shape and dtype of its variables. The coordinates and variables of each file are compared
+    with those of a reference file of the set (see _indexed_file_times), as all files of a Field are read
+    on the grid of its first file.
+
+    Parameters
+    ----------
+    directory : str
+        Directory in which the index is stored
+    filenames : list of str
+        The data files of the set
+    dimensions : dict
+        Dimensions of the Field, of which the time dimension is read from the files
+    netcdf_engine : str
+        Engine with which the files are read
+    """
+
+    def __init__(self, directory, filenames, dimensions, netcdf_engine):
+        self.dimensions = dimensions
+        h = hashlib.sha256()
+        for part in [dimensions.get("time"), netcdf_engine, *[os.path.abspath(str(f)) for f in filenames]]:
+            h.update(str(part).encode("utf-8"))
+            h.update(b"\0")
+        self.path = os.path.join(directory, f"{h.hexdigest()}.json")
+        self.entries = {}
+        self.changed = False
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):  # no index yet, or a corrupt one
+            pass
+
+    def entry(self, fname):
+        """The entry of fname in the index, or None if fname is not in it or changed since it was indexed."""
+        entry = self.entries.get(os.path.abspath(str(fname)))
+        if entry is None or entry["stat"] != _file_stat(fname):
+            return None
+        return entry
+
+    def _layouts(self, entry):
+        """The layouts of the variables of an entry, without the length of the time dimension."""
+        layouts = {}
+        for name, var in entry.get("variables", {}).items():
+            time_dim = self.dimensions.get("time")
+            shape = [None if dim == time_dim else n for dim, n in zip(var["dims"], var["shape"], strict=True)]
+            layouts[name] = (var["dims"], shape, var["dtype"])
+        return layouts
+
+    def matches(self, entry, reference):
+        """Whether the coordinates and the variables that entry shares with reference have the same layout."""
+        if entry.get("coords") is None or entry["coords"] != reference.get("coords"):
+            return False
+        layouts, reference_layouts = self._layouts(entry), self._layouts(reference)
+        return all(layouts[name] == reference_layouts[name] for name in layouts.keys() & reference_layouts.keys())
+
+    def add(self, fname, entry):
+        self.entries[os.path.abspath(str(fname))] = entry
+        self.changed = True
+
+    def save(self):
+        """Write the index if it changed. It is replaced atomically, so that several processes can write it."""
+        if not self.changed:
+            return
+        tmp_path = f"{self.path}.{os.getpid()}-{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+            self.changed = False
+        except OSError:  # e.g. a read-only cache directory; the files are then scanned again in the next run
+            if os.path.isfile(tmp_path):
+                os.remove(tmp_path)
+
+
+def _scan_executor(netcdf_engine, nfiles):
+    """Executor on which nfiles files are scanned, or None if they are scanned one at a time.
+
+    Zarr stores are scanned on threads. netCDF files are scanned in (forked) processes, as the netCDF and HDF5
+    libraries are not thread-safe; without the fork start method they are scanned one at a time.
+    """
+    max_workers = min(MAX_SCAN_WORKERS, nfiles)
+    if max_workers < 2:
+        return None
+    if netcdf_engine == "zarr":
+        return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="parcels-index")
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return None
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("fork"))
+
+
+def _indexed_file_times(directory, data_filenames, _grid_fb_class, dimensions, indices, netcdf_engine, file_pool=None):
+    """The time stamps of each of the data files, from the index in directory when they are in it.
+
+    The first file is the reference of the set: the entries of the other files are only used when their
+    coordinates and variables match those of the first file. The files without a (matching) entry are opened
+    and added to the index, with a FileWarning if they still do not match the first file.
+    """
+    index = _MetadataIndex(directory, data_filenames, dimensions, netcdf_engine)
+    entries = [index.entry(fname) for fname in data_filenames]
+    times = [None] * len(data_filenames)
+
+    def scan(i, fname, pool=None):
+        times[i], entry = _scan_file(_grid_fb_class, fname, dimensions, indices.copy(), netcdf_engine, pool)
+        entries[i] = entry
+        if entry is not None:
+            index.add(fname, entry)
+
+    if entries[0] is None:
+        scan(0, data_filenames[0], file_pool)
+    reference = entries[0]
+    missing = [
+        i
+        for i, entry in enumerate(entries)
+        if entry is None or (reference is not None and not index.matches(entry, reference))
+    ]
+    missing = [i for i in missing if times[i] is None]  # not the first file, if it was scanned already
+    executor = _scan_executor(netcdf_engine, len(missing))
+    if executor is None:
+        for i in missing:
+            scan(i, data_filenames[i], file_pool)
+    else:
+        args = [(_grid_fb_class, data_filenames[i], dimensions, indices.copy(), netcdf_engine) for i in missing]
+        if isinstance(executor, ThreadPoolExecutor):
+            args = [a + (file_pool,) for a in args]
+        with executor:
+            with _netcdf_lock:  # no netCDF file is read in this process while its workers are forked
+                futures = [executor.submit(_scan_file, *a) for a in args]
+            for i, future in zip(missing, futures, strict=True):
+                times[i], entries[i] = future.result()
+                if entries[i] is not None:
+                    index.add(data_filenames[i], entries[i])
+
+    for i in missing:
+        if reference is not None and entries[i] is not None and not index.matches(entries[i], reference):
+            warnings.warn(
+                f"The coordinates or variables of {data_filenames[i]} differ from those of {data_filenames[0]}. "
+                "All the files of a Field are read on the grid of its first file.",
+                FileWarning,
+                stacklevel=2,
+            )
+            break
+    index.save()
+    return [_decode_time(entry["time"]) if time is None else time for time, entry in zip(times, entries, strict=True)]
@@ -0,0 +1,214 @@
+"""Store of the data of Fields as uncompressed tiles on disk, which are memory-mapped for JIT execution.
+
+See :meth:`parcels.fieldset.FieldSet.write_raw_store` and :meth:`parcels.fieldset.FieldSet.from_raw_store`.
+"""
+
+import json
+import os
+
+import dask.array as da
+import numpy as np
+
+from parcels.field import Field, NestedField
+from parcels.grid import Grid
+from parcels.tools.converters import TimeConverter
+
+__all__: list[str] = []
+
+RAW_STORE_VERSION = 1
+TILE_DIMS = ["depth", "lat", "lon"]
+
+
+def _encode_time_origin(time_origin):
+    origin = time_origin.time_origin
+    if time_origin.calendar in ["np_datetime64", "np_timedelta64"]:
+        return {"dtype": str(origin.dtype), "value": int(origin.astype(np.int64))}
+    if time_origin.calendar is None:
+        return {"dtype": None, "value": float(origin)}
+    raise NotImplementedError(f"Raw stores do not support time origins with a {time_origin.calendar} calendar")
+
+
+def _decode_time_origin(encoded):
+    if encoded["dtype"] is None:
+        return TimeConverter(encoded["value"])
+    return TimeConverter(np.array(encoded["value"], dtype=np.int64).astype(encoded["dtype"])[()])
+
+
+def _tile_sizes(field, shape, chunksize):
+    """Size of the tiles along each spatial dimension of shape, from chunksize or else the chunks of the Field."""
+    if chunksize is None and isinstance(field.data, da.core.Array):
+        return [c[0] for c in field.data.chunks[1:]]
+    if chunksize is None and isinstance(field.grid.chunksize, dict):  # {netcdf_dimname: (parcels_dimname, size)}
+        chunksize = {v[0]: v[1] for v in field.grid.chunksize.values() if isinstance(v, tuple)}
+    chunksize = chunksize or {}
+    sizes = []
+    for dim, n in zip(TILE_DIMS[-len(shape) :], shape, strict=True):
+        size = int(chunksize.get(dim, n))
+        sizes.append(n if size <= 0 else min(size, n))
+    return sizes
+
+
+def _tile_slices(shape, sizes):
+    """The slices of the tiles of an array of shape, in the (C) order of their block ids."""
+    ranges = [[slice(i, min(i + s, n)) for i in range(0, n, s)] for n, s in zip(shape, sizes, strict=True)]
+    ntiles = tuple(len(r) for r in ranges)
+    return ntiles, [tuple(r[i] for r, i in zip(ranges, b, strict=True)) for b in np.ndindex(*ntiles)]
+
+
+def _tile_path(path, name, block):
+    return os.path.join(path, name, ".".join(str(i) for i in block) + ".raw")
+
+
+def _snapshot(field, ti, shape):
+    """The data at index ti of grid.time_full of a Field, as it is used in the interpolation."""
+    if not field.grid.defer_load:
+        return np.asarray(field.data[ti], dtype=np.float32)
+    filebuffer, data = field._read_time_snapshot(ti)
+    filebuffer.close()
+    data = field._rescale_and_set_minmax(np.array(data, dtype=np.float32)).reshape(shape)
+    if field.grid._lat_flipped:
+        data = np.flip(data, axis=-2)
+    return data
+
+
+def _write_raw_store(fieldset, path, chunksize=None):
+    if any(isinstance(f, NestedField) for f in fieldset.get_fields()):
+        raise NotImplementedError("NestedFields can not be written to a raw store")
+    fields = [f for f in fieldset.get_fields() if isinstance(f, Field)]
+    for f in fields:
+        g = f.grid
+        if f.cast_data_dtype != np.float32:
+            raise NotImplementedError(f"Field {f.name} is not float32, which raw stores (for JIT execution) require")
+        if g.defer_load and (g.zonal_halo > 0 or g.meridional_halo > 0 or g._subset_window is not None):
+            raise NotImplementedError(f"Field {f.name} with a periodic halo or subset window can not be stored")
+        if g.depth_field is not None:
+            raise NotImplementedError(f"Field {f.name} with depth from another Field can not be stored")
+
+    os.makedirs(path, exist_ok=True)
+    grids, tiles, meta_fields = [], {}, {}
+    for f in fields:
+        g = f.grid
+        if not any(g is grid for grid in grids):
+            i = len(grids)
+            grids.append(g)
+            for dim in ["lon", "lat", "depth"]:
+                np.save(os.path.join(path, f"grid{i}_{dim}.npy"), getattr(g, dim))
+        igrid = next(i for i, grid in enumerate(grids) if grid is g)
+
+        zd = g.zdim - 1 if f.gridindexingtype == "pop" and g.zdim > 1 else g.zdim
+        shape = (g.ydim, g.xdim) if g.zdim == 1 else (zd, g.ydim, g.xdim)
+        if igrid not in tiles:  # all Fields on a grid share their chunks, so also their tiles
+            tiles[igrid] = _tile_sizes(f, shape, chunksize)
+        ntiles, slices = _tile_slices(shape, tiles[igrid])
+        ntime = len(g.time_full)
+
+        os.makedirs(os.path.join(path, f.name), exist_ok=True)
+        memmaps = [
+            np.memmap(
+                _tile_path(path, f.name, block),
+                dtype=np.float32,
+                mode="w+",
+                shape=(ntime,) + tuple(s.stop - s.start for s in sl),
+            )
+            for block, sl in zip(np.ndindex(*ntiles), slices, strict=True)
+        ]
+        absmax = np.zeros(len(memmaps))
+        for ti in range(ntime):
+            data = _snapshot(f, ti, shape)
+            for b, (mm, sl) in enumerate(zip(memmaps, slices, strict=True)):
+                mm[ti] = data[sl]
+                absmax[b] = max(absmax[b], np.nanmax(np.abs(mm[ti]), initial=0))
+        for mm in memmaps:
+            mm.flush()
+        del memmaps
+
+        meta_fields[f.name] = {
+            "grid": igrid,
+            "shape": list(shape),
+            "fieldtype": f.fieldtype,
+            "interp_method": f.interp_method,
+            "gridindexingtype": f.gridindexingtype,
+            "allow_time_extrapolation": bool(f.allow_time_extrapolation),
+            "time_periodic": f.time_periodic if f.time_periodic is False else float(f.time_periodic),
+            "to_write": f.to_write,
+            "absmax": absmax.tolist(),
+        }
+
+    meta = {
+        "version": RAW_STORE_VERSION,
+        "grids": [
+            {
+                "time": [float(t) for t in g.time_full],
+                "time_origin": _encode_time_origin(g.time_origin),
+                "mesh": g.mesh,
+                "tiles": tiles[i],
+            }
+            for i, g in enumerate(grids)
+        ],
+        "fields": meta_fields,
+    }
+    with open(os.path.join(path, "fieldset.json"), "w") as fh:
+        json.dump(meta, fh)
+
+
+def _nest(blocks, ntiles):
+    """Nested lists of blocks for da.block, from the blocks in C order of a tiling with ntiles tiles per dimension."""
+    if len(ntiles) == 1:
+        return list(blocks)
+    step = int(np.prod(ntiles[1:]))
+    return [_nest(blocks[i * step : (i + 1) * step], ntiles[1:]) for i in range(ntiles[0])]
+
+
+def _read_raw_store(path):
+    """The Fields in the raw store at path, with their data on the memory-mapped tiles."""
+    with open(os.path.join(path, "fieldset.json")) as fh:
+        meta = json.load(fh)
+    if meta["version"] != RAW_STORE_VERSION:
+        raise ValueError(f"Raw store {path} has version {meta['version']}, expected {RAW_STORE_VERSION}")
+
+    grids = []
+    for i, gmeta in enumerate(meta["grids"]):
+        lon, lat, depth = (np.load(os.path.join(path, f"grid{i}_{dim}.npy")) for dim in ["lon", "lat", "depth"])
+        grid = Grid.create_grid(
+            lon,
+            lat,
+            depth,
+            np.array(gmeta["time"], dtype=np.float64),
+            time_origin=_decode_time_origin(gmeta["time_origin"]),
+            mesh=gmeta["mesh"],
+        )
+        # so that the GridSet only merges grids with the same tiles
+        dims = TILE_DIMS[-len(gmeta["tiles"]) :]
+        grid.chunksize = {dim: (dim, size) for dim, size in zip(dims, gmeta["tiles"], strict=True)}
+        grids.append(grid)
+
+    fields = {}
+    for name, fmeta in meta["fields"].items():
+        gmeta = meta["grids"][fmeta["grid"]]
+        ntiles, slices = _tile_slices(fmeta["shape"], gmeta["tiles"])
+        tiles = [
+            np.memmap(
+                _tile_path(path, name, block),
+                dtype=np.float32,
+                mode="r",
+                shape=(len(gmeta["time"]),) + tuple(s.stop - s.start for s in sl),
+            )
+            for block, sl in zip(np.ndindex(*ntiles), slices, strict=True)
+        ]
+        data = da.block(_nest([da.from_array(t, chunks=t.shape, name=False) for t in tiles], ntiles))
+        field = Field(
+            name,
+            data,
+            grid=grids[fmeta["grid"]],
+            fieldtype=fmeta["fieldtype"],
+            interp_method=fmeta["interp_method"],
+            gridindexingtype=fmeta["gridindexingtype"],
+            allow_time_extrapolation=fmeta["allow_time_extrapolation"],
+            time_periodic=fmeta["time_periodic"],
+            to_write=fmeta["to_write"],
+            creation_log="from_raw_store",
+        )
+        field._raw_tiles = tiles
+        field._raw_absmax = np.array(fmeta["absmax"])
+        fields[name] = field
+    return fields
@@ -0,0 +1,112 @@
+"""Least-recently-used cache of decoded Field snapshots, with an optional tier on local disk.
+
+See :meth:`parcels.fieldset.FieldSet.set_snapshot_cache`.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+__all__: list[str] = []
+
+
+def _indices_key(indices):
+    """Hashable version of the indices dictionary of a Field."""
+    if not indices:
+        return ()
+    return tuple(sorted((dim, tuple(int(i) for i in np.atleast_1d(ind))) for dim, ind in indices.items()))
+
+
+class _SnapshotCache:
+    """Cache of the snapshots that deferred-load Fields read from their files, keyed by
+    (field name, file, time of the snapshot, indices).
+
+    Parameters
+    ----------
+    max_size : float
+        Maximum size in MB of the snapshots that are kept in memory
+    spill_dir : str
+        Directory in which snapshots that are evicted from memory are stored, instead of being
+        discarded. Default is None (no disk tier)
+    max_spill_size : float
+        Maximum size in MB of the snapshots that are stored in spill_dir. Default is None (unlimited)
+    """
+
+    def __init__(self, max_size, spill_dir=None, max_spill_size=None):
+        self.max_size = max_size * 1024**2
+        self.max_spill_size = None if max_spill_size is None else max_spill_size * 1024**2
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._disk = OrderedDict()  # key -> (path, nbytes)
+        self._disk_size = 0
+        self.hits = 0
+        self.misses = 0
+        self._spill_dir = None
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+            self._spill_dir = tempfile.mkdtemp(prefix="parcels-snapshots-", dir=spill_dir)
+            self._finalizer = weakref.finalize(self, shutil.rmtree, self._spill_dir, ignore_errors=True)
+
+    def __contains__(self, key):
+        return key in self._memory or key in self._disk
+
+    def __len__(self):
+        return len(self._memory) + len(self._disk)
+
+    def get(self, key):
+        """Return the cached snapshot for key (moving it to memory if it was spilled), or None."""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+        if key in self._disk:
+            path, nbytes = self._disk.pop(key)
+            self._disk_size -= nbytes
+            data = np.load(path)
+            os.remove(path)
+            self.hits += 1
+            self.put(key, data)
+            return data
+        self.misses += 1
+        return None
+
+    def put(self, key, data):
+        """Add a snapshot to the cache, evicting the least recently used ones if it is full."""
+        if key in self:
+            return
+        data = np.asarray(data)
+        data.flags.writeable = False  # the snapshot is shared by everything that reads it from the cache
+        self._memory[key] = data
+        self._memory_size += data.nbytes
+        while self._memory_size > self.max_size and self._memory:
+            old_key, old_data = self._memory.popitem(last=False)
+            self._memory_size -= old_data.nbytes
+            self._spill(old_key, old_data)
+
+    def _spill(self, key, data):
+        if self._spill_dir is None:
+            return
+        if self.max_spill_size is not None and data.nbytes > self.max_spill_size:
+            return
+        path = os.path.join(self._spill_dir, hashlib.sha256(repr(key).encode("utf-8")).hexdigest() + ".npy")
+        np.save(path, data)
+        self._disk[key] = (path, data.nbytes)
+        self._disk_size += data.nbytes
+        while self.max_spill_size is not None and self._disk_size > self.max_spill_size:
+            _, (old_path, nbytes) = self._disk.popitem(last=False)
+            self._disk_size -= nbytes
+            os.remove(old_path)
+
+    def clear(self):
+        """Remove all snapshots from the cache, including those on disk."""
+        self._memory.clear()
+        self._memory_size = 0
+        for path, _ in self._disk.values():
+            os.remove(path)
+        self._disk.clear()
+        self._disk_size = 0
@@ -0,0 +1,158 @@
+"""Windows of the horizontal grid indices that deferred-load Fields read from file, around the particles.
+
+See :meth:`parcels.fieldset.FieldSet.set_spatial_subsetting`.
+"""
+
+import numpy as np
+
+from parcels.grid import GridType
+from parcels.particledata import _TOMBSTONE
+from parcels.tools.statuscodes import StatusCode
+
+__all__: list[str] = []
+
+
+def _particle_positions(pset):
+    """Longitudes and latitudes of the particles in pset that are not deleted."""
+    pdata = pset.particledata
+    alive = pdata.state != _TOMBSTONE
+    return pdata.data["lon"][alive].astype(np.float64), pdata.data["lat"][alive].astype(np.float64)
+
+
+class _SubsetWindow:
+    """Window of the horizontal indices of a Grid that the deferred-load Fields on it read from file.
+
+    The data of the Fields outside the window is zero, and never sampled: in Scipy mode the window grows
+    before each step of the Kernel execution to the cells that the particles can reach in that step
+    (and, should the velocities outside the window be larger than those inside it, when the index search
+    finds a cell outside it), and in JIT mode the data outside the window are chunks that are not loaded,
+    so that particles that sample them return StatusCode.Repeat and the window grows before they are
+    repeated.
+
+    Parameters
+    ----------
+    grid : parcels.grid.Grid
+        Grid of the Fields
+    fields : list of parcels.field.Field
+        The (deferred-load) Fields on the grid
+    halo : int
+        Number of grid cells around the particles that is included in the window
+    """
+
+    def __init__(self, grid, fields, halo):
+        self.grid = grid
+        self.fields = fields
+        self.halo = halo
+        self.bounds = None  # (y0, y1, x0, x1) in grid indices, or None before the particles are known
+
+    def _clip(self, y0, y1, x0, x1):
+        ydim, xdim = self.grid.ydim, self.grid.xdim
+        y0, x0 = int(np.clip(y0, 0, ydim - 1)), int(np.clip(x0, 0, xdim - 1))
+        return (y0, int(np.clip(y1, y0 + 1, ydim)), x0, int(np.clip(x1, x0 + 1, xdim)))
+
+    def _expand(self, bounds, n):
+        y0, y1, x0, x1 = bounds
+        return self._clip(y0 - n, y1 + n, x0 - n, x1 + n)
+
+    def _contains(self, bounds):
+        if self.bounds is None:
+            return False
+        y0, y1, x0, x1 = self.bounds
+        return y0 <= bounds[0] and bounds[1] <= y1 and x0 <= bounds[2] and bounds[3] <= x1
+
+    def _union(self, bounds):
+        if self.bounds is None:
+            return bounds
+        y0, y1, x0, x1 = self.bounds
+        return (min(y0, bounds[0]), max(y1, bounds[1]), min(x0, bounds[2]), max(x1, bounds[3]))
+
+    def footprint(self, lon, lat, dlon=0, dlat=0):
+        """Bounds of the grid nodes of the cells within (dlon, dlat) of the positions (lon, lat), or None if there are none.
+
+        On curvilinear grids, the cells are found approximately from the search index of the grid.
+        """
+        finite = np.isfinite(lon) & np.isfinite(lat)
+        lon, lat = lon[finite], lat[finite]
+        if len(lon) == 0:
+            return None
+        dlon, dlat = np.broadcast_to(dlon, finite.shape)[finite], np.broadcast_to(dlat, finite.shape)[finite]
+        grid = self.grid
+        if grid._gtype in [GridType.RectilinearZGrid, GridType.RectilinearSGrid]:
+            xi = np.searchsorted(grid.lon, [np.min(lon - dlon), np.max(lon + dlon)], side="right") - 1
+            yi = np.searchsorted(grid.lat, [np.min(lat - dlat), np.max(lat + dlat)], side="right") - 1
+        elif np.any(dlon > 0) or np.any(dlat > 0):
+            corners = [grid.search_index.guess(lon + sx * dlon, lat + sy * dlat) for sx in (-1, 1) for sy in (-1, 1)]
+            yi, xi = (np.concatenate(i) for i in zip(*corners, strict=True))
+        else:
+            yi, xi = grid.search_index.guess(lon, lat)
+        return self._clip(yi.min(), yi.max() + 2, xi.min(), xi.max() + 2)
+
+    def file_bounds(self):
+        """Bounds of the window in the (lat, lon) indices of the Field data as they are read from file."""
+        y0, y1, x0, x1 = self.bounds
+        if self.grid._lat_flipped:
+            y0, y1 = self.grid.ydim - y1, self.grid.ydim - y0
+        return y0, y1, x0, x1
+
+    def center_block(self):
+        """Block id of the window in the chunks of the Fields, see Field._chunk_setup."""
+        y0, _, x0, x1 = self.bounds
+        nx = 1 + (x0 > 0) + (x1 < self.grid.xdim)
+        return int(y0 > 0) * nx + int(x0 > 0)
+
+    def update(self, lon, lat):
+        """Move the window to the particles at (lon, lat), if they came closer than half the halo to its edge."""
+        footprint = self.footprint(lon, lat)
+        if footprint is None or self._contains(self._expand(footprint, max(1, self.halo // 2))):
+            return
+        self._set(self._expand(footprint, self.halo))
+
+    def reach(self, lon, lat, dlon, dlat):
+        """Grow the window to the cells that particles at (lon, lat) can reach within (dlon, dlat), in Scipy mode."""
+        footprint = self.footprint(lon, lat, dlon, dlat)
+        if self.bounds is None or footprint is None or self._contains(footprint):
+            return
+        self._set(self._union(self._expand(footprint, self.halo)))
+
+    def include(self, yi, xi):
+        """Grow the window to contain the cells (yi, xi) and their neighbours, found by the index search in Scipy mode."""
+        if self.bounds is None or np.size(yi) == 0:
+            return
+        cells = self._clip(np.min(yi) - 1, np.max(yi) + 3, np.min(xi) - 1, np.max(xi) + 3)
+        if not self._contains(cells):
+            self._set(self._union(self._expand(cells, self.halo)))
+
+    def requested(self):
+        """Whether particles sampled the Fields outside the window in JIT mode, i.e. requested chunks around it."""
+        grid = self.grid
+        if self.bounds is None or len(grid._load_chunk) < 2:
+            return False
+        requested = grid._load_chunk == grid._chunk_loading_requested
+        requested[self.center_block()] = False
+        return bool(requested.any())
+
+    def grow(self, lon, lat):
+        """Grow the window after particles (now at lon, lat) sampled the Fields outside it in JIT mode.
+
+        If the window already contains the particles, it is grown by the halo or by half its size,
+        whichever is largest, so that the particles can be repeated with less reloads of the window.
+        """
+        footprint = self.footprint(lon, lat)
+        bounds = self.bounds if footprint is None else self._union(self._expand(footprint, self.halo))
+        if bounds == self.bounds:
+            y0, y1, x0, x1 = bounds
+            bounds = self._expand(bounds, max(self.halo, (y1 - y0) // 2, (x1 - x0) // 2))
+        self._set(bounds)
+
+    def _set(self, bounds):
+        if bounds == self.bounds:
+            return
+        self.bounds = bounds
+        for f in self.fields:
+            f._reload_subset_window()
+
+
+def _successful(search):
+    """The (yi, xi) of the positions for which an array index search (see Field._search_indices_array) succeeded."""
+    ok = search[6] == StatusCode.Success
+    return search[4][ok], search[5][ok]
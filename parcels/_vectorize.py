@@ -0,0 +1,190 @@
+"""Conversion of Scipy-mode Kernels into functions that operate on arrays of particles at once.
+
+See :meth:`parcels.kernel.Kernel.execute_vectorized`.
+"""
+
+import ast
+import functools
+import math
+
+import numpy as np
+
+import parcels
+import parcels.rng as ParcelsRandom
+
+__all__: list[str] = []
+
+# Statements and expressions that branch per particle, and hence can not be evaluated on arrays of particles
+_NON_VECTORIZABLE_NODES = (
+    ast.If,
+    ast.IfExp,
+    ast.While,
+    ast.For,
+    ast.AsyncFor,
+    ast.Try,
+    ast.With,
+    ast.Return,
+    ast.Break,
+    ast.Continue,
+    ast.BoolOp,
+    ast.Lambda,
+    ast.Import,
+    ast.ImportFrom,
+    ast.Assert,
+    ast.Delete,
+    ast.ListComp,
+    ast.SetComp,
+    ast.DictComp,
+    ast.GeneratorExp,
+    ast.FunctionDef,
+)
+
+# math functions that have a differently-named numpy equivalent
+_NUMPY_MATH_NAMES = {
+    "asin": "arcsin",
+    "acos": "arccos",
+    "atan": "arctan",
+    "atan2": "arctan2",
+    "asinh": "arcsinh",
+    "acosh": "arccosh",
+    "atanh": "arctanh",
+    "pow": "power",
+}
+
+
+def _is_vectorizable(funcdef):
+    """Whether the body of a Kernel function can be evaluated on arrays of particles at once."""
+    for node in ast.walk(funcdef):
+        if node is funcdef:
+            continue
+        if isinstance(node, _NON_VECTORIZABLE_NODES):
+            return False
+        if isinstance(node, ast.Compare) and len(node.ops) > 1:
+            return False
+    return True
+
+
+class _ArrayMath:
+    """Stand-in for the math module that works on arrays, by mapping functions to their numpy equivalent."""
+
+    def __getattr__(self, name):
+        attr = getattr(np, _NUMPY_MATH_NAMES.get(name, name), None)
+        if attr is None:
+            attr = getattr(math, name)
+            if callable(attr):
+                attr = np.vectorize(attr)
+        return attr
+
+
+class _ArrayRandom:
+    """Stand-in for parcels.rng that draws one random number per particle.
+
+    The numbers are drawn from a numpy Generator, that is seeded from the Parcels RNG when it is first
+    used in an execution, so that the results are reproducible with :func:`parcels.rng.seed`.
+    """
+
+    def __init__(self):
+        self._generator = None
+        self._size = None
+
+    def reset(self, size=None):
+        """Set the number of particles to draw numbers for, and reseed at the next draw if size is None."""
+        if size is None:
+            self._generator = None
+        self._size = size
+
+    @property
+    def generator(self):
+        if self._generator is None:
+            self._generator = np.random.default_rng(ParcelsRandom.randint(0, 2**31 - 1))
+        return self._generator
+
+    def seed(self, seed):
+        ParcelsRandom.seed(seed)
+        self._generator = np.random.default_rng(seed)
+
+    def random(self):
+        return self.generator.random(self._size)
+
+    def uniform(self, low, high):
+        return self.generator.uniform(low, high, self._size)
+
+    def randint(self, low, high):
+        return self.generator.integers(low, high, self._size)
+
+    def normalvariate(self, loc, scale):
+        return self.generator.normal(loc, scale, self._size)
+
+    def expovariate(self, lamb):
+        return self.generator.exponential(1.0 / np.asarray(lamb), self._size)
+
+    def vonmisesvariate(self, mu, kappa):
+        return np.mod(self.generator.vonmises(mu, kappa, self._size), 2 * np.pi)
+
+
+class _ParcelsProxy:
+    """Stand-in for the parcels package in which the RNG draws arrays of random numbers."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.ParcelsRandom = rng
+
+    def __getattr__(self, name):
+        return getattr(parcels, name)
+
+
+def _array_min(*args):
+    if len(args) == 1:
+        return np.min(np.asarray(args[0]), axis=0)
+    return functools.reduce(np.minimum, args)
+
+
+def _array_max(*args):
+    if len(args) == 1:
+        return np.max(np.asarray(args[0]), axis=0)
+    return functools.reduce(np.maximum, args)
+
+
+def _array_int(x):
+    return np.trunc(x).astype(np.int64) if isinstance(x, np.ndarray) else int(x)
+
+
+def _array_float(x):
+    return np.asarray(x, dtype=np.float64) if isinstance(x, np.ndarray) else float(x)
+
+
+def vectorize_kernel(funcdef, namespace):
+    """Compile a Kernel function so that it can be evaluated on arrays of particles at once.
+
+    Parameters
+    ----------
+    funcdef : ast.FunctionDef
+        AST of the (merged) Kernel function
+    namespace : dict
+        Globals in which the Kernel function is evaluated in per-particle execution
+
+    Returns
+    -------
+    tuple
+        The vectorized function and the _ArrayRandom it draws random numbers from,
+        or (None, None) if the Kernel function can not be vectorized.
+    """
+    if not _is_vectorizable(funcdef):
+        return None, None
+
+    rng = _ArrayRandom()
+    namespace = dict(namespace)
+    namespace.update(
+        math=_ArrayMath(),
+        rng=rng,
+        ParcelsRandom=rng,
+        random=rng,
+        parcels=_ParcelsProxy(rng),
+        min=_array_min,
+        max=_array_max,
+        int=_array_int,
+        float=_array_float,
+    )
+    py_mod = ast.Module(body=[funcdef], type_ignores=[])
+    exec(compile(py_mod, "<ast>", "exec"), namespace)
+    return namespace[funcdef.name], rng
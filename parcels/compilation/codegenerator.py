@@ -1002,6 +1002,7 @@ class LoopGenerator:
         # Generate outer loop for repeated kernel invocation
         args = [
             c.Value("int", "num_particles"),
+            c.Pointer(c.Value("int", "pindices")),
             c.Pointer(c.Value(pname, "particles")),
             c.Value("double", "endtime"),
             c.Value("double", "dt"),
@@ -1043,7 +1044,22 @@ class LoopGenerator:
                 ),
             )
         ]
-        body += [c.If("particles->state[pnum] == STOPALLEXECUTION", c.Statement("return"))]
+        body += [
+            c.If(
+                "particles->state[pnum] == STOPALLEXECUTION",
+                c.Block(
+                    [
+                        c.Line("#ifdef _OPENMP"),
+                        c.Pragma("omp atomic write"),
+                        c.Assign("stop_all", "1"),
+                        c.Statement("break"),
+                        c.Line("#else"),
+                        c.Statement("return"),
+                        c.Line("#endif"),
+                    ]
+                ),
+            )
+        ]
         body += [c.Statement("particles->dt[pnum] = pre_dt")]
         body += [
             c.If(
@@ -1053,12 +1069,32 @@ class LoopGenerator:
         ]
 
         time_loop = c.While("(particles->state[pnum] == EVALUATE || particles->state[pnum] == REPEAT)", c.Block(body))
-        part_loop = c.For("pnum = 0", "pnum < num_particles", "++pnum", c.Block([time_loop]))
+
+        # ==== threaded (OpenMP) mode: skip remaining particles after STOPALLEXECUTION and give each particle its own RNG stream ==== #
+        # ==== pindices (if not NULL) restricts the loop to a subset of the particles, e.g. those that need to be repeated ==== #
+        particle_setup = [c.Assign("int pnum", "(pindices == NULL) ? i : pindices[i]")]
+        omp_particle_setup = [
+            c.Line("#ifdef _OPENMP"),
+            c.Value("int", "stopped"),
+            c.Pragma("omp atomic read"),
+            c.Assign("stopped", "stop_all"),
+            c.If("stopped", c.Statement("continue")),
+            c.Statement("parcels_seed_particle(rng_base, particles->id[pnum])"),
+            c.Line("#endif"),
+        ]
+        part_loop = c.For(
+            "i = 0", "i < num_particles", "++i", c.Block(particle_setup + omp_particle_setup + [time_loop])
+        )
         fbody = c.Block(
             [
-                c.Value("int", "pnum"),
+                c.Value("int", "i"),
                 c.Value("double", "sign_dt"),
                 sign_dt,
+                c.Line("#ifdef _OPENMP"),
+                c.Assign("int stop_all", "0"),
+                c.Assign("unsigned int rng_base", "(unsigned int) rand()"),
+                c.Pragma("omp parallel for schedule(dynamic, 64)"),
+                c.Line("#endif"),
                 part_loop,
             ]
         )
@@ -0,0 +1,137 @@
+"""Content-addressed cache of compiled kernel libraries, shared between runs, processes and MPI ranks."""
+
+import functools
+import glob
+import hashlib
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import uuid
+
+__all__ = ["compile_cached", "evict_kernel_cache", "kernel_cache_key"]
+
+DEFAULT_KERNEL_CACHE_SIZE = 256  # in MB
+
+
+def _header_files(incdirs):
+    headers = []
+    for incdir in incdirs or []:
+        headers += sorted(glob.glob(os.path.join(incdir, "*.h")))
+    return headers
+
+
+@functools.lru_cache
+def _compiler_identity(cc):
+    """Resolved path and version string of the compiler executable cc (empty if they can not be determined)."""
+    path = shutil.which(cc) if cc else None
+    if path is None:
+        return "", ""
+    path = os.path.realpath(path)
+    try:
+        version = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=30).stdout
+    except (OSError, subprocess.SubprocessError):
+        version = ""
+    return path, version.strip()
+
+
+def kernel_cache_key(ccode, compiler):
+    """Hash of everything that determines a compiled kernel library.
+
+    Parameters
+    ----------
+    ccode : str
+        Generated C source of the kernel
+    compiler : parcels.compilation.codecompiler.CCompiler
+        Compiler that will build the library. Its class, executable (with its resolved path and
+        version), compiler and linker flags, and the contents of the headers in its include
+        directories are part of the key.
+    """
+    h = hashlib.sha256()
+    compiler_id = [type(compiler).__qualname__, compiler._cc, *_compiler_identity(compiler._cc)]
+    for part in [ccode, sys.platform, platform.machine(), *compiler_id, *compiler._cppargs, *compiler._ldargs]:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    for header in _header_files(compiler._incdirs):
+        h.update(os.path.basename(header).encode("utf-8"))
+        with open(header, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def compile_cached(compiler, src_file, lib_file, log_file):
+    """Compile src_file into lib_file, unless lib_file already exists in the cache.
+
+    The library is first compiled to a unique temporary file and then atomically moved into place,
+    so that processes populating the cache concurrently never load a partially written library.
+
+    Returns
+    -------
+    bool
+        Whether the library was compiled (False if it was already in the cache)
+    """
+    if os.path.isfile(lib_file):
+        try:
+            os.utime(lib_file)  # mark as recently used, for evict_kernel_cache
+        except OSError:
+            pass
+        with open(log_file, "w") as logfile:
+            logfile.write(f"Using cached library: {lib_file}\n")
+        return False
+
+    tmp_file = f"{lib_file}.{os.getpid()}-{uuid.uuid4().hex}.tmp"
+    try:
+        compiler.compile(src_file, tmp_file, log_file)
+        try:
+            os.replace(tmp_file, lib_file)
+        except OSError:
+            # On Windows, a library that is loaded by another process can not be replaced
+            if not os.path.isfile(lib_file):
+                raise
+    finally:
+        if os.path.isfile(tmp_file):
+            os.remove(tmp_file)
+
+    evict_kernel_cache(os.path.dirname(lib_file), keep=lib_file)
+    return True
+
+
+def evict_kernel_cache(directory, max_size=None, keep=None):
+    """Remove the least recently used libraries from the cache until its total size is below max_size.
+
+    Parameters
+    ----------
+    directory : str
+        Kernel cache directory
+    max_size : float
+        Maximum size of the cache in MB. Defaults to the ``PARCELS_KERNEL_CACHE_SIZE``
+        environment variable (if it exists), or otherwise 256 MB.
+    keep : str
+        Library that is never removed (e.g. the one that was just compiled)
+    """
+    if max_size is None:
+        max_size = float(os.environ.get("PARCELS_KERNEL_CACHE_SIZE", DEFAULT_KERNEL_CACHE_SIZE))
+
+    entries = []
+    for fname in os.listdir(directory):
+        if not (fname.startswith("lib") and fname.endswith((".so", ".dll"))):
+            continue
+        path = os.path.join(directory, fname)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:  # removed by another process
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= max_size * 1024**2:
+            break
+        if keep is not None and os.path.abspath(path) == os.path.abspath(keep):
+            continue
+        try:
+            os.remove(path)
+        except OSError:  # removed by another process, or still loaded (on Windows)
+            continue
+        total_size -= size
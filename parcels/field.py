@@ -2,22 +2,30 @@ import collections
 import math
 import warnings
 from collections.abc import Iterable
+from concurrent.futures import Future
 from ctypes import POINTER, Structure, c_float, c_int, pointer
 from pathlib import Path
 from typing import TYPE_CHECKING, Literal
 
+import dask
 import dask.array as da
 import numpy as np
 import xarray as xr
 
 import parcels.tools.interpolation_utils as i_u
 from parcels._compat import add_note
+from parcels._file_pool import _FilePool
 from parcels._interpolation import (
+    _ARRAY_INTERP_METHODS_2D,
+    _ARRAY_INTERP_METHODS_3D,
     InterpolationContext2D,
     InterpolationContext3D,
     get_2d_interpolator_registry,
     get_3d_interpolator_registry,
 )
+from parcels._metadata_index import _indexed_file_times
+from parcels._snapshot_cache import _indices_key, _SnapshotCache
+from parcels._subset_window import _successful
 from parcels._typing import (
     GridIndexingType,
     InterpMethod,
@@ -27,28 +35,43 @@ from parcels._typing import (
     assert_valid_gridindexingtype,
     assert_valid_interp_method,
 )
+from parcels.particledata import ParticleDataArrayAccessor
 from parcels.tools._helpers import default_repr, deprecated_made_private, field_repr, timedelta_to_float
+from parcels.tools.chunkmemory import _chunk_memory
 from parcels.tools.converters import (
     TimeConverter,
     UnitConverter,
     unitconverters_map,
 )
+from parcels.tools.global_statics import get_metadata_index_dir
 from parcels.tools.statuscodes import (
     AllParcelsErrorCodes,
     FieldOutOfBoundError,
     FieldOutOfBoundSurfaceError,
     FieldSamplingError,
+    StatusCode,
     TimeExtrapolationError,
     _raise_field_out_of_bound_error,
+    _raise_field_out_of_bound_surface_error,
+    _raise_field_sampling_error,
 )
 from parcels.tools.warnings import FieldSetWarning, _deprecated_param_netcdf_decodewarning
 
-from ._index_search import _search_indices_curvilinear, _search_indices_rectilinear
+from ._index_search import (
+    _rectilinear_axes_increasing,
+    _search_indices_curvilinear,
+    _search_indices_curvilinear_array,
+    _search_indices_rectilinear,
+    _search_indices_rectilinear_array,
+)
 from .fieldfilebuffer import (
     DaskFileBuffer,
     DeferredDaskFileBuffer,
     DeferredNetcdfFileBuffer,
+    DeferredZarrFileBuffer,
     NetcdfFileBuffer,
+    ZarrFileBuffer,
+    _is_zarr_store,
 )
 from .grid import CGrid, Grid, GridType, _calc_cell_areas, _calc_cell_edge_sizes
 
@@ -83,6 +106,118 @@ def _deal_with_errors(error, key, vector_type: VectorType):
         return 0
 
 
+def _is_array_key(key):
+    """Whether a Field is sampled at arrays of positions at once (e.g. in vectorized Kernel execution)."""
+    if isinstance(key, ParticleDataArrayAccessor):
+        return True
+    return isinstance(key, tuple) and any(
+        isinstance(k, ParticleDataArrayAccessor) or (isinstance(k, np.ndarray) and k.ndim > 0) for k in key
+    )
+
+
+def _unpack_array_key(key):
+    """Return the broadcasted time, depth, lat and lon arrays, and the particles (if any) of an array key."""
+    if isinstance(key, ParticleDataArrayAccessor):
+        particle = key
+        coords = (key.time, key.depth, key.lat, key.lon)
+    else:
+        particle = key[4] if len(key) > 4 else None
+        coords = key[:4]
+    shape = (len(particle),) if particle is not None else ()
+    time, z, y, x, _ = np.broadcast_arrays(*coords, np.empty(shape))
+    return time, z, y, x, particle
+
+
+def _deal_with_array_errors(errors, particle, z, y, x):
+    """Set the state of the particles for which sampling failed, like _deal_with_errors does for a single particle."""
+    failed = np.flatnonzero(errors != StatusCode.Success)
+    if len(failed) == 0:
+        return
+    if particle is None:
+        i = failed[0]
+        raise RuntimeError(
+            f"Field sampling failed with status code {errors[i]} at (depth={z[i]}, lat={y[i]}, lon={x[i]}). "
+            "Error could not be handled because particle was not part of the Field Sampling."
+        )
+    state = particle.state
+    state[failed] = errors[failed]
+    particle.state = state
+
+
+def _getitem_elementwise(field, time, z, y, x, particle, ncomp=None):
+    """Sample a Field, VectorField or NestedField at each of the positions in turn, for Fields that can not be sampled at arrays at once."""
+    values = [
+        field[(time[i], z[i], y[i], x[i]) if particle is None else (time[i], z[i], y[i], x[i], particle[i])]
+        for i in range(len(x))
+    ]
+    if ncomp is None:
+        return np.array(values)
+    return tuple(np.array([v[c] for v in values]) for c in range(ncomp))
+
+
+def _flatten_positions(time, z, y, x):
+    """Broadcast the times and positions of eval_many to 1D arrays, and return these and their original shape."""
+    time, z, y, x = np.broadcast_arrays(*(np.asarray(c, dtype=np.float64) for c in (time, z, y, x)))
+    shape = x.shape
+    return time.ravel(), z.ravel(), y.ravel(), x.ravel(), shape
+
+
+def _index_hint(hint):
+    """Flat array of index hints, which the index search updates in place (a view on hint, if possible)."""
+    return None if hint is None else np.asarray(hint).reshape(-1)
+
+
+def _store_index_hint(hint, flat_hint):
+    """Copy the updated index hints back into hint, if _index_hint had to copy it (e.g. a non-contiguous array)."""
+    if isinstance(hint, np.ndarray) and np.issubdtype(hint.dtype, np.integer) and not np.shares_memory(hint, flat_hint):
+        hint[...] = flat_hint.reshape(hint.shape)
+
+
+def _eval_elementwise(field, time, z, y, x, applyConversion, ncomp=None):
+    """Evaluate a Field or VectorField at each of the positions in turn, returning the values and the StatusCode of each position."""
+    values = np.zeros((ncomp or 1, len(x)), dtype=np.float64)
+    errors = np.full(x.shape, StatusCode.Success, dtype=np.int32)
+    for i in range(len(x)):
+        try:
+            values[:, i] = field.eval(time[i], z[i], y[i], x[i], applyConversion=applyConversion)
+        except tuple(AllParcelsErrorCodes.keys()) as error:
+            errors[i] = AllParcelsErrorCodes[type(error)]
+    return (values[0] if ncomp is None else tuple(values)), errors
+
+
+def _raise_array_errors(errors, time, z, y, x):
+    """Raise the error of the first position at which sampling failed, as eval does for a single position."""
+    failed = np.flatnonzero(errors != StatusCode.Success)
+    if len(failed) == 0:
+        return
+    i = failed[0]
+    if errors[i] == StatusCode.ErrorTimeExtrapolation:
+        raise TimeExtrapolationError(time[i])
+    elif errors[i] == StatusCode.ErrorOutOfBounds:
+        _raise_field_out_of_bound_error(z[i], y[i], x[i])
+    elif errors[i] == StatusCode.ErrorThroughSurface:
+        _raise_field_out_of_bound_surface_error(z[i], y[i], x[i])
+    else:
+        _raise_field_sampling_error(z[i], y[i], x[i])
+
+
+def _chunk_lookup_table(chunksizes):
+    """Lookup table of the chunks along a dimension, for Field.grid.chunk_info.
+
+    The table contains the size of the dimension, followed by the chunk and the index in that chunk
+    for each index along the dimension, so that the C code finds them without scanning the chunksizes.
+    """
+    chunksizes = np.asarray(chunksizes, dtype=np.int64)
+    block = np.repeat(np.arange(len(chunksizes)), chunksizes)
+    local = np.arange(chunksizes.sum()) - np.repeat(np.cumsum(chunksizes) - chunksizes, chunksizes)
+    return [int(chunksizes.sum())] + np.stack((block, local), axis=-1).ravel().tolist()
+
+
+def _close_prefetched_filebuffer(future):
+    if future.exception() is None:
+        future.result()[0].close()
+
+
 def _croco_from_z_to_sigma_scipy(fieldset, time, z, y, x, particle):
     """Calculate local sigma level of the particle, by linearly interpolating the
     scaling function that maps sigma to depth (using local ocean depth H,
@@ -347,6 +482,14 @@ class Field:
         self.nchunks: tuple[int, ...] = ()
         self._chunk_set: bool = False
         self.filebuffers = [None] * 2
+        self._prefetched: dict[int, Future] = {}  # snapshots that are read in the background, see FieldSet.set_prefetch
+        self._snapshot_cache: _SnapshotCache | None = None  # see FieldSet.set_snapshot_cache
+        self._file_pool: _FilePool | None = None  # see FieldSet.set_file_pool
+        self._time_slots: np.ndarray | None = None  # slot of each time index in the data (chunks), see _swap_time_slots
+        self._stale_time_slots = np.zeros(0, dtype=np.int32)
+        self._chunk_evicted = np.zeros(0, dtype=bool)  # chunks that were evicted to stay within the memory budget
+        self._raw_tiles: list[np.memmap] | None = None  # memory-mapped tile of each chunk, see FieldSet.from_raw_store
+        self._raw_absmax: np.ndarray | None = None
         if len(kwargs) > 0:
             raise SyntaxError(f'Field received an unexpected keyword argument "{list(kwargs.keys())[0]}"')
 
@@ -457,7 +600,15 @@ class Field:
 
     @staticmethod
     def _collect_timeslices(
-        timestamps, data_filenames, _grid_fb_class, dimensions, indices, netcdf_engine, netcdf_decodewarning=None
+        timestamps,
+        data_filenames,
+        _grid_fb_class,
+        dimensions,
+        indices,
+        netcdf_engine,
+        netcdf_decodewarning=None,
+        file_pool=None,
+        metadata_index=None,
     ):
         if netcdf_decodewarning is not None:
             _deprecated_param_netcdf_decodewarning()
@@ -469,11 +620,20 @@ class Field:
                     dataFiles.append(f)
             timeslices = np.array([stamp for file in timestamps for stamp in file])
             time = timeslices
+        elif metadata_index is not None:
+            timeslices = _indexed_file_times(
+                metadata_index, data_filenames, _grid_fb_class, dimensions, indices, netcdf_engine, file_pool
+            )
+            dataFiles = [[fname] * len(ftime) for fname, ftime in zip(data_filenames, timeslices, strict=True)]
+            time = np.concatenate(timeslices).ravel()
+            dataFiles = np.concatenate(dataFiles).ravel()
         else:
             timeslices = []
             dataFiles = []
             for fname in data_filenames:
-                with _grid_fb_class(fname, dimensions, indices, netcdf_engine=netcdf_engine) as filebuffer:
+                with _grid_fb_class(
+                    fname, dimensions, indices, netcdf_engine=netcdf_engine, file_pool=file_pool
+                ) as filebuffer:
                     ftime = filebuffer.time
                     timeslices.append(ftime)
                     dataFiles.append([fname] * len(ftime))
@@ -549,6 +709,13 @@ class Field:
             See also the Grid indexing documentation on oceanparcels.org
         chunksize :
             size of the chunks in dask loading
+        metadata_index : bool or str
+            Whether to keep an index of the time stamps of the data files between runs, so that only
+            files that were added or changed since the previous run are opened to read their time.
+            Can also be the directory in which the index is stored. Default is False. True stores it in
+            the directory given by the ``PARCELS_METADATA_INDEX`` environment variable (if it exists),
+            or otherwise in the user cache directory. The index also holds the coordinates and variables of
+            each file, and files that are not on the grid of the first file are scanned again, with a warning.
         netcdf_decodewarning : bool
             (DEPRECATED - v3.1.0) Whether to show a warning if there is a problem decoding the netcdf files.
             Default is True, but in some cases where these warnings are expected, it may be useful to silence them
@@ -620,8 +787,19 @@ class Field:
                 raise NotImplementedError("Vertically adaptive meshes not implemented for from_netcdf()")
             depth_filename = depth_filename[0]
 
-        netcdf_engine = kwargs.pop("netcdf_engine", "netcdf4")
+        netcdf_engine = kwargs.pop("netcdf_engine", None)
+        if netcdf_engine is None:
+            netcdf_engine = "zarr" if _is_zarr_store(data_filenames[0]) else "netcdf4"
         gridindexingtype = kwargs.get("gridindexingtype", "nemo")
+        file_pool = kwargs.pop("file_pool", None)  # shared with the other Fields of FieldSet.from_netcdf
+        metadata_index = kwargs.pop("metadata_index", False)
+        if metadata_index is True:
+            try:
+                metadata_index = get_metadata_index_dir()
+            except OSError:  # e.g. no writable cache directory
+                metadata_index = None
+        elif metadata_index is False:
+            metadata_index = None
 
         indices = {} if indices is None else indices.copy()
         for ind in indices:
@@ -649,8 +827,9 @@ class Field:
                 lonlat_filename,
                 dimensions,
                 indices,
-                netcdf_engine,
+                netcdf_engine=netcdf_engine,
                 gridindexingtype=gridindexingtype,
+                file_pool=file_pool,
             ) as filebuffer:
                 lat, lon = filebuffer.latlon
                 indices = filebuffer.indices
@@ -667,9 +846,10 @@ class Field:
                 depth_filename,
                 dimensions,
                 indices,
-                netcdf_engine,
+                netcdf_engine=netcdf_engine,
                 interp_method=interp_method,
                 gridindexingtype=gridindexingtype,
+                file_pool=file_pool,
             ) as filebuffer:
                 filebuffer.name = filebuffer.parse_name(variable[1])
                 if dimensions["depth"] == "not_yet_set":
@@ -693,7 +873,14 @@ class Field:
             # across multiple files
             if "time" in dimensions or timestamps is not None:
                 time, time_origin, timeslices, dataFiles = cls._collect_timeslices(
-                    timestamps, data_filenames, _grid_fb_class, dimensions, indices, netcdf_engine
+                    timestamps,
+                    data_filenames,
+                    _grid_fb_class,
+                    dimensions,
+                    indices,
+                    netcdf_engine,
+                    file_pool=file_pool,
+                    metadata_index=metadata_index,
                 )
                 grid = Grid.create_grid(lon, lat, depth, time, time_origin=time_origin, mesh=mesh)
                 grid.timeslices = timeslices
@@ -706,7 +893,14 @@ class Field:
             # ==== means: the field has a shared grid, but may have different data files, so we need to collect the
             # ==== correct file time series again.
             _, _, _, dataFiles = cls._collect_timeslices(
-                timestamps, data_filenames, _grid_fb_class, dimensions, indices, netcdf_engine
+                timestamps,
+                data_filenames,
+                _grid_fb_class,
+                dimensions,
+                indices,
+                netcdf_engine,
+                file_pool=file_pool,
+                metadata_index=metadata_index,
             )
             kwargs["dataFiles"] = dataFiles
 
@@ -721,12 +915,21 @@ class Field:
         if grid.time.size <= 2:
             deferred_load = False
 
-        _field_fb_class: type[DeferredDaskFileBuffer | DaskFileBuffer | DeferredNetcdfFileBuffer | NetcdfFileBuffer]
+        _field_fb_class: type[
+            DeferredDaskFileBuffer
+            | DaskFileBuffer
+            | DeferredZarrFileBuffer
+            | ZarrFileBuffer
+            | DeferredNetcdfFileBuffer
+            | NetcdfFileBuffer
+        ]
         if chunksize not in [False, None]:
             if deferred_load:
                 _field_fb_class = DeferredDaskFileBuffer
             else:
                 _field_fb_class = DaskFileBuffer
+        elif netcdf_engine == "zarr":
+            _field_fb_class = DeferredZarrFileBuffer if deferred_load else ZarrFileBuffer
         elif deferred_load:
             _field_fb_class = DeferredNetcdfFileBuffer
         else:
@@ -742,10 +945,11 @@ class Field:
                     fname,
                     dimensions,
                     indices,
-                    netcdf_engine,
+                    netcdf_engine=netcdf_engine,
                     interp_method=interp_method,
                     data_full_zdim=data_full_zdim,
                     chunksize=chunksize,
+                    file_pool=file_pool,
                 ) as filebuffer:
                     # If Field.from_netcdf is called directly, it may not have a 'data' dimension
                     # In that case, assume that 'name' is the data dimension
@@ -1000,9 +1204,12 @@ class Field:
 
     def _search_indices(self, time, z, y, x, ti=-1, particle=None, search2D=False):
         if self.grid._gtype in [GridType.RectilinearSGrid, GridType.RectilinearZGrid]:
-            return _search_indices_rectilinear(self, time, z, y, x, ti, particle=particle, search2D=search2D)
+            search = _search_indices_rectilinear(self, time, z, y, x, ti, particle=particle, search2D=search2D)
         else:
-            return _search_indices_curvilinear(self, time, z, y, x, ti, particle=particle, search2D=search2D)
+            search = _search_indices_curvilinear(self, time, z, y, x, ti, particle=particle, search2D=search2D)
+        if self.grid._subset_window is not None:
+            self.grid._subset_window.include(search[4], search[5])
+        return search
 
     @deprecated_made_private  # TODO: Remove 6 months after v3.1.0
     def interpolator2D(self, *_):
@@ -1136,6 +1343,8 @@ class Field:
 
     def __getitem__(self, key):
         self._check_velocitysampling()
+        if _is_array_key(key):
+            return self._getitem_array(*_unpack_array_key(key))
         try:
             if _isParticle(key):
                 return self.eval(key.time, key.depth, key.lat, key.lon, key)
@@ -1144,6 +1353,160 @@ class Field:
         except tuple(AllParcelsErrorCodes.keys()) as error:
             return _deal_with_errors(error, key, vector_type=None)
 
+    def _getitem_array(self, time, z, y, x, particle):
+        """Sample the Field at arrays of positions, setting the state of the particles for which sampling failed."""
+        if not self._array_sampling_supported:
+            return _getitem_elementwise(self, time, z, y, x, particle)
+        if particle is not None and self.grid._gtype == GridType.CurvilinearZGrid:
+            # Start the index search from the cells in which the particles were found before
+            pxi, pyi = particle.xi, particle.yi
+            value, errors = self._sample_array(time, z, y, x, pxi[:, self.igrid], pyi[:, self.igrid])
+            particle.xi, particle.yi = pxi, pyi
+        else:
+            value, errors = self._sample_array(time, z, y, x)
+        _deal_with_array_errors(errors, particle, z, y, x)
+        return self.units.to_target(value, z, y, x)
+
+    @property
+    def _array_sampling_supported(self):
+        """Whether the Field can be sampled at arrays of positions at once with _sample_array."""
+        if self.grid._gtype not in [GridType.RectilinearZGrid, GridType.CurvilinearZGrid]:
+            return False
+        if not isinstance(self.data, np.ndarray) or self.gridindexingtype == "croco":
+            return False
+        if self.grid.zdim == 1:
+            if self.interp_method not in _ARRAY_INTERP_METHODS_2D:
+                return False
+        elif self.interp_method not in _ARRAY_INTERP_METHODS_3D:
+            return False
+        if self.grid._gtype == GridType.CurvilinearZGrid:
+            depth = np.atleast_1d(self.grid.depth)
+            return bool(np.all(np.diff(depth) > 0) or np.all(np.diff(depth) < 0))
+        return _rectilinear_axes_increasing(self.grid)
+
+    def _time_index_array(self, time):
+        """Vectorized version of _time_index.
+
+        Returns the time index of each time, the times shifted into the time range of periodic
+        Fields, and the StatusCode of each time.
+        """
+        errors = np.full(time.shape, StatusCode.Success, dtype=np.int32)
+        if self.time_periodic:
+            period = self.grid.time_full[-1] - self.grid.time_full[0]
+            outside = (time < self.grid.time[0]) | (time >= self.grid.time[-1])
+            periods = np.where(outside, np.floor((time - self.grid.time_full[0]) / period), 0)
+            if outside.any():
+                last_periods = int(periods[outside][-1])
+                if isinstance(self.grid.periods, c_int):
+                    self.grid.periods.value = last_periods
+                else:
+                    self.grid.periods = last_periods
+            time = time - periods * period
+        elif not self.allow_time_extrapolation:
+            errors[(time < self.grid.time[0]) | (time > self.grid.time[-1])] = StatusCode.ErrorTimeExtrapolation
+        ti = np.clip(np.searchsorted(self.grid.time, time, side="right") - 1, 0, len(self.grid.time) - 1)
+        return ti, time, errors
+
+    def _search_indices_array(self, z, y, x, xi=None, yi=None, search_cache=None):
+        """Search the grid cells of arrays of positions, reusing the result in search_cache for Fields on the same grid."""
+        key = (id(self.grid), self.gridindexingtype)
+        if search_cache is not None and key in search_cache:
+            return search_cache[key]
+        if self.grid._gtype == GridType.CurvilinearZGrid:
+            search = _search_indices_curvilinear_array(self, z, y, x, xi=xi, yi=yi)
+        else:
+            search = _search_indices_rectilinear_array(self, z, y, x)
+        for hint, found in [(xi, search[5]), (yi, search[4])]:
+            if isinstance(hint, np.ndarray) and np.issubdtype(hint.dtype, np.integer):
+                hint[:] = found
+        if self.grid._subset_window is not None:
+            self.grid._subset_window.include(*_successful(search))
+        if search_cache is not None:
+            search_cache[key] = search
+        return search
+
+    def _sample_array(self, time, z, y, x, xi=None, yi=None, search_cache=None):
+        """Interpolate field values in space and time at arrays of positions, without unit conversion.
+
+        Returns the values and the StatusCode of each position. Values are zero where sampling failed.
+        """
+        (zeta, eta, xsi, zi, yi, xi, search_errors) = self._search_indices_array(z, y, x, xi, yi, search_cache)
+        ti, time, errors = self._time_index_array(time)
+        errors = np.where(errors == StatusCode.Success, search_errors, errors)
+
+        value = np.zeros(x.shape, dtype=np.float64)
+        for t in np.unique(ti):
+            sel = np.flatnonzero(ti == t)
+            search = (zeta[sel], eta[sel], xsi[sel], zi[sel], yi[sel], xi[sel])
+            f = self._spatial_interpolation_array(t, *search)
+            nan = np.isnan(f)
+            if t < self.grid.tdim - 1:
+                interp_time = time[sel] > self.grid.time[t]
+                if interp_time.any():
+                    f1 = self._spatial_interpolation_array(t + 1, *search)
+                    t0 = self.grid.time[t]
+                    t1 = self.grid.time[t + 1]
+                    f = np.where(interp_time, f + (f1 - f) * ((time[sel] - t0) / (t1 - t0)), f)
+                    nan |= interp_time & np.isnan(f1)
+            value[sel] = f
+            errors[sel[nan & (errors[sel] == StatusCode.Success)]] = StatusCode.ErrorOutOfBounds
+        value[errors != StatusCode.Success] = 0
+        return value, errors
+
+    def _spatial_interpolation_array(self, ti, zeta, eta, xsi, zi, yi, xi):
+        """Vectorized version of _spatial_interpolation, for the cell indices and relative positions of _search_indices_array."""
+        if self.grid.zdim == 1:
+            ctx = InterpolationContext2D(self.data, eta, xsi, ti, yi, xi)
+            val = get_2d_interpolator_registry()[self.interp_method](ctx)
+        else:
+            ctx = InterpolationContext3D(self.data, zeta, eta, xsi, ti, zi, yi, xi, self.gridindexingtype)
+            val = get_3d_interpolator_registry()[self.interp_method](ctx)
+        return np.broadcast_to(np.asarray(val, dtype=np.float64), xi.shape)
+
+    def eval_many(self, time, z, y, x, applyConversion=True, xi=None, yi=None, fill_value=None):
+        """Interpolate field values in space and time at arrays of positions at once.
+
+        This is the batched version of :meth:`eval`, e.g. for sampling a Field along (many) particle
+        trajectories in post-processing. Positions are found in the grid and interpolated with
+        array operations, instead of one at a time.
+
+        Parameters
+        ----------
+        time, z, y, x : array_like
+            Times and positions at which to sample the Field. Scalars are broadcast to the other arrays.
+        applyConversion : bool
+            Whether to apply the unit conversion of the Field (Default value = True)
+        xi, yi : np.ndarray of int, optional
+            Per-position grid indices from which the index search starts on curvilinear grids. If these are
+            integer arrays, they are updated in place with the indices that were found, so they can be passed
+            again to sample nearby positions (e.g. the next points along trajectories). Positions with an
+            index of -1 start from the search index of the grid, see :attr:`parcels.grid.CurvilinearGrid.search_index`.
+        fill_value : float, optional
+            Value returned at positions where the Field can not be sampled (e.g. out of bounds, or NaN positions).
+            By default, an error is raised for the first such position, as in :meth:`eval`.
+
+        Returns
+        -------
+        np.ndarray
+            Sampled values, with the broadcast shape of the inputs.
+        """
+        time, z, y, x, shape = _flatten_positions(time, z, y, x)
+        if self._array_sampling_supported:
+            xi_hint, yi_hint = _index_hint(xi), _index_hint(yi)
+            value, errors = self._sample_array(time, z, y, x, xi=xi_hint, yi=yi_hint)
+            _store_index_hint(xi, xi_hint)
+            _store_index_hint(yi, yi_hint)
+            if applyConversion:
+                value = self.units.to_target(value, z, y, x)
+        else:
+            value, errors = _eval_elementwise(self, time, z, y, x, applyConversion)
+
+        if fill_value is None:
+            _raise_array_errors(errors, time, z, y, x)
+        else:
+            value = np.where(errors == StatusCode.Success, value, fill_value)
+        return value.reshape(shape)
+
     def eval(self, time, z, y, x, particle=None, applyConversion=True):
         """Interpolate field values in space and time.
 
@@ -1217,6 +1580,16 @@ class Field:
             npartitions = 1
             for n in self.nchunks[1:]:
                 npartitions *= n
+        elif isinstance(self.data, np.ndarray) and self._subset_bounds() is not None:
+            # The subset window and the parts of the grid around it are chunks, of which only the window is loaded
+            y0, y1, x0, x1 = self._subset_bounds()
+            ydim, xdim = self.data.shape[-2:]
+            chunks = tuple((t,) for t in self.data.shape[:-2])
+            chunks += tuple(
+                tuple(c for c in (i0, i1 - i0, n - i1) if c > 0) for i0, i1, n in [(y0, y1, ydim), (x0, x1, xdim)]
+            )
+            self.nchunks = tuple(len(c) for c in chunks)
+            npartitions = self.nchunks[-2] * self.nchunks[-1]
         elif isinstance(self.data, np.ndarray):
             chunks = tuple((t,) for t in self.data.shape)
             self.nchunks = (1,) * len(self.data.shape)
@@ -1229,15 +1602,26 @@ class Field:
 
         self._data_chunks = [None] * npartitions
         self._c_data_chunks = [None] * npartitions
+        self._chunk_absmax = np.full(npartitions, np.nan)  # maximum absolute value of each loaded chunk
+        self._stale_time_slots = np.full(npartitions, -1, dtype=np.int32)  # slot of each chunk that must be reloaded
+        self._chunk_evicted = np.zeros(npartitions, dtype=bool)
         self.grid._load_chunk = np.zeros(npartitions, dtype=c_int, order="C")
+        self.grid._chunk_last_used = np.zeros(npartitions, dtype=np.int64)
         # self.grid.chunk_info format: number of dimensions (without tdim); number of chunks per dimensions;
-        #      chunksizes (the 0th dim sizes for all chunk of dim[0], then so on for next dims
+        #      chunksizes (the 0th dim sizes for all chunk of dim[0], then so on for next dims;
+        #      the position in chunk_info of the lookup table of each dim; and the lookup tables, which
+        #      contain the size of the dim followed by (chunk, index in chunk) for each index along the dim
         self.grid.chunk_info = [
             [len(self.nchunks) - 1],
             list(self.nchunks[1:]),
             sum(list(list(ci) for ci in chunks[1:]), []),  # noqa: RUF017 # TODO: Perhaps avoid quadratic list summation here
         ]
         self.grid.chunk_info = sum(self.grid.chunk_info, [])  # noqa: RUF017
+        tables = [_chunk_lookup_table(ci) for ci in chunks[1:]]
+        table_start = len(self.grid.chunk_info) + len(tables) + np.cumsum([0] + [len(t) for t in tables[:-1]])
+        self.grid.chunk_info += [int(i) for i in table_start]
+        for table in tables:
+            self.grid.chunk_info += table
         self._chunk_set = True
 
     @deprecated_made_private  # TODO: Remove 6 months after v3.1.0
@@ -1248,21 +1632,62 @@ class Field:
         if not self._chunk_set:
             self._chunk_setup()
         g = self.grid
-        if isinstance(self.data, da.core.Array):
+        if isinstance(self.data, da.core.Array) and self._raw_tiles is not None:
+            # The chunks are the memory-mapped tiles of a raw store, which the C code reads without a copy
+            for block_id in range(len(g._load_chunk)):
+                if g._load_chunk[block_id] == g._chunk_loading_requested or g._load_chunk[block_id] in g._chunk_loaded:
+                    self._data_chunks[block_id] = self._raw_tiles[block_id]
+                    self._chunk_absmax[block_id] = self._raw_absmax[block_id]
+                elif g._load_chunk[block_id] == g._chunk_not_loaded:
+                    self._data_chunks[block_id] = None
+                    self._c_data_chunks[block_id] = None
+        elif isinstance(self.data, da.core.Array):
+            _chunk_memory.register(self)
+            requested = []
             for block_id in range(len(self.grid._load_chunk)):
                 if g._load_chunk[block_id] == g._chunk_loading_requested or (
                     g._load_chunk[block_id] in g._chunk_loaded and self._data_chunks[block_id] is None
                 ):
-                    block = self._get_block(block_id)
-                    self._data_chunks[block_id] = np.array(
-                        self.data.blocks[(slice(self.grid.tdim),) + block], order="C"
-                    )
+                    requested.append(block_id)
                 elif g._load_chunk[block_id] == g._chunk_not_loaded:
                     if isinstance(self._data_chunks, list):
                         self._data_chunks[block_id] = None
                     else:
                         self._data_chunks[block_id, :] = None
                     self._c_data_chunks[block_id] = None
+                    self._stale_time_slots[block_id] = -1
+            # Chunks that were loaded before the time window advanced only need the slot of the new time
+            slots = self._get_time_slots()
+            partial = [b for b in requested if self._data_chunks[b] is not None and self._stale_time_slots[b] >= 0]
+            full = [b for b in requested if b not in partial]
+            new_ti = {b: int(np.flatnonzero(slots == self._stale_time_slots[b])[0]) for b in partial}
+            # Load all requested chunks at once, so that dask reads them in parallel
+            blocks = dask.compute(
+                *[self.data.blocks[(slice(g.tdim),) + self._get_block(b)] for b in full],
+                *[self.data.blocks[(slice(None),) + self._get_block(b)][new_ti[b]] for b in partial],
+            )
+            for block_id, block in zip(full + partial, blocks, strict=True):
+                if block_id in new_ti:
+                    self._data_chunks[block_id][self._stale_time_slots[block_id]] = block
+                else:
+                    self._data_chunks[block_id] = np.ascontiguousarray(block[np.argsort(slots)])
+                self._stale_time_slots[block_id] = -1
+                if self._chunk_evicted[block_id]:
+                    _chunk_memory.reloads += 1
+                    self._chunk_evicted[block_id] = False
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", RuntimeWarning)  # all-nan chunks
+                    self._chunk_absmax[block_id] = np.nanmax(np.abs(self._data_chunks[block_id]))
+        elif self._subset_bounds() is not None:
+            y0, y1, x0, x1 = self._subset_bounds()
+            block_id = self.grid._subset_window.center_block()
+            for i in range(len(self._data_chunks)):
+                self._data_chunks[i] = None
+                self._c_data_chunks[i] = None
+                if i != block_id:
+                    g._load_chunk[i] = g._chunk_not_loaded
+            g._load_chunk[block_id] = g._chunk_loaded_touched
+            self._data_chunks[block_id] = np.ascontiguousarray(self._time_slot_buffer()[..., y0:y1, x0:x1])
         else:
             if isinstance(self._data_chunks, list):
                 self._data_chunks[0] = None
@@ -1270,7 +1695,134 @@ class Field:
                 self._data_chunks[0, :] = None
             self._c_data_chunks[0] = None
             self.grid._load_chunk[0] = g._chunk_loaded_touched
-            self._data_chunks[0] = np.array(self.data, order="C")
+            self._data_chunks[0] = np.ascontiguousarray(self._time_slot_buffer())
+
+    def _get_time_slots(self):
+        if self._time_slots is None:
+            return np.arange(self.grid.tdim, dtype=np.int32)
+        return self._time_slots
+
+    def _swap_time_slots(self, tindex):
+        """Reuse the slot of the time that is dropped when the (two-snapshot) time window of a deferred-load
+        Field advances, for the new time at index tindex. Returns that slot.
+
+        The data (chunks) in memory are used as a ring buffer: instead of moving the data of the time
+        that stays loaded to the other slot, the mapping from time index to slot is swapped. This mapping
+        is passed to the C code through the CField struct.
+        """
+        slots = self._get_time_slots()
+        slot = slots[1 - tindex]
+        self._time_slots = np.ascontiguousarray(slots[::-1])
+        return slot
+
+    def _time_slot_buffer(self):
+        """The (numpy) data in the order of the time slots in memory."""
+        if self._time_slots is None or self._time_slots[0] == 0:
+            return self.data
+        return self.data[::-1]
+
+    def _time_slot_target(self):
+        """The (numpy) data as a (time, depth, lat, lon) view in the layout of the files, with the times in reverse order.
+
+        Index tindex of this view is the slot of the time that is dropped when the time window advances for the
+        new time at index tindex, so that computeTimeChunk can read the new snapshot straight into that slot.
+        Returns None if the data can not be viewed like that, e.g. when it has a periodic halo.
+        """
+        g = self.grid
+        if not isinstance(self.data, np.ndarray) or g.zonal_halo > 0 or g.meridional_halo > 0:
+            return None
+        zd = g.zdim - 1 if self.gridindexingtype == "pop" and g.zdim > 1 else g.zdim
+        if self.data.size != g.tdim * zd * g.ydim * g.xdim:
+            return None
+        target = self.data[::-1]
+        if g._lat_flipped:
+            target = target[..., ::-1, :]
+        target = target.reshape((g.tdim, zd, g.ydim, g.xdim))
+        return target if np.shares_memory(target, self.data) else None
+
+    def _store_time_snapshot(self, data, tindex):
+        """Write the snapshot at time index tindex into the slot of the time that is dropped, see _swap_time_slots.
+
+        Field.data then is a view on the time slots, in time order.
+        """
+        buffer = self._time_slot_buffer()
+        slot = self._swap_time_slots(tindex)
+        if not np.shares_memory(buffer[slot], data):  # unless it was read into the slot, see _time_slot_target
+            buffer[slot] = data
+        self.data = buffer if self._time_slots[0] == 0 else buffer[::-1]
+
+    def _advance_chunk_time_slots(self, tindex):
+        """Mark the slot of the dropped time in the loaded (dask) chunks as stale, for the new time at index tindex.
+
+        When the chunks are requested again, _chunk_data then only loads the new time into that slot.
+        """
+        slot = self._swap_time_slots(tindex)
+        for block_id, chunk in enumerate(self._data_chunks):
+            if chunk is None:
+                continue
+            if self._stale_time_slots[block_id] >= 0:  # the window advanced twice since the chunk was loaded
+                self._data_chunks[block_id] = None
+                self._c_data_chunks[block_id] = None
+                self._stale_time_slots[block_id] = -1
+            else:
+                self._stale_time_slots[block_id] = slot
+
+    def _request_chunks(self, z, y, x, dz=0, dy=0, dx=0):
+        """Mark the not yet loaded chunks that contain cells within (dz, dy, dx) of the positions (z, y, x) as requested.
+
+        This is used by :meth:`parcels.kernel.Kernel.prefetch_chunks`, so that the chunks are loaded
+        before the particles sample them, instead of after the kernel returned with StatusCode.Repeat.
+        For each position, all chunks in the index range of the box [x - dx, x + dx] x [y - dy, y + dy]
+        (x [z - dz, z + dz]) are requested. The cells are found approximately (on curvilinear grids from
+        the search index of the corners of the box), which is fine since any chunk that is missed is
+        still loaded on request.
+        """
+        if not (self._chunk_set and isinstance(self.data, da.core.Array)) or len(x) == 0:
+            return
+        grid = self.grid
+        dx, dy = np.broadcast_to(dx, np.shape(x)), np.broadcast_to(dy, np.shape(y))
+        if grid._gtype in [GridType.RectilinearZGrid, GridType.RectilinearSGrid]:
+            xi = [np.searchsorted(grid.lon, x + d, side="right") - 1 for d in (-dx, dx)]
+            yi = [np.searchsorted(grid.lat, y + d, side="right") - 1 for d in (-dy, dy)]
+        else:
+            corners = [(x, y)]
+            if np.any(dx > 0) or np.any(dy > 0):
+                corners += [(x + sx * dx, y + sy * dy) for sx in (-1, 1) for sy in (-1, 1)]
+            yi, xi = (list(i) for i in zip(*(grid.search_index.guess(cx, cy) for cx, cy in corners), strict=True))
+
+        # Range of chunks of each dimension, from the first to the last corner of the cells in the boxes
+        bounds = [np.cumsum(c) for c in self.data.chunks[1:]]
+
+        def block_range(bounds, i):
+            lo, hi = np.clip(np.min(i, axis=0), 0, bounds[-1] - 1), np.clip(np.max(i, axis=0) + 1, 0, bounds[-1] - 1)
+            return np.searchsorted(bounds, lo, side="right"), np.searchsorted(bounds, hi, side="right")
+
+        ranges = [block_range(bounds[-2], yi), block_range(bounds[-1], xi)]
+        if len(bounds) == 3:
+            if grid._gtype in [GridType.RectilinearZGrid, GridType.CurvilinearZGrid]:
+                increasing = grid.depth[-1] >= grid.depth[0]
+                zi = [
+                    np.searchsorted(grid.depth if increasing else grid.depth[::-1], z + d, side="right") - 1
+                    for d in (-dz, dz)
+                ]
+                zi = zi if increasing else [grid.zdim - 2 - i for i in zi]
+                ranges.insert(0, block_range(bounds[0], zi))
+            else:  # all layers of S-grids, as their depth varies in space
+                ranges.insert(0, (np.zeros(len(x), dtype=int), np.full(len(x), len(bounds[0]) - 1)))
+
+        # Number of boxes that cover each chunk, from the cumulative sums of +-1 at the corners of the box ranges
+        nchunks = self.nchunks[1:]
+        cover = np.zeros([n + 1 for n in nchunks], dtype=np.int64)
+        for corner in np.ndindex(*(2,) * len(nchunks)):
+            index = tuple(hi + 1 if c else lo for c, (lo, hi) in zip(corner, ranges, strict=True))
+            np.add.at(cover, index, (-1) ** sum(corner))
+        for axis in range(len(nchunks)):
+            cover = np.cumsum(cover, axis=axis)
+        block_ids = np.flatnonzero(cover[tuple(slice(n) for n in nchunks)] > 0)
+
+        load_chunk = grid._load_chunk
+        block_ids = block_ids[load_chunk[block_ids] == grid._chunk_not_loaded]
+        load_chunk[block_ids] = grid._chunk_loading_requested
 
     @property
     def ctypes_struct(self):
@@ -1287,6 +1839,7 @@ class Field:
                 ("allow_time_extrapolation", c_int),
                 ("time_periodic", c_int),
                 ("data_chunks", POINTER(POINTER(POINTER(c_float)))),
+                ("time_slots", POINTER(c_int)),
                 ("grid", POINTER(CGrid)),
             ]
 
@@ -1305,6 +1858,7 @@ class Field:
             else:
                 self._c_data_chunks[i] = None
 
+        self._c_time_slots = np.array(self._get_time_slots(), dtype=c_int)  # kept alive for the C code
         cstruct = CField(
             self.grid.xdim,
             self.grid.ydim,
@@ -1314,6 +1868,7 @@ class Field:
             allow_time_extrapolation,
             time_periodic,
             (POINTER(POINTER(c_float)) * len(self._c_data_chunks))(*self._c_data_chunks),
+            self._c_time_slots.ctypes.data_as(POINTER(c_int)),
             pointer(self.grid.ctypes_struct),
         )
         return cstruct
@@ -1448,21 +2003,120 @@ class Field:
         return data
 
     def computeTimeChunk(self, data, tindex):
+        g = self.grid
+        ti = g._ti + tindex
+        future = self._prefetched.pop(ti, None) if isinstance(tindex, int) else None
+        cache = self._snapshot_cache if isinstance(tindex, int) and self.chunksize in [False, None] else None
+        filebuffer, buffer_data = None, None
+        if cache is not None:
+            buffer_data = cache.get(self._snapshot_key(ti))
+        if buffer_data is None:
+            if future is not None and not future.cancelled():
+                filebuffer, buffer_data = future.result()
+            else:
+                # read straight into the time slot of data if possible, unless the snapshot is kept in the cache
+                out = None
+                if (
+                    isinstance(tindex, int)
+                    and cache is None
+                    and isinstance(data, np.ndarray)
+                    and self._subset_bounds() is None
+                ):
+                    out = data[tindex : tindex + 1]
+                filebuffer, buffer_data = self._read_time_snapshot(ti, tindex, out=out)
+            if cache is not None:
+                cache.put(self._snapshot_key(ti), buffer_data)
+        elif future is not None and not future.cancel():
+            future.add_done_callback(_close_prefetched_filebuffer)
+        if isinstance(tindex, int) and self._subset_bounds() is not None:
+            y0, y1, x0, x1 = self.grid._subset_window.file_bounds()
+            data[tindex] = 0  # the data outside the window is never sampled
+            data[tindex, ..., y0:y1, x0:x1] = buffer_data[0]
+        elif (
+            isinstance(tindex, int)
+            and isinstance(data, np.ndarray)
+            and data[tindex : tindex + 1].shape == buffer_data.shape
+        ):
+            if not np.shares_memory(data[tindex : tindex + 1], buffer_data):
+                data[tindex : tindex + 1] = buffer_data  # no need to reallocate data
+        else:
+            data = self._data_concatenate(data, buffer_data, tindex)
+        self.filebuffers[tindex] = filebuffer
+        return data
+
+    def _snapshot_key(self, ti):
+        """Key of the snapshot at index ti of grid.time_full in the FieldSet's snapshot cache."""
+        g = self.grid
+        if g._add_last_periodic_data_timestep and ti == len(g.time_full) - 1:
+            ti = 0  # the last snapshot of a time_periodic Field is a copy of the first one
+        return (self.name, str(self._dataFiles[ti]), float(g.time_full[ti]), _indices_key(self._read_indices()))
+
+    def _subset_bounds(self):
+        """Bounds (y0, y1, x0, x1) of the subset window of the grid, or None if the complete Field is read."""
+        window = self.grid._subset_window
+        return None if window is None else window.bounds
+
+    @property
+    def _subset_supported(self):
+        """Whether the Field can be read in a subset window around the particles, see FieldSet.set_spatial_subsetting."""
+        g = self.grid
+        return (
+            g.defer_load
+            and self._dataFiles is not None
+            and self.chunksize in [False, None]
+            and self.gridindexingtype != "croco"
+            and g.xdim > 1
+            and g.ydim > 1
+            and g.zonal_halo == 0
+            and g.meridional_halo == 0
+        )
+
+    def _read_indices(self):
+        """The indices of the Field data to read from file, restricted to the subset window of the grid if there is one."""
+        if self._subset_bounds() is None:
+            return self.indices
+        y0, y1, x0, x1 = self.grid._subset_window.file_bounds()
+        lat = self.indices.get("lat", range(self.grid.ydim))
+        lon = self.indices.get("lon", range(self.grid.xdim))
+        return dict(self.indices, lat=lat[y0:y1], lon=lon[x0:x1])
+
+    def _reload_subset_window(self):
+        """Read the loaded times of the Field again, after the subset window of its grid changed."""
+        self._cancel_prefetch()
+        if not isinstance(self.data, np.ndarray):
+            return
+        g = self.grid
+        zd = g.zdim - 1 if self.gridindexingtype == "pop" and g.zdim > 1 else g.zdim
+        data = np.empty((g.tdim, zd, g.ydim, g.xdim), dtype=np.float32)
+        for tindex in range(g.tdim):
+            if self.filebuffers[tindex] is not None:
+                self.filebuffers[tindex].close()
+            data = self.computeTimeChunk(data, tindex)
+        self.data = self._reshape(self._rescale_and_set_minmax(data))
+        self._time_slots = None
+        self._chunk_setup()
+
+    def _read_time_snapshot(self, ti, tindex=None, out=None):
+        """Open the file of the snapshot at index ti of grid.time_full, and read its data.
+
+        Returns the (open) FileBuffer and the data, reshaped to (time, depth, lat, lon). If out is given, a
+        ZarrFileBuffer reads the data straight into it when it can, so that the data returned is out itself.
+        """
         g = self.grid
         timestamp = self.timestamps
         if timestamp is not None:
             summedlen = np.cumsum([len(ls) for ls in self.timestamps])
-            if g._ti + tindex >= summedlen[-1]:
-                ti = g._ti + tindex - summedlen[-1]
+            if ti >= summedlen[-1]:
+                ti_stamp = ti - summedlen[-1]
             else:
-                ti = g._ti + tindex
-            timestamp = self.timestamps[np.where(ti < summedlen)[0][0]]
+                ti_stamp = ti
+            timestamp = self.timestamps[np.where(ti_stamp < summedlen)[0][0]]
 
         rechunk_callback_fields = self._chunk_setup if isinstance(tindex, list) else None
         filebuffer = self._field_fb_class(
-            self._dataFiles[g._ti + tindex],
+            self._dataFiles[ti],
             self.dimensions,
-            self.indices,
+            self._read_indices(),
             netcdf_engine=self.netcdf_engine,
             timestamp=timestamp,
             interp_method=self.interp_method,
@@ -1471,11 +2125,14 @@ class Field:
             cast_data_dtype=self.cast_data_dtype,
             rechunk_callback_fields=rechunk_callback_fields,
             chunkdims_name_map=self.netcdf_chunkdims_name_map,
+            file_pool=self._file_pool,
         )
+        if out is not None and isinstance(filebuffer, ZarrFileBuffer):
+            filebuffer.out = out
         filebuffer.__enter__()
         time_data = filebuffer.time
         time_data = g.time_origin.reltime(time_data)
-        filebuffer.ti = (time_data <= g.time[tindex]).argmin() - 1
+        filebuffer.ti = (time_data <= g.time_full[ti]).argmin() - 1
         if self.netcdf_engine != "xarray":
             filebuffer.name = filebuffer.parse_name(self.filebuffername)
         buffer_data = filebuffer.data
@@ -1498,9 +2155,25 @@ class Field:
                     (),
                 ),
             )
-        data = self._data_concatenate(data, buffer_data, tindex)
-        self.filebuffers[tindex] = filebuffer
-        return data
+        return filebuffer, buffer_data
+
+    def _prefetch_time_snapshot(self, ti, executor):
+        """Start reading the snapshot at index ti of grid.time_full on the executor, for computeTimeChunk.
+
+        Snapshots that were prefetched earlier but are not needed anymore are discarded.
+        """
+        if self._snapshot_cache is not None and self._snapshot_key(ti) in self._snapshot_cache:
+            self._cancel_prefetch()
+            return
+        self._cancel_prefetch(keep=ti)
+        if ti not in self._prefetched:
+            self._prefetched[ti] = executor.submit(self._read_time_snapshot, ti)
+
+    def _cancel_prefetch(self, keep=None):
+        for ti in [ti for ti in self._prefetched if ti != keep]:
+            future = self._prefetched.pop(ti)
+            if not future.cancel():  # already being read: close its file once done
+                future.add_done_callback(_close_prefetched_filebuffer)
 
 
 class VectorField:
@@ -2043,6 +2716,8 @@ class VectorField:
                     )
 
     def __getitem__(self, key):
+        if _is_array_key(key):
+            return self._getitem_array(*_unpack_array_key(key))
         try:
             if _isParticle(key):
                 return self.eval(key.time, key.depth, key.lat, key.lon, key)
@@ -2051,6 +2726,77 @@ class VectorField:
         except tuple(AllParcelsErrorCodes.keys()) as error:
             return _deal_with_errors(error, key, vector_type=self.vector_type)
 
+    def _getitem_array(self, time, z, y, x, particle):
+        """Sample the VectorField at arrays of positions, setting the state of the particles for which sampling failed."""
+        if not self._array_sampling_supported:
+            return _getitem_elementwise(self, time, z, y, x, particle, ncomp=len(self._components))
+        if particle is not None and self.U.grid._gtype == GridType.CurvilinearZGrid:
+            # Start the index search from the cells in which the particles were found before
+            pxi, pyi = particle.xi, particle.yi
+            values, errors = self._sample_array(time, z, y, x, pxi[:, self.U.igrid], pyi[:, self.U.igrid])
+            particle.xi, particle.yi = pxi, pyi
+        else:
+            values, errors = self._sample_array(time, z, y, x)
+        _deal_with_array_errors(errors, particle, z, y, x)
+        return tuple(
+            np.where(errors == StatusCode.Success, f.units.to_target(value, z, y, x), 0)
+            for f, value in zip(self._components, values, strict=True)
+        )
+
+    @property
+    def _components(self):
+        return [self.U, self.V, self.W] if "3D" in self.vector_type else [self.U, self.V]
+
+    @property
+    def _array_sampling_supported(self):
+        """Whether the VectorField can be sampled at arrays of positions at once with _sample_array."""
+        if self.U.interp_method in ["cgrid_velocity", "partialslip", "freeslip"]:
+            return False
+        return all(f._array_sampling_supported for f in self._components)
+
+    def _sample_array(self, time, z, y, x, xi=None, yi=None):
+        """Interpolate all components at arrays of positions, without unit conversion.
+
+        Returns the values of each component and the (first) StatusCode of each position.
+        Components on the same grid share the index search, which starts from the hints xi and yi on the grid of U.
+        """
+        search_cache = {}
+        samples = [
+            f._sample_array(time, z, y, x, *((xi, yi) if f.grid is self.U.grid else (None, None)), search_cache)
+            for f in self._components
+        ]
+        errors = samples[0][1]
+        for _, err in samples[1:]:
+            errors = np.where(errors == StatusCode.Success, err, errors)
+        return [np.where(errors == StatusCode.Success, value, 0) for value, _ in samples], errors
+
+    def eval_many(self, time, z, y, x, applyConversion=True, xi=None, yi=None, fill_value=None):
+        """Interpolate the components of the VectorField in space and time at arrays of positions at once.
+
+        This is the batched version of :meth:`eval`. See :meth:`Field.eval_many` for the parameters.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            Sampled values of each of the components (u, v) or (u, v, w).
+        """
+        time, z, y, x, shape = _flatten_positions(time, z, y, x)
+        if self._array_sampling_supported:
+            xi_hint, yi_hint = _index_hint(xi), _index_hint(yi)
+            values, errors = self._sample_array(time, z, y, x, xi=xi_hint, yi=yi_hint)
+            _store_index_hint(xi, xi_hint)
+            _store_index_hint(yi, yi_hint)
+            if applyConversion:
+                values = [f.units.to_target(v, z, y, x) for f, v in zip(self._components, values, strict=True)]
+        else:
+            values, errors = _eval_elementwise(self, time, z, y, x, applyConversion, ncomp=len(self._components))
+
+        if fill_value is None:
+            _raise_array_errors(errors, time, z, y, x)
+        else:
+            values = [np.where(errors == StatusCode.Success, v, fill_value) for v in values]
+        return tuple(v.reshape(shape) for v in values)
+
     @deprecated_made_private  # TODO: Remove 6 months after v3.1.0
     def ccode_eval(self, *args, **kwargs):
         return self._ccode_eval(*args, **kwargs)
@@ -2153,6 +2899,11 @@ class NestedField(list):
     def __getitem__(self, key):
         if isinstance(key, int):
             return list.__getitem__(self, key)
+        elif _is_array_key(key):
+            ncomp = None
+            if isinstance(self[0], VectorField):
+                ncomp = 3 if "3D" in self[0].vector_type else 2
+            return _getitem_elementwise(self, *_unpack_array_key(key), ncomp=ncomp)
         else:
             for iField in range(len(self)):
                 try:
@@ -1,20 +1,29 @@
+import contextlib
 import datetime
 import math
+import os
+import threading
 import warnings
 
 import dask.array as da
 import numpy as np
 import psutil
 import xarray as xr
+import zarr
 from dask import config as da_conf
 from dask import utils as da_utils
 from netCDF4 import Dataset as ncDataset
 
+from parcels._snapshot_cache import _indices_key
 from parcels._typing import InterpMethodOption
 from parcels.tools.converters import convert_xarray_time_units
 from parcels.tools.statuscodes import DaskChunkingError
 from parcels.tools.warnings import FileWarning
 
+# The netCDF and HDF5 libraries are not thread-safe, and snapshots are also read on the prefetch thread (see
+# FieldSet.set_prefetch), so every netCDF file is opened, read and closed while holding this lock.
+_netcdf_lock = threading.RLock()
+
 
 class _FileBuffer:
     def __init__(
@@ -27,6 +36,7 @@ class _FileBuffer:
         data_full_zdim=None,
         cast_data_dtype=np.float32,
         gridindexingtype="nemo",
+        file_pool=None,
         **kwargs,
     ):
         self.filename = filename
@@ -39,11 +49,42 @@ class _FileBuffer:
         self.interp_method = interp_method
         self.gridindexingtype = gridindexingtype
         self.data_full_zdim = data_full_zdim
+        self.file_pool = file_pool  # see FieldSet.set_file_pool
+        self._pool_key = None
         if ("lon" in self.indices) or ("lat" in self.indices):
             self.nolonlatindices = False
         else:
             self.nolonlatindices = True
 
+    def _file_lock(self):
+        """Lock that is held while the file is opened, read or closed, see _netcdf_lock."""
+        return _netcdf_lock
+
+    def _open_pooled(self, key, open_dataset):
+        """Open the dataset with open_dataset(), or share it through the file pool under key if there is one."""
+        with self._file_lock():
+            if self.file_pool is None:
+                return open_dataset()
+            self._pool_key = key
+            return self.file_pool.acquire(key, open_dataset)
+
+    def _close_dataset(self):
+        if self.dataset is None:
+            return
+        with self._file_lock():
+            if self._pool_key is None:
+                self.dataset.close()
+            else:
+                self.file_pool.release(self._pool_key)
+                self._pool_key = None
+        self.dataset = None
+
+    def _pooled_metadata(self, item, decode):
+        """Decode item from the file with decode(), once for all FileBuffers that share the file pool."""
+        if self.file_pool is None:
+            return decode()
+        return self.file_pool.metadata((str(self.filename), self.netcdf_engine) + item, decode)
+
 
 class NetcdfFileBuffer(_FileBuffer):
     def __init__(self, *args, **kwargs):
@@ -52,34 +93,36 @@ class NetcdfFileBuffer(_FileBuffer):
         super().__init__(*args, **kwargs)
 
     def __enter__(self):
+        self.dataset = self._open_pooled((str(self.filename), self.netcdf_engine), self._open_dataset)
+        for inds in self.indices.values():
+            if type(inds) not in [list, range]:
+                raise RuntimeError("Indices for field subsetting need to be a list")
+        return self
+
+    def _open_dataset(self):
         try:
             # Unfortunately we need to do if-else here, cause the lock-parameter is either False or a Lock-object
             # (which we would rather want to have being auto-managed).
             # If 'lock' is not specified, the Lock-object is auto-created and managed by xarray internally.
-            self.dataset = xr.open_dataset(str(self.filename), decode_cf=True, engine=self.netcdf_engine)
-            self.dataset["decoded"] = True
+            dataset = xr.open_dataset(str(self.filename), decode_cf=True, engine=self.netcdf_engine)
+            dataset["decoded"] = True
         except:
             warnings.warn(
                 f"File {self.filename} could not be decoded properly by xarray (version {xr.__version__}). "
                 "It will be opened with no decoding. Filling values might be wrongly parsed.",
                 FileWarning,
-                stacklevel=2,
+                stacklevel=3,
             )
 
-            self.dataset = xr.open_dataset(str(self.filename), decode_cf=False, engine=self.netcdf_engine)
-            self.dataset["decoded"] = False
-        for inds in self.indices.values():
-            if type(inds) not in [list, range]:
-                raise RuntimeError("Indices for field subsetting need to be a list")
-        return self
+            dataset = xr.open_dataset(str(self.filename), decode_cf=False, engine=self.netcdf_engine)
+            dataset["decoded"] = False
+        return dataset
 
     def __exit__(self, type, value, traceback):
         self.close()
 
     def close(self):
-        if self.dataset is not None:
-            self.dataset.close()
-            self.dataset = None
+        self._close_dataset()
 
     def parse_name(self, name):
         if isinstance(name, list):
@@ -93,6 +136,21 @@ class NetcdfFileBuffer(_FileBuffer):
 
     @property
     def latlon(self):
+        with self._file_lock():
+            return self._latlon()
+
+    def _latlon(self):
+        def decode():
+            lat, lon = self._decode_latlon()
+            return lat, lon, {dim: self.indices[dim] for dim in ["lon", "lat"] if dim in self.indices}
+
+        item = ("latlon", self.dimensions["lon"], self.dimensions["lat"], self.gridindexingtype)
+        item += (_indices_key({dim: self.indices[dim] for dim in ["lon", "lat"] if dim in self.indices}),)
+        lat, lon, indices = self._pooled_metadata(item, decode)
+        self.indices.update(indices)
+        return lat.copy(), lon.copy()  # the Grids may change their coordinates in place
+
+    def _decode_latlon(self):
         lon = self.dataset[self.dimensions["lon"]]
         lat = self.dataset[self.dimensions["lat"]]
         if self.nolonlatindices and self.gridindexingtype not in ["croco"]:
@@ -145,6 +203,22 @@ class NetcdfFileBuffer(_FileBuffer):
 
     @property
     def depth(self):
+        with self._file_lock():
+            return self._depth()
+
+    def _depth(self):
+        if "depth" not in self.dimensions:
+            return self._decode_depth()
+
+        def decode():
+            return self._decode_depth(), self.data_full_zdim, self.indices["depth"]
+
+        item = ("depth", self.dimensions["depth"], self.gridindexingtype, self.nolonlatindices)
+        item += (_indices_key({dim: self.indices[dim] for dim in ["depth", "lon", "lat"] if dim in self.indices}),)
+        depth, self.data_full_zdim, self.indices["depth"] = self._pooled_metadata(item, decode)
+        return None if depth is None else depth.copy()
+
+    def _decode_depth(self):
         if "depth" in self.dimensions:
             depth = self.dataset[self.dimensions["depth"]]
             depthsize = depth.size if len(depth.shape) == 1 else depth.shape[-3]
@@ -227,7 +301,8 @@ class NetcdfFileBuffer(_FileBuffer):
 
     @property
     def data(self):
-        return self.data_access()
+        with self._file_lock():
+            return self.data_access()
 
     def data_access(self):
         data = self.dataset[self.name]
@@ -237,7 +312,8 @@ class NetcdfFileBuffer(_FileBuffer):
 
     @property
     def time(self):
-        return self.time_access()
+        with self._file_lock():
+            return self.time_access()
 
     def time_access(self):
         if self.timestamp is not None:
@@ -246,6 +322,9 @@ class NetcdfFileBuffer(_FileBuffer):
         if "time" not in self.dimensions:
             return np.array([None])
 
+        return self._pooled_metadata(("time", self.dimensions["time"]), self._decode_time).copy()
+
+    def _decode_time(self):
         time_da = self.dataset[self.dimensions["time"]]
         convert_xarray_time_units(time_da, self.dimensions["time"])
         time = (
@@ -333,41 +412,62 @@ class DaskFileBuffer(NetcdfFileBuffer):
 
         init_chunk_dict = None
         if self.chunksize not in [False, None]:
+            with self._file_lock():
+                init_chunk_dict = self._pooled_initial_chunk_dictionary()
+        key = (str(self.filename), self.netcdf_engine, repr(init_chunk_dict), self.lock_file)
+        self.dataset = self._open_pooled(key, lambda: self._open_dask_dataset(init_chunk_dict))
+
+        for inds in self.indices.values():
+            if type(inds) not in [list, range]:
+                raise RuntimeError("Indices for field subsetting need to be a list")
+        return self
+
+    def _pooled_initial_chunk_dictionary(self):
+        """The initial chunk dictionary (see _get_initial_chunk_dictionary), which is determined once for all
+        FileBuffers of the same file, dimensions and chunksize that share the file pool.
+        """
+
+        def decode():
             init_chunk_dict = self._get_initial_chunk_dictionary()
+            return init_chunk_dict, self.chunk_mapping, self.chunksize, self.autochunkingfailed
+
+        item = ("chunks", repr(self.dimensions), repr(self.chunksize), repr(self._static_name_maps))
+        init_chunk_dict, chunk_mapping, chunksize, self.autochunkingfailed = self._pooled_metadata(item, decode)
+        self.chunk_mapping = dict(chunk_mapping)
+        self.chunksize = dict(chunksize) if isinstance(chunksize, dict) else chunksize
+        return dict(init_chunk_dict)
+
+    def _open_dask_dataset(self, init_chunk_dict):
         try:
             # Unfortunately we need to do if-else here, cause the lock-parameter is either False or a Lock-object
             # (which we would rather want to have being auto-managed).
             # If 'lock' is not specified, the Lock-object is auto-created and managed by xarray internally.
             if self.lock_file:
-                self.dataset = xr.open_dataset(
+                dataset = xr.open_dataset(
                     str(self.filename), decode_cf=True, engine=self.netcdf_engine, chunks=init_chunk_dict
                 )
             else:
-                self.dataset = xr.open_dataset(
+                dataset = xr.open_dataset(
                     str(self.filename), decode_cf=True, engine=self.netcdf_engine, chunks=init_chunk_dict, lock=False
                 )
-            self.dataset["decoded"] = True
+            dataset["decoded"] = True
         except:
             warnings.warn(
                 f"File {self.filename} could not be decoded properly by xarray (version {xr.__version__}). "
                 "It will be opened with no decoding. Filling values might be wrongly parsed.",
                 FileWarning,
-                stacklevel=2,
+                stacklevel=4,
             )
             if self.lock_file:
-                self.dataset = xr.open_dataset(
+                dataset = xr.open_dataset(
                     str(self.filename), decode_cf=False, engine=self.netcdf_engine, chunks=init_chunk_dict
                 )
             else:
-                self.dataset = xr.open_dataset(
+                dataset = xr.open_dataset(
                     str(self.filename), decode_cf=False, engine=self.netcdf_engine, chunks=init_chunk_dict, lock=False
                 )
-            self.dataset["decoded"] = False
-
-        for inds in self.indices.values():
-            if type(inds) not in [list, range]:
-                raise RuntimeError("Indices for field subsetting need to be a list")
-        return self
+            dataset["decoded"] = False
+        return dataset
 
     def __exit__(self, type, value, traceback):
         """Function releases the file handle.
@@ -384,9 +484,7 @@ class DaskFileBuffer(NetcdfFileBuffer):
         This function can be called to initialise an orderly teardown of a FileBuffer object with dask, meaning
         to release the file handle, deposing the dataset, and releasing the file lock (if required).
         """
-        if self.dataset is not None:
-            self.dataset.close()
-            self.dataset = None
+        self._close_dataset()
         self.chunking_finalized = False
         self.chunk_mapping = None
 
@@ -814,7 +912,8 @@ class DaskFileBuffer(NetcdfFileBuffer):
 
     @property
     def data(self):
-        return self.data_access()
+        with self._file_lock():
+            return self.data_access()
 
     def data_access(self):
         data = self.dataset[self.name]
@@ -860,3 +959,153 @@ class DaskFileBuffer(NetcdfFileBuffer):
 class DeferredDaskFileBuffer(DaskFileBuffer):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+
+
+def _is_zarr_store(filename):
+    """Whether filename is a Zarr store (a directory with a .zarr extension or with Zarr metadata)."""
+    filename = str(filename)
+    if filename.rstrip("/").endswith(".zarr"):
+        return True
+    return os.path.isdir(filename) and any(
+        os.path.isfile(os.path.join(filename, f)) for f in [".zgroup", ".zarray", ".zmetadata"]
+    )
+
+
+class _ZarrVariable:
+    """Variable of a Zarr store that is indexed like the xarray DataArrays in NetcdfFileBuffer._apply_indices.
+
+    Indexing reads only the Zarr chunks that overlap the selection (with orthogonal indexing), and applies
+    the _FillValue, scale_factor and add_offset of the variable without going through xarray. If the
+    selection is exactly one uncompressed float32 chunk, the data is a (read-only) view on the chunk as it
+    is stored, without decoding or copying it. If out is given and the chunk is a file of a directory store,
+    the chunk is instead read straight from the file into out, which is then returned.
+    """
+
+    def __init__(self, array, out=None):
+        self.array = array
+        self.out = out
+        self.shape = array.shape
+        self.scale_factor = array.attrs.get("scale_factor", None)
+        self.add_offset = array.attrs.get("add_offset", None)
+        fill_value = array.fill_value
+        self.fill_value = None if fill_value is None or np.isnan(fill_value) else fill_value
+
+    def _selection(self, key):
+        key = key if isinstance(key, tuple) else (key,)
+        key += (slice(None),) * (len(self.shape) - len(key))
+        selection = []
+        for k in key:
+            if isinstance(k, (int, np.integer)):
+                selection.append(int(k))
+            elif isinstance(k, range) and k.step == 1 and len(k) > 0:
+                selection.append(slice(k.start, k.stop))
+            elif isinstance(k, slice):
+                selection.append(k)
+            else:
+                selection.append(np.asarray(k, dtype=np.int64))
+        return tuple(selection)
+
+    def _stored_chunk(self, selection):
+        """The selection as a view on the stored chunk, if it is exactly one uncompressed float32 chunk, or None."""
+        array = self.array
+        native = np.dtype(np.float32).newbyteorder("=")
+        if array.compressor is not None or array.filters or array.dtype != native or array.order != "C":
+            return None
+        if self.fill_value is not None or self.scale_factor is not None or self.add_offset is not None:
+            return None
+        coords, view = [], []
+        for sel, size, chunk in zip(selection, self.shape, array.chunks, strict=True):
+            if isinstance(sel, int):
+                if chunk != 1:
+                    return None
+                coords.append(sel)
+                view.append(0)
+                continue
+            if not isinstance(sel, slice) or sel.step not in [None, 1]:
+                return None
+            start, stop, _ = sel.indices(size)
+            if start % chunk != 0 or stop - start != min(chunk, size - start):
+                return None
+            coords.append(start // chunk)
+            view.append(slice(0, stop - start))
+        separator = getattr(array, "_dimension_separator", None) or "."
+        key = separator.join(str(c) for c in coords)
+        key = f"{array.path}/{key}" if array.path else key
+        shape = tuple(s.stop for s in view if isinstance(s, slice))
+        if self.out is not None and self.out.size == math.prod(shape) and self._read_chunk_into_out(key):
+            return self.out.reshape(shape)
+        try:
+            # the chunk_store, as the store of a consolidated group only holds the metadata
+            buffer = array.chunk_store[key]
+        except KeyError:  # chunk that only contains fill values
+            return None
+        return np.frombuffer(buffer, dtype=np.float32).reshape(array.chunks)[tuple(view)]
+
+    def _read_chunk_into_out(self, key):
+        """Read the stored chunk with key from its file into out, if out has exactly the (float32) size of the file."""
+        out, store = self.out, self.array.chunk_store
+        if not isinstance(store, zarr.storage.DirectoryStore):
+            return False
+        if out.dtype != self.array.dtype or not out.flags.c_contiguous or not out.flags.writeable:
+            return False
+        try:
+            with open(os.path.join(store.path, key), "rb") as f:
+                return os.fstat(f.fileno()).st_size == out.nbytes and f.readinto(out.data.cast("B")) == out.nbytes
+        except OSError:  # e.g. a chunk that only contains fill values, which is not stored
+            return False
+
+    def __getitem__(self, key):
+        selection = self._selection(key)
+        data = self._stored_chunk(selection)
+        if data is not None:
+            return data
+        data = self.array.oindex[selection]
+        if self.fill_value is not None:
+            data = np.where(data == self.fill_value, np.nan, data)
+        if self.scale_factor is not None:
+            data = data * self.scale_factor
+        if self.add_offset is not None:
+            data = data + self.add_offset
+        return data
+
+
+class ZarrFileBuffer(NetcdfFileBuffer):
+    """FileBuffer that reads the data of a Field directly from a Zarr store.
+
+    The time and coordinates are read with xarray (with the zarr engine), but the data of each time
+    snapshot is read from the Zarr arrays without xarray decoding, and only from the Zarr chunks that overlap
+    the (time, depth, lat, lon) indices. When these are exactly one uncompressed float32 chunk, e.g. for a
+    store with chunks of one time step that was written without compressor, the data is not copied.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs["netcdf_engine"] = "zarr"
+        super().__init__(*args, **kwargs)
+        self._zarr_group = None
+        self.out = None  # array to read the data into, if possible, see _ZarrVariable
+
+    def _file_lock(self):
+        return contextlib.nullcontext()  # Zarr stores can be read from different threads
+
+    def __enter__(self):
+        super().__enter__()
+        try:
+            self._zarr_group = zarr.open_consolidated(str(self.filename), mode="r")
+        except KeyError:  # no consolidated metadata
+            self._zarr_group = zarr.open_group(str(self.filename), mode="r")
+        return self
+
+    def close(self):
+        self._zarr_group = None
+        super().close()
+
+    def data_access(self):
+        data = _ZarrVariable(self._zarr_group[self.name], out=self.out)
+        ti = range(data.shape[0]) if self.ti is None else self.ti
+        data = self._apply_indices(data, ti)
+        return np.asarray(data, dtype=self.cast_data_dtype)
+
+
+class DeferredZarrFileBuffer(ZarrFileBuffer):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
@@ -2,6 +2,8 @@ import importlib.util
 import os
 import sys
 import warnings
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from glob import glob
 
@@ -9,10 +11,15 @@ import dask.array as da
 import numpy as np
 
 from parcels._compat import MPI
+from parcels._file_pool import _FilePool
+from parcels._raw_store import _read_raw_store, _write_raw_store
+from parcels._snapshot_cache import _SnapshotCache
+from parcels._subset_window import _particle_positions, _SubsetWindow
 from parcels._typing import GridIndexingType, InterpMethodOption, Mesh, TimePeriodic
 from parcels.field import DeferredArray, Field, NestedField, VectorField
 from parcels.grid import Grid
 from parcels.gridset import GridSet
+from parcels.particledata import _TOMBSTONE
 from parcels.particlefile import ParticleFile
 from parcels.tools._helpers import deprecated_made_private, fieldset_repr
 from parcels.tools.converters import TimeConverter, convert_xarray_time_units
@@ -41,6 +48,8 @@ class FieldSet:
         self.gridset = GridSet()
         self._completed: bool = False
         self._particlefile: ParticleFile | None = None
+        self._snapshot_cache: _SnapshotCache | None = None
+        self._file_pool: _FilePool | None = None
         if U:
             self.add_field(U, "U")
             # see #1663 for type-ignore reason
@@ -54,6 +63,9 @@ class FieldSet:
                 self.add_field(field, name)
 
         self.compute_on_defer = None
+        self._prefetch_executor: ThreadPoolExecutor | None = None
+        self._prefetch_finalizer: weakref.finalize | None = None
+        self._subset_halo: int | None = None
         self._add_UVfield()
 
     def __repr__(self):
@@ -206,10 +218,14 @@ class FieldSet:
             for fld in field:
                 self.gridset.add_grid(fld)
                 fld.fieldset = self
+                fld._snapshot_cache = self._snapshot_cache
+                fld._file_pool = self._file_pool
         else:
             setattr(self, name, field)
             self.gridset.add_grid(field)
             field.fieldset = self
+            field._snapshot_cache = self._snapshot_cache
+            field._file_pool = self._file_pool
 
     def add_constant_field(self, name: str, value: float, mesh: Mesh = "flat"):
         """Wrapper function to add a Field that is constant in space,
@@ -444,6 +460,11 @@ class FieldSet:
         netcdf_engine :
             engine to use for netcdf reading in xarray. Default is 'netcdf',
             but in cases where this doesn't work, setting netcdf_engine='scipy' could help. Accepted options are the same as the ``engine`` parameter in ``xarray.open_dataset()``.
+            Default for Zarr stores is 'zarr', in which case the data of Fields without chunksize is read directly from the Zarr chunks.
+        metadata_index : bool or str
+            Whether to keep an index of the time stamps of the data files between runs, so that only files
+            that were added or changed since the previous run are opened to read their time.
+            Can also be the directory in which the index is stored. Default is False, see :meth:`parcels.field.Field.from_netcdf`.
         **kwargs :
             Keyword arguments passed to the :class:`parcels.Field` constructor.
 
@@ -473,6 +494,8 @@ class FieldSet:
         fields: dict[str, Field] = {}
         if "creation_log" not in kwargs.keys():
             kwargs["creation_log"] = "from_netcdf"
+        # Fields that are read from the same files share the open datasets and their decoded time and coordinates
+        file_pool = _FilePool()
         for var, name in variables.items():
             # Resolve all matching paths for the current variable
             paths = filenames[var] if type(filenames) is dict and var in filenames else filenames
@@ -539,8 +562,10 @@ class FieldSet:
                 fieldtype=fieldtype,
                 chunksize=varchunksize,
                 dataFiles=dFiles,
+                file_pool=file_pool,
                 **kwargs,
             )
+        file_pool.clear()
 
         u = fields.pop("U", None)
         v = fields.pop("V", None)
@@ -1420,6 +1445,28 @@ class FieldSet:
         v = fields.pop("V", None)
         return cls(u, v, fields=fields)
 
+    @classmethod
+    def from_raw_store(cls, path):
+        """Initialises a FieldSet from a raw store that was written with :meth:`write_raw_store`.
+
+        The tiles of the store are memory-mapped, so that the C code of JIT kernels reads the data of
+        the Fields directly from the page cache, instead of from a copy of each chunk. Several
+        processes that read the same store on one node then share that memory, and advancing in time
+        copies no data, since each tile holds all time snapshots.
+
+        Constants that were added to the FieldSet with :meth:`add_constant` are not stored, and need
+        to be added again.
+
+        Parameters
+        ----------
+        path : str
+            Directory of the raw store
+        """
+        fields = _read_raw_store(path)
+        u = fields.pop("U", None)
+        v = fields.pop("V", None)
+        return cls(u, v, fields=fields)
+
     @classmethod
     def from_modulefile(cls, filename, modulename="create_fieldset", **kwargs):
         """Initialises FieldSet data from a file containing a python module file with a create_fieldset() function.
@@ -1525,6 +1572,215 @@ class FieldSet:
                 if isinstance(v, Field) and (v.name != "U") and (v.name != "V"):
                     v.write(filename)
 
+    def write_raw_store(self, path, chunksize=None):
+        """Write the data of all Fields as uncompressed float32 tiles, to be opened with :meth:`from_raw_store`.
+
+        Each Field is stored in a directory under path, with one file per tile, which holds the data of
+        all time snapshots of the Field in a C-contiguous array of shape (time, depth, lat, lon). The
+        tiles are the chunks of the Fields in JIT execution. The time snapshots of deferred-load Fields
+        are read one by one, so the store is written without loading all the data in memory.
+
+        Parameters
+        ----------
+        path : str
+            Directory of the raw store
+        chunksize : dict
+            Size of the tiles, as ``{parcels_dimname: chunksize_as_int}`` for 'depth', 'lat' and 'lon'.
+            Default is None, which uses the chunksize of the Fields, or one tile per Field without chunksize
+        """
+        _write_raw_store(self, path, chunksize)
+
+    def set_prefetch(self, prefetch=True):
+        """Read the next time snapshot of deferred-load Fields in the background, while the kernel runs.
+
+        When enabled, every time that new snapshots are loaded into the FieldSet, the one after them
+        (or before them when integrating backward in time, and wrapping around for time_periodic
+        Fields) is read on a background thread. :meth:`computeTimeChunk` then uses that snapshot
+        instead of reading it when the integration crosses the next time boundary.
+
+        This only applies to Fields that are loaded with deferred_load and without chunksize; Fields
+        with a chunksize are read lazily per chunk. As the netCDF libraries are not thread-safe, netCDF
+        files are never read on both threads at the same time, while Zarr stores are read in parallel.
+        The background thread is stopped when the FieldSet is garbage collected, or with ``set_prefetch(False)``.
+
+        Parameters
+        ----------
+        prefetch : bool
+            Whether to prefetch snapshots. Disabling it discards the snapshots that are being read.
+        """
+        if prefetch and self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="parcels-prefetch")
+            self._prefetch_finalizer = weakref.finalize(
+                self, self._prefetch_executor.shutdown, wait=False, cancel_futures=True
+            )
+        elif not prefetch and self._prefetch_executor is not None:
+            for f in self.get_fields():
+                if isinstance(f, Field):
+                    f._cancel_prefetch()
+            self._prefetch_finalizer.detach()
+            self._prefetch_executor.shutdown(wait=True)
+            self._prefetch_executor = self._prefetch_finalizer = None
+
+    def set_snapshot_cache(self, max_size=1024, spill_dir=None, max_spill_size=None):
+        """Keep the snapshots that deferred-load Fields read from their files in a least-recently-used cache.
+
+        Without the cache, every time that the integration crosses a time boundary, the next snapshot
+        is read and decoded from its file again. With the cache, snapshots that were read before, e.g.
+        in an earlier period of a time_periodic Field, in a backward run after a forward run or in the
+        execution of another ParticleSet on this FieldSet, are taken from memory (or from disk) instead.
+
+        This only applies to Fields that are loaded with deferred_load and without chunksize.
+
+        Parameters
+        ----------
+        max_size : float
+            Maximum size in MB of the snapshots that are kept in memory. Default is 1024 MB.
+            Use None to disable (and empty) the cache.
+        spill_dir : str
+            Directory in which snapshots are stored when they are evicted from memory, instead of
+            being discarded. Default is None (no snapshots are stored on disk)
+        max_spill_size : float
+            Maximum size in MB of the snapshots that are stored in spill_dir. Default is None (unlimited)
+        """
+        if self._snapshot_cache is not None:
+            self._snapshot_cache.clear()
+        self._snapshot_cache = None if max_size is None else _SnapshotCache(max_size, spill_dir, max_spill_size)
+        for f in self.get_fields():
+            if isinstance(f, NestedField):
+                for fld in f:
+                    fld._snapshot_cache = self._snapshot_cache
+            elif isinstance(f, Field):
+                f._snapshot_cache = self._snapshot_cache
+
+    def set_file_pool(self, max_open=16):
+        """Share the open files of deferred-load Fields, and the time decoded from them, in a pool.
+
+        Without the pool, every Field opens (and decodes the header of) its own file each time that it
+        reads a new time snapshot, and closes it when that snapshot is no longer used. When several
+        Fields, e.g. U, V, W and T, are stored in the same file, that file is then opened once per Field.
+        With the pool, the Fields share one open dataset per file (and netcdf_engine and chunksize).
+        Files that are no longer used by any Field are kept open, and the least recently used of
+        them are closed when more than max_open unused files are open.
+
+        Parameters
+        ----------
+        max_open : int
+            Maximum number of files that are kept open while they are not used. Default is 16.
+            Use None to disable the pool, which closes the files that are not used.
+        """
+        if self._file_pool is not None:
+            self._file_pool.clear()
+        self._file_pool = None if max_open is None else _FilePool(max_open)
+        for f in self.get_fields():
+            if isinstance(f, NestedField):
+                for fld in f:
+                    fld._file_pool = self._file_pool
+            elif isinstance(f, Field):
+                f._file_pool = self._file_pool
+
+    def set_spatial_subsetting(self, halo=5):
+        """Only read the part of deferred-load Fields around the particles from file.
+
+        Instead of the complete (horizontal) Fields, only a window of grid cells around the particles,
+        plus a halo, is read and decoded when new time snapshots are loaded. Before the particles are
+        advanced, the window moves with the particles when they come closer than half the halo to its
+        edge. When particles sample a Field outside the window during the execution of a kernel, the
+        window grows: in Scipy mode immediately, and in JIT mode before these particles are repeated.
+        Field.data keeps the shape of the complete Field, but is zero outside the window.
+
+        This only applies to Fields that are loaded with deferred_load and without chunksize, on grids
+        without a periodic halo; the windows are per grid, and shared by the Fields on that grid.
+
+        Parameters
+        ----------
+        halo : int
+            Number of grid cells around the particles that is read. Default is 5.
+            Use None to read the complete Fields again.
+        """
+        self._subset_halo = halo
+        self._setup_subset_windows()
+
+    def _setup_subset_windows(self):
+        fields = {}
+        for f in self.get_fields():
+            if isinstance(f, Field):
+                fields.setdefault(f.grid, []).append(f)
+        for g, gfields in fields.items():
+            if self._subset_halo is not None and all(f._subset_supported for f in gfields):
+                if g._subset_window is None:
+                    g._subset_window = _SubsetWindow(g, gfields, self._subset_halo)
+                g._subset_window.fields, g._subset_window.halo = gfields, self._subset_halo
+            elif g._subset_window is not None:
+                g._subset_window = None
+                for f in gfields:
+                    f._reload_subset_window()
+
+    def _update_subset_windows(self, pset):
+        """Move the subset windows of the grids to the particles of pset, see :meth:`set_spatial_subsetting`."""
+        if self._subset_halo is None:
+            return
+        self._setup_subset_windows()
+        lon, lat = _particle_positions(pset)
+        for g in self.gridset.grids:
+            if g._subset_window is not None:
+                g._subset_window.update(lon, lat)
+
+    def _reach_subset_windows(self, pset, endtime):
+        """Grow the subset windows to the cells that the particles of pset can reach before endtime in Scipy mode.
+
+        The distance that particles can travel is bounded by the largest velocity magnitude in the windows of
+        U and V, so that the windows grow once for all particles, and not while the Kernel samples the Fields.
+        """
+        if self._subset_halo is None:
+            return
+        windows = [g._subset_window for g in self.gridset.grids if g._subset_window is not None]
+        windows = [w for w in windows if w.bounds is not None]
+        if len(windows) == 0:
+            return
+        lon, lat = _particle_positions(pset)
+        alive = pset.particledata.state != _TOMBSTONE
+        duration = np.nan_to_num(np.abs(endtime - pset.particledata.data["time_nextloop"][alive]))
+
+        speed = 0.0
+        for name in ["U", "V"]:
+            f = getattr(self, name, None)
+            if isinstance(f, Field) and f._subset_bounds() is not None and isinstance(f.data, np.ndarray):
+                y0, y1, x0, x1 = f._subset_bounds()
+                speed = max(speed, float(np.nanmax(np.abs(f.data[..., y0:y1, x0:x1]), initial=0)))
+        dist = speed * duration
+        depth = np.zeros_like(lon)
+        with np.errstate(divide="ignore"):
+            dlon = np.minimum(self.U.units.to_target(dist, depth, np.clip(lat, -89, 89), lon), 180)
+        dlat = np.minimum(self.V.units.to_target(dist, depth, lat, lon), 90)
+        for w in windows:
+            w.reach(lon, lat, dlon, dlat)
+
+    def _grow_subset_windows(self, pset):
+        """Grow the subset windows that particles of pset sampled outside of in JIT mode."""
+        if self._subset_halo is None:
+            return
+        for g in self.gridset.grids:
+            if g._subset_window is not None and g._subset_window.requested():
+                g._subset_window.grow(*_particle_positions(pset))
+
+    def _prefetch_time_snapshots(self, signdt):
+        for f in self.get_fields():
+            if not isinstance(f, Field) or not f.grid.defer_load or f._dataFiles is None:
+                continue
+            if f.chunksize not in [False, None] or f.grid._ti < 0:
+                continue
+            g = f.grid
+            ti = g._ti + 2 if signdt >= 0 else g._ti - 1
+            if f.time_periodic:  # the last snapshot is a copy of the first one
+                if ti >= len(g.time_full):
+                    ti -= len(g.time_full) - 1
+                elif ti < 0:
+                    ti += len(g.time_full) - 1
+            if 0 <= ti < len(g.time_full):
+                f._prefetch_time_snapshot(ti, self._prefetch_executor)
+            else:
+                f._cancel_prefetch()
+
     def computeTimeChunk(self, time=0.0, dt=1):
         """Load a chunk of three data time steps into the FieldSet.
         This is used when FieldSet uses data imported from netcdf,
@@ -1588,6 +1844,8 @@ class FieldSet:
                 if isinstance(f.data, DeferredArray):
                     f.data = DeferredArray()
                 f.data = f._reshape(data)
+                f._time_slots = None
+                f._stale_time_slots[:] = -1
                 if not f._chunk_set:
                     f._chunk_setup()
                 if len(g._load_chunk) > g._chunk_not_loaded:
@@ -1602,9 +1860,12 @@ class FieldSet:
                     zd = g.zdim - 1
                 else:
                     zd = g.zdim
-                data = lib.empty(
-                    (g.tdim, zd, g.ydim - 2 * g.meridional_halo, g.xdim - 2 * g.zonal_halo), dtype=np.float32
-                )
+                # the new snapshot is read straight into the slot of the time that is dropped, if possible
+                data = f._time_slot_target() if lib is np else None
+                if data is None:
+                    data = lib.empty(
+                        (g.tdim, zd, g.ydim - 2 * g.meridional_halo, g.xdim - 2 * g.zonal_halo), dtype=np.float32
+                    )
                 if signdt >= 0:
                     f._loaded_time_indices = [1]
                     if f.filebuffers[0] is not None:
@@ -1619,56 +1880,25 @@ class FieldSet:
                         f.filebuffers[1] = None
                     f.filebuffers[1] = f.filebuffers[0]
                     data = f.computeTimeChunk(data, 0)
-                data = f._rescale_and_set_minmax(data)
-                if signdt >= 0:
-                    data = f._reshape(data)[1, :]
-                    if lib is da:
+                tindex = f._loaded_time_indices[0]
+                if lib is da:
+                    data = f._reshape(f._rescale_and_set_minmax(data))[tindex, :]
+                    if tindex == 1:
                         f.data = lib.stack([f.data[1, :], data], axis=0)
                     else:
-                        if not isinstance(f.data, DeferredArray):
-                            if isinstance(f.data, list):
-                                del f.data[0, :]
-                            else:
-                                f.data[0, :] = None
-                        f.data[0, :] = f.data[1, :]
-                        f.data[1, :] = data
-                else:
-                    data = f._reshape(data)[0, :]
-                    if lib is da:
                         f.data = lib.stack([data, f.data[0, :]], axis=0)
-                    else:
-                        if not isinstance(f.data, DeferredArray):
-                            if isinstance(f.data, list):
-                                del f.data[1, :]
-                            else:
-                                f.data[1, :] = None
-                        f.data[1, :] = f.data[0, :]
-                        f.data[0, :] = data
+                else:
+                    f._rescale_and_set_minmax(data[tindex : tindex + 1])  # the other slot of data is empty
+                    f._store_time_snapshot(f._reshape(data)[tindex, :], tindex)
                 g._load_chunk = np.where(
                     g._load_chunk == g._chunk_loaded_touched, g._chunk_loading_requested, g._load_chunk
                 )
                 g._load_chunk = np.where(g._load_chunk == g._chunk_deprecated, g._chunk_not_loaded, g._load_chunk)
-                if isinstance(f.data, da.core.Array) and len(g._load_chunk) > 0:
-                    if signdt >= 0:
-                        for block_id in range(len(g._load_chunk)):
-                            if g._load_chunk[block_id] == g._chunk_loaded_touched:
-                                if f._data_chunks[block_id] is None:
-                                    # file chunks were never loaded.
-                                    # happens when field not called by kernel, but shares a grid with another field called by kernel
-                                    break
-                                block = f.get_block(block_id)
-                                f._data_chunks[block_id][0] = None
-                                f._data_chunks[block_id][1] = np.array(f.data.blocks[(slice(2),) + block][1])
-                    else:
-                        for block_id in range(len(g._load_chunk)):
-                            if g._load_chunk[block_id] == g._chunk_loaded_touched:
-                                if f._data_chunks[block_id] is None:
-                                    # file chunks were never loaded.
-                                    # happens when field not called by kernel, but shares a grid with another field called by kernel
-                                    break
-                                block = f.get_block(block_id)
-                                f._data_chunks[block_id][1] = None
-                                f._data_chunks[block_id][0] = np.array(f.data.blocks[(slice(2),) + block][0])
+                if isinstance(f.data, da.core.Array) and f._chunk_set:
+                    f._advance_chunk_time_slots(tindex)
+        if self._prefetch_executor is not None and signdt != 0:
+            self._prefetch_time_snapshots(signdt)
+
         # do user-defined computations on fieldset data
         if self.compute_on_defer:
             self.compute_on_defer(self)
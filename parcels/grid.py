@@ -1,10 +1,12 @@
 import functools
+import hashlib
 import warnings
 from ctypes import POINTER, Structure, c_double, c_float, c_int, c_void_p, cast, pointer
 from enum import IntEnum
 
 import numpy as np
 import numpy.typing as npt
+from scipy.spatial import KDTree
 
 from parcels._typing import Mesh, UpdateStatus, assert_valid_mesh
 from parcels.tools._helpers import deprecated_made_private
@@ -89,10 +91,13 @@ class Grid:
         )
         self.periods = 0
         self._load_chunk: npt.NDArray = np.array([])
+        self._chunk_last_used: npt.NDArray = np.array([], dtype=np.int64)  # see parcels.tools.chunkmemory
         self.chunk_info = None
         self.chunksize = None
         self._add_last_periodic_data_timestep = False
         self.depth_field = None
+        self._search_index: _CurvilinearSearchIndex | None = None
+        self._subset_window = None  # see FieldSet.set_spatial_subsetting
 
     def __repr__(self):
         with np.printoptions(threshold=5, suppress=True, linewidth=120, formatter={"float": "{: 0.2f}".format}):
@@ -258,6 +263,9 @@ class Grid:
                 ("lat", POINTER(c_float)),
                 ("depth", POINTER(c_float)),
                 ("time", POINTER(c_double)),
+                ("search_index_xdim", c_int),
+                ("search_index_ydim", c_int),
+                ("search_index", POINTER(c_int)),
             ]
 
         # Create and populate the c-struct object
@@ -265,6 +273,15 @@ class Grid:
             if not isinstance(self.periods, c_int):
                 self.periods = c_int()
                 self.periods.value = 0
+            if isinstance(self, CurvilinearGrid):
+                search_index = self.search_index
+                search_index_args = (
+                    search_index.cells.shape[1],
+                    search_index.cells.shape[0],
+                    search_index.cells.ctypes.data_as(POINTER(c_int)),
+                )
+            else:
+                search_index_args = (0, 0, None)
             self._cstruct = CStructuredGrid(
                 self.xdim,
                 self.ydim,
@@ -283,6 +300,7 @@ class Grid:
                 self.lat.ctypes.data_as(POINTER(c_float)),
                 self.depth.ctypes.data_as(POINTER(c_float)),
                 self.time.ctypes.data_as(POINTER(c_double)),
+                *search_index_args,
             )
         return self._cstruct
 
@@ -681,6 +699,41 @@ class CurvilinearGrid(Grid):
     def ydim(self):
         return self.lon.shape[0]
 
+    @property
+    def search_index(self):
+        """Lookup table that gives, for any position, a cell of the grid close to it.
+
+        The index search on curvilinear grids walks from cell to cell until it finds the cell that
+        contains the particle. The walk starts from this table for new particles (with xi = yi = -1),
+        and jumps to it when the walk takes more than a few steps, e.g. after a particle crossed the
+        tripolar fold. The table is built on first use, which can take a few seconds on large grids;
+        see :meth:`save_search_index` and :meth:`load_search_index` to reuse it between runs.
+        """
+        if self._search_index is None:
+            self._search_index = _CurvilinearSearchIndex.build(self)
+        return self._search_index
+
+    def save_search_index(self, path):
+        """Save the search index of the grid (building it if needed) to an .npz file.
+
+        Parameters
+        ----------
+        path : str or pathlib.Path
+            Name of the file to write
+        """
+        self.search_index.save(path)
+
+    def load_search_index(self, path):
+        """Load a search index that was saved with :meth:`save_search_index`.
+
+        Parameters
+        ----------
+        path : str or pathlib.Path
+            Name of the file to read. A ValueError is raised if it was built for a different grid.
+        """
+        self._search_index = _CurvilinearSearchIndex.load(path, self)
+        self._cstruct = None
+
     def add_periodic_halo(self, zonal, meridional, halosize=5):
         """Add a 'halo' to the Grid, through extending the Grid (and lon/lat)
         similarly to the halo created for the Fields
@@ -823,6 +876,102 @@ class CurvilinearSGrid(CurvilinearGrid):
         return self.depth.shape[-3]
 
 
+class _CurvilinearSearchIndex:
+    """Regular lon/lat table of buckets, that each store the (flat) index of the grid cell nearest to their centre.
+
+    See :attr:`CurvilinearGrid.search_index`. The same lookup is implemented in C (search_index_guess
+    in index_search.h), so that JIT and Scipy particles start their walk from the same cell.
+    """
+
+    max_buckets = 1024  # maximum number of buckets in each direction
+
+    def __init__(self, cells, lonlat_minmax, spherical, xdim, key):
+        self.cells = np.ascontiguousarray(cells, dtype=np.int32)
+        self.lonlat_minmax = np.asarray(lonlat_minmax, dtype=np.float32)
+        self.spherical = bool(spherical)
+        self.xdim = int(xdim)
+        self.key = str(key)
+
+    @staticmethod
+    def grid_key(grid):
+        """Hash of the coordinates of the grid, to check that a saved index belongs to it."""
+        h = hashlib.sha256()
+        for part in [grid.lon, grid.lat]:
+            h.update(np.ascontiguousarray(part).tobytes())
+        h.update(grid.mesh.encode("utf-8"))
+        return h.hexdigest()
+
+    @staticmethod
+    def _points(lon, lat, spherical):
+        if not spherical:
+            return np.stack((lon, lat), axis=-1)
+        lon, lat = np.radians(lon), np.radians(lat)
+        return np.stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)), axis=-1)
+
+    @classmethod
+    def build(cls, grid):
+        spherical = grid.mesh == "spherical"
+        lon = grid.lon.astype(np.float64)
+        lat = grid.lat.astype(np.float64)
+        corners_lon = [lon[:-1, :-1], lon[:-1, 1:], lon[1:, 1:], lon[1:, :-1]]
+        if spherical:
+            corners_lon[1:] = [np.where(c - corners_lon[0] > 180, c - 360, c) for c in corners_lon[1:]]
+            corners_lon[1:] = [np.where(corners_lon[0] - c > 180, c + 360, c) for c in corners_lon[1:]]
+        centre_lon = sum(corners_lon) / 4
+        centre_lat = (lat[:-1, :-1] + lat[:-1, 1:] + lat[1:, 1:] + lat[1:, :-1]) / 4
+
+        valid = np.flatnonzero(np.isfinite(centre_lon) & np.isfinite(centre_lat))
+        if len(valid) == 0:
+            raise ValueError("Can not build a search index for a grid without valid cells")
+        tree = KDTree(cls._points(centre_lon.flat[valid], centre_lat.flat[valid], spherical))
+
+        lonmin, lonmax, latmin, latmax = grid.lonlat_minmax.astype(np.float64)
+        nlon = int(np.clip(grid.xdim - 1, 1, cls.max_buckets))
+        nlat = int(np.clip(grid.ydim - 1, 1, cls.max_buckets))
+        bucket_lon = lonmin + (np.arange(nlon) + 0.5) * (lonmax - lonmin) / nlon
+        bucket_lat = latmin + (np.arange(nlat) + 0.5) * (latmax - latmin) / nlat
+        bucket_lon, bucket_lat = np.meshgrid(bucket_lon, bucket_lat)
+        _, nearest = tree.query(cls._points(bucket_lon, bucket_lat, spherical))
+
+        # Indices in the grid of the cells; the flat indices of centre_lon have stride xdim-1
+        yi, xi = np.divmod(valid[nearest], grid.xdim - 1)
+        return cls(yi * grid.xdim + xi, grid.lonlat_minmax, spherical, grid.xdim, cls.grid_key(grid))
+
+    def save(self, path):
+        np.savez(
+            path,
+            cells=self.cells,
+            lonlat_minmax=self.lonlat_minmax,
+            spherical=self.spherical,
+            xdim=self.xdim,
+            key=self.key,
+        )
+
+    @classmethod
+    def load(cls, path, grid):
+        with np.load(path) as f:
+            index = cls(f["cells"], f["lonlat_minmax"], f["spherical"], f["xdim"], f["key"])
+        if index.key != cls.grid_key(grid):
+            raise ValueError(f"The search index in {path} was built for a different grid")
+        return index
+
+    def guess(self, x, y):
+        """Indices (yi, xi) of a cell close to each of the positions (y, x)."""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        lonmin, lonmax, latmin, latmax = self.lonlat_minmax.astype(np.float64)
+        nlat, nlon = self.cells.shape
+        if self.spherical:
+            x = lonmin + np.fmod(x - lonmin, 360)
+            x = np.where(x < lonmin, x + 360, x)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fx = np.nan_to_num((x - lonmin) / (lonmax - lonmin) * nlon)
+            fy = np.nan_to_num((y - latmin) / (latmax - latmin) * nlat)
+        ix = np.clip(np.floor(np.clip(fx, -1, nlon)), 0, nlon - 1).astype(np.intp)
+        iy = np.clip(np.floor(np.clip(fy, -1, nlat)), 0, nlat - 1).astype(np.intp)
+        return np.divmod(self.cells[iy, ix], self.xdim)
+
+
 def _calc_cell_edge_sizes(grid: RectilinearGrid) -> None:
     """Method to calculate cell sizes based on numpy.gradient method.
 
@@ -46,6 +46,8 @@ typedef struct
   float *lonlat_minmax;
   float *lon, *lat, *depth;
   double *time;
+  int search_index_xdim, search_index_ydim;
+  int *search_index;
 } CStructuredGrid;
 
 
@@ -97,6 +99,46 @@ static inline bool is_zero_flt(float a) {
     return (fabs(a) <= FLT_EPSILON * fabs(a));
 }
 
+/* Index of the cell of the monotonic axis vals (of length n) that contains v, starting from the guess i.
+ * The guess is kept if v lies in that cell or in one of its neighbours, which is the common case for a
+ * particle that moved little since its previous search; the callers then walk the last step (if any).
+ * Otherwise, the index is computed directly, which is exact for uniform axes, and found by bisection
+ * if that fails (non-uniform axes), instead of walking there one cell at a time. On a cell edge, the
+ * result is the cell that the walk would have ended in: the lower cell when searching upwards along
+ * the axis, and the upper cell when searching downwards. */
+static inline int search_axis_index(float *vals, int n, double v, int i)
+{
+  if (n < 2) return 0;
+  if (isnan(v)) return i;
+  if (i < 0) i = 0;
+  if (i > n-2) i = n-2;
+  double s = (vals[n-1] >= vals[0]) ? 1 : -1;
+  double sv = s * v;
+  int lo = (i > 0) ? i-1 : 0;
+  int hi = (i < n-2) ? i+2 : n-1;
+  if ((sv >= s * vals[lo]) && (sv <= s * vals[hi])) return i;
+  int upwards = sv > s * vals[hi];
+  if (sv <= s * vals[0]) return 0;
+  if (sv >= s * vals[n-1]) return n-2;
+
+  i = (int) ((v - vals[0]) / ((vals[n-1] - vals[0]) / (n-1)));
+  if (i < 0) i = 0;
+  if (i > n-2) i = n-2;
+  if (upwards && (sv > s * vals[i]) && (sv <= s * vals[i+1])) return i;
+  if (!upwards && (sv >= s * vals[i]) && (sv < s * vals[i+1])) return i;
+
+  lo = 0;
+  hi = n-1;
+  while (hi - lo > 1){
+    int mid = (lo + hi) / 2;
+    if ((s * vals[mid] < sv) || (!upwards && s * vals[mid] == sv))
+      lo = mid;
+    else
+      hi = mid;
+  }
+  return lo;
+}
+
 static inline StatusCode search_indices_vertical_z(type_coord z, int zdim, float *zvals, int *zi, double *zeta, int gridindexingtype)
 {
   if (zvals[zdim-1] > zvals[0]){
@@ -112,12 +154,14 @@ static inline StatusCode search_indices_vertical_z(type_coord z, int zdim, float
     }
     if (z < zvals[0]) {return ERRORTHROUGHSURFACE;}
     if (z > zvals[zdim-1]) {return ERROROUTOFBOUNDS;}
+    *zi = search_axis_index(zvals, zdim, z, *zi);
     while (*zi < zdim-1 && z > zvals[*zi+1]) ++(*zi);
     while (*zi > 0 && z < zvals[*zi]) --(*zi);
   }
   else{
     if (z > zvals[0]) {return ERRORTHROUGHSURFACE;}
     if (z < zvals[zdim-1]) {return ERROROUTOFBOUNDS;}
+    *zi = search_axis_index(zvals, zdim, z, *zi);
     while (*zi < zdim-1 && z < zvals[*zi+1]) ++(*zi);
     while (*zi > 0 && z > zvals[*zi]) --(*zi);
   }
@@ -170,12 +214,14 @@ static inline StatusCode search_indices_vertical_s(double time, type_coord z,
   if (zcol[zdim-1] > zcol[0]){
     if (z < zcol[0]) {return ERRORTHROUGHSURFACE;}
     if (z > zcol[zdim-1]) {return ERROROUTOFBOUNDS;}
+    *zi = search_axis_index(zcol, zdim, z, *zi);
     while (*zi < zdim-1 && z > zcol[*zi+1]) ++(*zi);
     while (*zi > 0 && z < zcol[*zi]) --(*zi);
   }
   else{
     if (z > zcol[0]) {return ERRORTHROUGHSURFACE;}
     if (z < zcol[zdim-1]) {return ERROROUTOFBOUNDS;}
+    *zi = search_axis_index(zcol, zdim, z, *zi);
     while (*zi < zdim-1 && z < zcol[*zi+1]) ++(*zi);
     while (*zi > 0 && z > zcol[*zi]) --(*zi);
   }
@@ -237,16 +283,27 @@ static inline StatusCode search_indices_rectilinear(double time, type_coord z, t
   if ((ydim > 1) && ((y < xy_minmax[2]) || (y > xy_minmax[3])))
     return ERROROUTOFBOUNDS;
 
+  // New particles (with xi = yi = -1) start from the first cell
+  if (*xi < 0) *xi = 0;
+  if (*yi < 0) *yi = 0;
+
   if (xdim == 1){
     *xi = 0;
     *xsi = 0;
   }
   else if (sphere_mesh == 0){
+    *xi = search_axis_index(xvals, xdim, x, *xi);
     while (*xi < xdim-1 && x > xvals[*xi+1]) ++(*xi);
     while (*xi > 0 && x < xvals[*xi]) --(*xi);
     *xsi = (x - xvals[*xi]) / (xvals[*xi+1] - xvals[*xi]);
   }
   else{
+    if (xvals[xdim-1] > xvals[0]){
+      // Start the walk below from the cell of x (shifted into the range of the axis), if the axis does not wrap
+      double xs = xvals[0] + fmod(fmod(x - xvals[0], 360) + 360, 360);
+      if (xs <= xvals[xdim-1])
+        *xi = search_axis_index(xvals, xdim, xs, *xi);
+    }
 
     float xvalsi = xvals[*xi];
     // TODO: this will fail if longitude is e.g. only [-180, 180] (so length 2)
@@ -284,6 +341,7 @@ static inline StatusCode search_indices_rectilinear(double time, type_coord z, t
     *eta = 0;
   }
   else {
+    *yi = search_axis_index(yvals, ydim, y, *yi);
     while (*yi < ydim-1 && y > yvals[*yi+1]) ++(*yi);
     while (*yi > 0 && y < yvals[*yi]) --(*yi);
     *eta = (y - yvals[*yi]) / (yvals[*yi+1] - yvals[*yi]);
@@ -323,6 +381,32 @@ static inline StatusCode search_indices_rectilinear(double time, type_coord z, t
 }
 
 
+/* Number of steps after which the walk through a curvilinear grid jumps to the cell given by its search index */
+#define SEARCH_INDEX_MAX_WALK 10
+
+/* Cell of a curvilinear grid close to (x, y), from the search index of the grid
+ * (the C version of parcels.grid._CurvilinearSearchIndex.guess) */
+static inline void search_index_guess(CStructuredGrid *grid, double x, double y, int *yi, int *xi)
+{
+  int nx = grid->search_index_xdim;
+  int ny = grid->search_index_ydim;
+  double lonmin = grid->lonlat_minmax[0];
+  double lonmax = grid->lonlat_minmax[1];
+  double latmin = grid->lonlat_minmax[2];
+  double latmax = grid->lonlat_minmax[3];
+  if (grid->sphere_mesh){
+    x = lonmin + fmod(x - lonmin, 360);
+    if (x < lonmin) x += 360;
+  }
+  double fx = (x - lonmin) / (lonmax - lonmin) * nx;
+  double fy = (y - latmin) / (latmax - latmin) * ny;
+  int ix = (fx != fx || fx < 0) ? 0 : (fx >= nx) ? nx-1 : (int) floor(fx);
+  int iy = (fy != fy || fy < 0) ? 0 : (fy >= ny) ? ny-1 : (int) floor(fy);
+  int cell = grid->search_index[iy*nx + ix];
+  *yi = cell / grid->xdim;
+  *xi = cell % grid->xdim;
+}
+
 static inline StatusCode search_indices_curvilinear(double time, type_coord z, type_coord y, type_coord x,
                                                     CStructuredGrid *grid, GridType gtype,
                                                     int ti, int *zi, int *yi, int *xi,
@@ -359,10 +443,27 @@ static inline StatusCode search_indices_curvilinear(double time, type_coord z, t
 
   double a[4], b[4];
 
+  // New particles (with xi = yi = -1, i.e. not searched before) start their walk from the search index of the grid
+  int guessed = (grid->search_index == NULL);
+  if ((*xi < 0) || (*yi < 0)){
+    if (guessed){
+      *xi = 0;
+      *yi = 0;
+    }
+    else{
+      search_index_guess(grid, x, y, yi, xi);
+      guessed = 1;
+    }
+  }
+
   *xsi = *eta = -1;
   int maxIterSearch = 1e6, it = 0;
   double tol = 1e-10;
   while ( (*xsi < -tol) || (*xsi > 1+tol) || (*eta < -tol) || (*eta > 1+tol) ){
+    if ((it == SEARCH_INDEX_MAX_WALK) && !guessed){
+      search_index_guess(grid, x, y, yi, xi);
+      guessed = 1;
+    }
     double xgrid_loc[4] = {xgrid[*yi][*xi], xgrid[*yi][*xi+1], xgrid[*yi+1][*xi+1], xgrid[*yi+1][*xi]};
     if (sphere_mesh){ //we are on the sphere
       int i4;
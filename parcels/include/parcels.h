@@ -20,6 +20,7 @@ typedef struct
 {
   int xdim, ydim, zdim, tdim, igrid, allow_time_extrapolation, time_periodic;
   float ****data_chunks;
+  int *time_slots;  // slot in the data chunks of each time index, as the time slots are used as a ring buffer
   CGrid *grid;
 } CField;
 
@@ -244,35 +245,60 @@ static inline StatusCode spatial_interpolation_nearest3D(double zeta, double eta
   return SUCCESS;
 }
 
-static inline int getBlock2D(int *chunk_info, int yi, int xi, int *block, int *index_local)
+static inline int touch_chunk(int *load_chunk, int blockid)
+/* Returns 1 if the chunk is loaded (and marks it as touched), or flags it for loading and returns 0.   */
+/* Accesses are atomic so that threaded particle loops can request and touch chunks concurrently; all  */
+/* threads only ever write the same value (1 or 2) to a given flag within one particle_loop call.      */
 {
-  int ndim = chunk_info[0];
-  if (ndim != 2)
-    exit(-1);
-  int i, j;
-
-  int shape[ndim];
-  int index[2] = {yi, xi};
-  for(i=0; i<ndim; ++i){
-    int chunk_sum = 0, shift = 0;
-    for (j = 0; j < i; j++) shift += chunk_info[1+j];
-    shape[i] = chunk_info[1+i];
-    for (j=0; j<shape[i]; j++) {
-      chunk_sum += chunk_info[1+ndim+shift+j];
-      if (index[i] < chunk_sum) {
-        chunk_sum -= chunk_info[1+ndim+shift+j];
-        break;
-      }
-    }
-    block[i] = j;
-    index_local[i] = index[i] - chunk_sum;
+  int status;
+#ifdef _OPENMP
+  #pragma omp atomic read
+#endif
+  status = load_chunk[blockid];
+  if (status < 2){
+#ifdef _OPENMP
+    #pragma omp atomic write
+#endif
+    load_chunk[blockid] = 1;
+    return 0;
   }
+#ifdef _OPENMP
+  #pragma omp atomic write
+#endif
+  load_chunk[blockid] = 2;
+  return 1;
+}
 
-  int bid =  block[0]*shape[1] +
-             block[1];
+/* Block id of the chunk that contains the field index (zi, yi, xi), from the per-dimension lookup tables
+ * at the end of chunk_info (see Field._chunk_setup), which give the chunk along that dimension and the
+ * index in that chunk for every index along the dimension */
+static inline int getBlock(int *chunk_info, int ndim, int *index, int *block, int *index_local)
+{
+  int i;
+  int tables = 1 + ndim;
+  for (i=0; i<ndim; ++i) tables += chunk_info[1+i];
+
+  int bid = 0;
+  for (i=0; i<ndim; ++i){
+    int *table = chunk_info + chunk_info[tables+i];
+    int j = index[i];
+    if (j < 0) j = 0;
+    if (j > table[0]-1) j = table[0]-1;
+    block[i] = table[1+2*j];
+    index_local[i] = table[2+2*j];
+    bid = bid*chunk_info[1+i] + block[i];
+  }
   return bid;
 }
 
+static inline int getBlock2D(int *chunk_info, int yi, int xi, int *block, int *index_local)
+{
+  if (chunk_info[0] != 2)
+    exit(-1);
+  int index[2] = {yi, xi};
+  return getBlock(chunk_info, 2, index, block, index_local);
+}
+
 static inline StatusCode getCell2D(CField *f, int ti, int yi, int xi, float cell_data[2][2][2], int first_tstep_only)
 {
   CStructuredGrid *grid = f->grid->grid;
@@ -284,11 +310,8 @@ static inline StatusCode getCell2D(CField *f, int ti, int yi, int xi, float cell
   int tii, yii, xii;
 
   int blockid = getBlock2D(chunk_info, yi, xi, block, ilocal);
-  if (grid->load_chunk[blockid] < 2){
-    grid->load_chunk[blockid] = 1;
+  if (!touch_chunk(grid->load_chunk, blockid))
     return REPEAT;
-  }
-  grid->load_chunk[blockid] = 2;
   int zdim = 1;
   int ydim = chunk_info[1+ndim+block[0]];
   int yshift = chunk_info[1];
@@ -301,17 +324,14 @@ static inline StatusCode getCell2D(CField *f, int ti, int yi, int xi, float cell
       for (yii=0; yii<2; ++yii){
         for (xii=0; xii<2; ++xii){
           blockid = getBlock2D(chunk_info, yi+yii, xi+xii, block, ilocal);
-          if (grid->load_chunk[blockid] < 2){
-            grid->load_chunk[blockid] = 1;
+          if (!touch_chunk(grid->load_chunk, blockid))
             return REPEAT;
-          }
-          grid->load_chunk[blockid] = 2;
           zdim = 1;
           ydim = chunk_info[1+ndim+block[0]];
           yshift = chunk_info[1];
           xdim = chunk_info[1+ndim+yshift+block[1]];
           float (*data_block)[zdim][ydim][xdim] = (float (*)[zdim][ydim][xdim]) f->data_chunks[blockid];
-          float (*data)[xdim] = (float (*)[xdim]) (data_block[ti+tii]);
+          float (*data)[xdim] = (float (*)[xdim]) (data_block[f->time_slots[ti+tii]]);
           cell_data[tii][yii][xii] = data[ilocal[0]][ilocal[1]];
         }
       }
@@ -323,7 +343,7 @@ static inline StatusCode getCell2D(CField *f, int ti, int yi, int xi, float cell
   {
     float (*data_block)[zdim][ydim][xdim] = (float (*)[zdim][ydim][xdim]) f->data_chunks[blockid];
     for (tii=0; tii<2; ++tii){
-      float (*data)[xdim] = (float (*)[xdim]) (data_block[ti+tii]);
+      float (*data)[xdim] = (float (*)[xdim]) (data_block[f->time_slots[ti+tii]]);
       int xiid = ((xdim==1) ? 0 : 1);
       int yiid = ((ydim==1) ? 0 : 1);
       for (yii=0; yii<2; yii++)
@@ -338,32 +358,10 @@ static inline StatusCode getCell2D(CField *f, int ti, int yi, int xi, float cell
 
 static inline int getBlock3D(int *chunk_info, int zi, int yi, int xi, int *block, int *index_local)
 {
-  int ndim = chunk_info[0];
-  if (ndim != 3)
+  if (chunk_info[0] != 3)
     exit(-1);
-  int i, j;
-
-  int shape[ndim];
   int index[3] = {zi, yi, xi};
-  for(i=0; i<ndim; ++i){
-    int chunk_sum = 0, shift = 0;
-    for (j = 0; j < i; j++) shift += chunk_info[1+j];
-    shape[i] = chunk_info[1+i];
-    for (j=0; j<shape[i]; j++) {
-      chunk_sum += chunk_info[1+ndim+shift+j];
-      if (index[i] < chunk_sum) {
-        chunk_sum -= chunk_info[1+ndim+shift+j];
-        break;
-      }
-    }
-    block[i] = j;
-    index_local[i] = index[i] - chunk_sum;
-  }
-
-  int bid =  block[0]*shape[1]*shape[2] +
-             block[1]*shape[2] +
-             block[2];
-  return bid;
+  return getBlock(chunk_info, 3, index, block, index_local);
 }
 
 static inline StatusCode getCell3D(CField *f, int ti, int zi, int yi, int xi, float cell_data[2][2][2][2], int first_tstep_only)
@@ -377,11 +375,8 @@ static inline StatusCode getCell3D(CField *f, int ti, int zi, int yi, int xi, fl
   int tii, zii, yii, xii;
 
   int blockid = getBlock3D(chunk_info, zi, yi, xi, block, ilocal);
-  if (grid->load_chunk[blockid] < 2){
-    grid->load_chunk[blockid] = 1;
+  if (!touch_chunk(grid->load_chunk, blockid))
     return REPEAT;
-  }
-  grid->load_chunk[blockid] = 2;
   int zdim = chunk_info[1+ndim+block[0]];
   int zshift = chunk_info[1];
   int ydim = chunk_info[1+ndim+zshift+block[1]];
@@ -396,18 +391,15 @@ static inline StatusCode getCell3D(CField *f, int ti, int zi, int yi, int xi, fl
         for (yii=0; yii<2; ++yii){
           for (xii=0; xii<2; ++xii){
             blockid = getBlock3D(chunk_info, zi+zii, yi+yii, xi+xii, block, ilocal);
-            if (grid->load_chunk[blockid] < 2){
-              grid->load_chunk[blockid] = 1;
+            if (!touch_chunk(grid->load_chunk, blockid))
               return REPEAT;
-            }
-            grid->load_chunk[blockid] = 2;
             zdim = chunk_info[1+ndim+block[0]];
             zshift = chunk_info[1];
             ydim = chunk_info[1+ndim+zshift+block[1]];
             yshift = chunk_info[1+1];
             xdim = chunk_info[1+ndim+zshift+yshift+block[2]];
             float (*data_block)[zdim][ydim][xdim] = (float (*)[zdim][ydim][xdim]) f->data_chunks[blockid];
-            float (*data)[ydim][xdim] = (float (*)[ydim][xdim]) (data_block[ti+tii]);
+            float (*data)[ydim][xdim] = (float (*)[ydim][xdim]) (data_block[f->time_slots[ti+tii]]);
             cell_data[tii][zii][yii][xii] = data[ilocal[0]][ilocal[1]][ilocal[2]];
           }
         }
@@ -420,7 +412,7 @@ static inline StatusCode getCell3D(CField *f, int ti, int zi, int yi, int xi, fl
   {
     float (*data_block)[zdim][ydim][xdim] = (float (*)[zdim][ydim][xdim]) f->data_chunks[blockid];
     for (tii=0; tii<2; ++tii){
-      float (*data)[ydim][xdim] = (float (*)[ydim][xdim]) (data_block[ti+tii]);
+      float (*data)[ydim][xdim] = (float (*)[ydim][xdim]) (data_block[f->time_slots[ti+tii]]);
       int xiid = ((xdim==1) ? 0 : 1);
       int yiid = ((ydim==1) ? 0 : 1);
       int ziid = ((zdim==1) ? 0 : 1);
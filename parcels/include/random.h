@@ -11,24 +11,65 @@ extern "C" {
 /*   Random number generation (RNG) functions     */
 /**************************************************/
 
+#ifdef _OPENMP
+/* In threaded particle loops the libc rand() state is shared between threads, */
+/* so each thread draws from its own xorshift32 state instead. This state is   */
+/* (re)seeded for every particle from its id, so draws are independent of the  */
+/* number of threads and of the order in which particles are scheduled.        */
+static unsigned int parcels_rng_state = 1;
+#pragma omp threadprivate(parcels_rng_state)
+
+static inline unsigned int parcels_rng_mix(unsigned long long z)
+/* splitmix64 finaliser; the result is forced odd so the xorshift state is never zero */
+{
+  z += 0x9E3779B97F4A7C15ULL;
+  z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9ULL;
+  z = (z ^ (z >> 27)) * 0x94D049BB133111EBULL;
+  z ^= z >> 31;
+  return (unsigned int)(z >> 32) | 1u;
+}
+
+static inline void parcels_seed_particle(unsigned int base, long long id)
+{
+  parcels_rng_state = parcels_rng_mix(((unsigned long long)base << 32) ^ (unsigned long long)id);
+}
+#endif
+
+static inline int parcels_rand()
+{
+#ifdef _OPENMP
+  unsigned int x = parcels_rng_state;
+  x ^= x << 13;
+  x ^= x >> 17;
+  x ^= x << 5;
+  parcels_rng_state = x;
+  return (int)(x % ((unsigned int)RAND_MAX + 1u));
+#else
+  return rand();
+#endif
+}
+
 static inline void parcels_seed(int seed)
 {
   srand(seed);
+#ifdef _OPENMP
+  parcels_rng_state = parcels_rng_mix((unsigned long long)seed);
+#endif
 }
 
 static inline float parcels_random()
 {
-  return (float)rand()/(float)(RAND_MAX);
+  return (float)parcels_rand()/(float)(RAND_MAX);
 }
 
 static inline float parcels_uniform(float low, float high)
 {
-  return (float)rand()/(float)((float)(RAND_MAX) / (high-low)) + low;
+  return (float)parcels_rand()/(float)((float)(RAND_MAX) / (high-low)) + low;
 }
 
 static inline int parcels_randint(int low, int high)
 {
-  return (rand() % (high-low)) + low;
+  return (parcels_rand() % (high-low)) + low;
 }
 
 static inline float parcels_normalvariate(float loc, float scale)
@@ -40,8 +81,8 @@ static inline float parcels_normalvariate(float loc, float scale)
   float x1, x2, w, y1;
 
   do {
-    x1 = 2.0 * (float)rand()/(float)(RAND_MAX) - 1.0;
-    x2 = 2.0 * (float)rand()/(float)(RAND_MAX) - 1.0;
+    x1 = 2.0 * (float)parcels_rand()/(float)(RAND_MAX) - 1.0;
+    x2 = 2.0 * (float)parcels_rand()/(float)(RAND_MAX) - 1.0;
     w = x1 * x1 + x2 * x2;
   } while ( w >= 1.0 );
 
@@ -54,7 +95,7 @@ static inline float parcels_expovariate(float lamb)
 //Function to create an exponentially distributed random variable
 {
   float u;
-  u = (float)rand()/((float)(RAND_MAX) + 1.0);
+  u = (float)parcels_rand()/((float)(RAND_MAX) + 1.0);
   return (-log(1.0-u)/lamb);
 }
 
@@ -71,7 +112,7 @@ static inline float parcels_vonmisesvariate(float mu, float kappa)
   float u1, u2, u3, r, s, z, d, f, q, theta;
 
   if (kappa <= 1e-6){
-    return (2.0 * M_PI * (float)rand()/(float)(RAND_MAX));
+    return (2.0 * M_PI * (float)parcels_rand()/(float)(RAND_MAX));
   }
 
   s = 0.5 / kappa;
@@ -81,16 +122,16 @@ static inline float parcels_vonmisesvariate(float mu, float kappa)
   r = s + sqrt(1.0 + s * s);
 
   do {
-    u1 = (float)rand()/(float)(RAND_MAX);
+    u1 = (float)parcels_rand()/(float)(RAND_MAX);
     z = cos(M_PI * u1);
 
     d = z / (r + z);
-    u2 = (float)rand()/(float)(RAND_MAX);
+    u2 = (float)parcels_rand()/(float)(RAND_MAX);
   }  while ( ( u2 >= (1.0 - d * d) ) && ( u2 > (1.0 - d) * exp(d) ) );
 
   q = 1.0 / r;
   f = (q + z) / (1.0 + q * z);
-  u3 = (float)rand()/(float)(RAND_MAX);
+  u3 = (float)parcels_rand()/(float)(RAND_MAX);
 
   if (u3 > 0.5){
     theta = fmod(mu + acos(f), 2.0*M_PI);
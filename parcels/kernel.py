@@ -13,15 +13,15 @@ import textwrap
 import types
 import warnings
 from copy import deepcopy
-from ctypes import byref, c_double, c_int
+from ctypes import CDLL, POINTER, byref, c_double, c_int
 from time import time as ostime
 
 import numpy as np
-import numpy.ctypeslib as npct
 
 import parcels.rng as ParcelsRandom  # noqa: F401
 from parcels import rng  # noqa: F401
 from parcels._compat import MPI
+from parcels._vectorize import _is_vectorizable, vectorize_kernel
 from parcels.application_kernels.advection import (
     AdvectionAnalytical,
     AdvectionRK4_3D,
@@ -29,9 +29,17 @@ from parcels.application_kernels.advection import (
     AdvectionRK45,
 )
 from parcels.compilation.codegenerator import KernelGenerator, LoopGenerator
+from parcels.compilation.kernelcache import compile_cached, kernel_cache_key
 from parcels.field import Field, NestedField, VectorField
 from parcels.grid import GridType
-from parcels.tools.global_statics import get_cache_dir
+from parcels.particledata import (
+    _TOMBSTONE,
+    ParticleDataAccessor,
+    ParticleDataArrayAccessor,
+    ParticleDataIterator,
+)
+from parcels.tools.chunkmemory import _chunk_memory
+from parcels.tools.global_statics import get_cache_dir, get_kernel_cache_dir
 from parcels.tools.loggers import logger
 from parcels.tools.statuscodes import (
     StatusCode,
@@ -44,6 +52,16 @@ from parcels.tools.warnings import KernelWarning
 
 __all__ = ["BaseKernel", "Kernel"]
 
+# Status codes that stop the execution of a Kernel, or are raised as an error
+_INTERRUPTING_STATUSCODES = [
+    StatusCode.StopExecution,
+    StatusCode.StopAllExecution,
+    StatusCode.ErrorTimeExtrapolation,
+    StatusCode.ErrorOutOfBounds,
+    StatusCode.ErrorThroughSurface,
+    StatusCode.Error,
+]
+
 
 class BaseKernel(abc.ABC):
     """Superclass for 'normal' and Interactive Kernels"""
@@ -79,6 +97,10 @@ class BaseKernel(abc.ABC):
         self.src_file: str | None = None
         self.lib_file: str | None = None
         self.log_file: str | None = None
+        self.nthreads: int | None = None
+        self.vectorized = False
+        self._vectorized_pyfunc = None
+        self._vectorized_rng = None
         self.scipy_positionupdate_kernels_added = False
 
         # Generate the kernel function and add the outer loop
@@ -315,7 +337,14 @@ class Kernel(BaseKernel):
             particle.depth_nextloop = particle.depth + particle_ddepth  # type: ignore[name-defined] # noqa
             particle.time_nextloop = particle.time + particle.dt
 
-        self._pyfunc = (Setcoords + self + Updatecoords)._pyfunc
+        merged = Setcoords + self + Updatecoords
+        self._pyfunc = merged._pyfunc
+        self._vectorized_pyfunc, self._vectorized_rng = vectorize_kernel(merged.py_ast, self._pyfunc.__globals__)
+
+    @property
+    def vectorizable(self):
+        """Whether the Kernel can be executed on arrays of particles at once (see execute_vectorized)."""
+        return self.py_ast is not None and _is_vectorizable(self.py_ast)
 
     def check_fieldsets_in_kernels(self, pyfunc):
         """
@@ -388,17 +417,18 @@ class Kernel(BaseKernel):
 
     def remove_lib(self):
         if self._lib is not None:
-            self.cleanup_unload_lib(self._lib)
+            # Libraries compiled with OpenMP are kept in memory, as unloading them
+            # (and with them the OpenMP runtime) while its thread pool is alive crashes
+            if self.nthreads is None:
+                self.cleanup_unload_lib(self._lib)
             del self._lib
             self._lib = None
 
-        all_files: list[str] = []
-        if self.src_file is not None:
-            all_files.append(self.src_file)
-        if self.log_file is not None:
-            all_files.append(self.log_file)
-        if self.lib_file is not None:
-            self.cleanup_remove_files(self.lib_file, all_files, self.delete_cfiles)
+        # The compiled library itself stays in the kernel cache for reuse
+        if self.delete_cfiles:
+            for s in [self.src_file, self.log_file]:
+                if s is not None and os.path.exists(s):
+                    os.remove(s)
 
         # If file already exists, pull new names. This is necessary on a Windows machine, because
         # Python's ctype does not deal in any sort of manner well with dynamic linked libraries on this OS.
@@ -435,20 +465,32 @@ class Kernel(BaseKernel):
         return src_file, lib_file, log_file
 
     def compile(self, compiler):
-        """Writes kernel code to file and compiles it."""
+        """Writes kernel code to file and compiles it.
+
+        Compiled libraries are stored in the kernel cache (see :func:`parcels.tools.get_kernel_cache_dir`),
+        keyed on the C code, compiler flags and headers, so that identical kernels are only compiled once
+        across runs, processes and MPI ranks.
+        """
         if self.src_file is None:
             return
 
         with open(self.src_file, "w") as f:
             f.write(self.ccode)
 
-        compiler.compile(self.src_file, self.lib_file, self.log_file)
+        key = kernel_cache_key(self.ccode, compiler)
+        self.lib_file = os.path.join(get_kernel_cache_dir(), f"lib{key}.{'dll' if sys.platform == 'win32' else 'so'}")
+        compiled = compile_cached(compiler, self.src_file, self.lib_file, self.log_file)
 
         if self.delete_cfiles is False:
-            logger.info(f"Compiled {self.name} ==> {self.src_file}")
+            if compiled:
+                logger.info(f"Compiled {self.name} ==> {self.src_file}")
+            else:
+                logger.info(f"Reusing cached {self.name} ==> {self.lib_file}")
 
     def load_lib(self):
-        self._lib = npct.load_library(self.lib_file, ".")
+        # Not npct.load_library, which returns a single shared handle per path; cached libraries
+        # can be loaded by several kernels, each of which unloads its own handle in remove_lib
+        self._lib = CDLL(os.path.abspath(self.lib_file))
         self._function = self._lib.particle_loop
 
     def merge(self, kernel, kclass):
@@ -549,6 +591,7 @@ class Kernel(BaseKernel):
     def load_fieldset_jit(self, pset):
         """Updates the loaded fields of pset's fieldset according to the chunk information within their grids."""
         if pset.fieldset is not None:
+            pset.fieldset._grow_subset_windows(pset)
             for g in pset.fieldset.gridset.grids:
                 g._cstruct = None  # This force to point newly the grids from Python to C
             # Make a copy of the transposed array to enforce
@@ -564,6 +607,7 @@ class Kernel(BaseKernel):
                     for block_id in range(len(f._data_chunks)):
                         f._data_chunks[block_id] = None
                         f._c_data_chunks[block_id] = None
+            _chunk_memory.enforce(pset.fieldset.gridset.grids)
 
             for g in pset.fieldset.gridset.grids:
                 g._load_chunk = np.where(
@@ -579,18 +623,95 @@ class Kernel(BaseKernel):
                 if not g.lat.flags.c_contiguous:
                     g._lat = np.array(g.lat, order="C")
 
-    def execute_jit(self, pset, endtime, dt):
-        """Invokes JIT engine to perform the core update loop."""
+    def prefetch_chunks(self, pset, endtime):
+        """Request the chunks of the Fields that the particles can reach before endtime.
+
+        The requested chunks are then loaded in one batch by load_fieldset_jit, instead of in rounds of
+        particles that return StatusCode.Repeat when they sample a chunk that is not loaded yet.
+        The distance that particles can travel is bounded by the largest velocity magnitude in the
+        chunks of U and V (and W for the depth) that have been loaded so far.
+        """
+        if pset.fieldset is None:
+            return
+        fields = {}
+        for f in self.field_args.values():
+            if not f._chunk_set:
+                f._chunk_setup()
+            if f._subset_bounds() is not None:
+                continue  # the chunks around a subset window are not loaded, but make the window grow
+            if len(f.nchunks) > 0 and any(n > 1 for n in f.nchunks[1:]):
+                fields.setdefault(f.grid, f)  # the chunks are shared by all Fields on a grid
+        if len(fields) == 0:
+            return
+
+        pdata = pset.particledata
+        alive = pdata.state != _TOMBSTONE
+        lon, lat, depth = (pdata.data[v][alive].astype(np.float64) for v in ["lon", "lat", "depth"])
+        duration = np.nan_to_num(np.abs(endtime - pdata.data["time_nextloop"][alive]))
+        duration = duration.max() if len(duration) > 0 else 0
+
+        def velocity_fields(names):
+            fields = [getattr(pset.fieldset, name, None) for name in names]
+            fields = [f for f in fields if isinstance(f, Field) and f._subset_bounds() is None]
+            return [f for f in fields if f._chunk_set and len(f._chunk_absmax) > 1]
+
+        def max_speed(names):
+            speed = 0.0
+            for f in velocity_fields(names):
+                if not np.all(np.isnan(f._chunk_absmax)):
+                    speed = max(speed, np.nanmax(f._chunk_absmax) * abs(f._scaling_factor or 1))
+            return speed
+
+        if any(np.all(np.isnan(f._chunk_absmax)) for f in velocity_fields(["U", "V"])):
+            # Nothing is known about the velocities yet; so first load the chunks around the particles
+            for f in fields.values():
+                f._request_chunks(depth, lat, lon)
+            self.load_fieldset_jit(pset)
+
+        dist = max_speed(["U", "V"]) * duration
+        dlon = dlat = 0
+        if dist > 0:
+            U, V = pset.fieldset.U, pset.fieldset.V
+            with np.errstate(divide="ignore"):
+                dlon = np.minimum(U.units.to_target(dist, depth, np.clip(lat, -89, 89), lon), 180)
+            dlat = np.minimum(V.units.to_target(dist, depth, lat, lon), 90)
+        dz = max_speed(["W"]) * duration
+
+        for f in fields.values():
+            f._request_chunks(depth, lat, lon, dz, dlat, dlon)
+
+    def execute_jit(self, pset, endtime, dt, indices=None):
+        """Invokes JIT engine to perform the core update loop.
+
+        If indices is given, only the particles at these indices are evaluated.
+        """
+        if indices is None:
+            self.prefetch_chunks(pset, endtime)
         self.load_fieldset_jit(pset)
 
         fargs = [byref(f.ctypes_struct) for f in self.field_args.values()]
         fargs += [c_double(f) for f in self.const_args.values()]
         particle_data = byref(pset.ctypes_struct)
-        return self._function(c_int(len(pset)), particle_data, c_double(endtime), c_double(dt), *fargs)
+        if indices is None:
+            num_particles, pindices = len(pset), None
+        else:
+            indices = np.ascontiguousarray(indices, dtype=np.int32)
+            num_particles, pindices = len(indices), indices.ctypes.data_as(POINTER(c_int))
+        if self.nthreads is not None:
+            self._lib.omp_set_num_threads(c_int(self.nthreads))
+        res = self._function(c_int(num_particles), pindices, particle_data, c_double(endtime), c_double(dt), *fargs)
+        if pset.fieldset is not None:
+            _chunk_memory.touch(pset.fieldset.gridset.grids)
+        return res
 
-    def execute_python(self, pset, endtime, dt):
-        """Performs the core update loop via Python."""
+    def execute_python(self, pset, endtime, dt, indices=None):
+        """Performs the core update loop via Python.
+
+        If indices is given, only the particles at these indices are evaluated.
+        """
         if self.fieldset is not None:
+            if indices is None:
+                self.fieldset._reach_subset_windows(pset, endtime)
             for f in self.fieldset.get_fields():
                 if isinstance(f, (VectorField, NestedField)):
                     continue
@@ -600,14 +721,62 @@ class Kernel(BaseKernel):
             self.add_scipy_positionupdate_kernels()
             self.scipy_positionupdate_kernels_added = True
 
-        for p in pset:
+        if self.vectorized and self._vectorized_pyfunc is not None:
+            return self.execute_vectorized(pset, endtime, dt, indices=indices)
+
+        for p in ParticleDataIterator(pset.particledata, subset=indices):
             self.evaluate_particle(p, endtime)
             if p.state == StatusCode.StopAllExecution:
                 return StatusCode.StopAllExecution
 
+    def execute_vectorized(self, pset, endtime, dt, indices=None):
+        """Performs the core update loop via NumPy, on arrays of particles at once.
+
+        All particles that are still being evaluated are advanced in lockstep: in each iteration, the Kernel
+        is called once with a :class:`parcels.particledata.ParticleDataArrayAccessor` for these particles,
+        so that particle variables and Field sampling are arrays. Otherwise this follows evaluate_particle.
+
+        If indices is given, only the particles at these indices are evaluated.
+        """
+        data = pset.particledata.data
+        active = np.arange(len(pset.particledata)) if indices is None else np.asarray(indices)
+        self._vectorized_rng.reset()
+        while True:
+            active = active[np.isin(data["state"][active], [StatusCode.Evaluate, StatusCode.Repeat])]
+            sign_dt = np.sign(data["dt"][active])
+            active = active[sign_dt * data["time_nextloop"][active] < sign_dt * endtime]
+            if len(active) == 0:
+                return
+
+            pre_dt = data["dt"][active]
+            sign_dt = np.sign(pre_dt)
+            time_nextloop = data["time_nextloop"][active]
+            dt_var = "next_dt" if "next_dt" in data else "dt"  # Use next_dt from AdvectionRK45 if it is set
+            remaining = np.abs(endtime - time_nextloop)
+            shorten = remaining < np.abs(data[dt_var][active]) - 1e-6
+            data[dt_var][active[shorten]] = remaining[shorten] * sign_dt[shorten]
+
+            self._vectorized_rng.reset(len(active))
+            res = self._vectorized_pyfunc(
+                ParticleDataArrayAccessor(pset.particledata, active), self._fieldset, time_nextloop
+            )
+
+            if res is None:
+                cont = (sign_dt * data["time"][active] < sign_dt * endtime) & (
+                    data["state"][active] == StatusCode.Success
+                )
+                data["state"][active[cont]] = StatusCode.Evaluate
+            else:
+                data["state"][active] = res
+
+            data["dt"][active] = pre_dt
+            if np.any(data["state"][active] == StatusCode.StopAllExecution):
+                return StatusCode.StopAllExecution
+
     def execute(self, pset, endtime, dt):
         """Execute this Kernel over a ParticleSet for several timesteps."""
-        pset.particledata.state[:] = StatusCode.Evaluate
+        state = pset.particledata.state
+        state[state != _TOMBSTONE] = StatusCode.Evaluate
 
         if abs(dt) < 1e-6:
             warnings.warn(
@@ -632,20 +801,24 @@ class Kernel(BaseKernel):
         # Remove all particles that signalled deletion
         self.remove_deleted(pset)
 
-        # Identify particles that threw errors
-        n_error = pset._num_error_particles
-
-        while n_error > 0:
-            error_pset = pset._error_particles
-            # Check for StatusCodes
-            for p in error_pset:
+        # Resolve the status codes of all particles that threw errors at once, and only
+        # re-run the particles that need to be repeated (e.g. after a new chunk was requested)
+        while pset._num_error_particles > 0:
+            state = pset.particledata.state
+            error_indices = np.where(
+                np.isin(state, [StatusCode.Success, StatusCode.Evaluate, _TOMBSTONE], invert=True)
+            )[0]
+            error_states = state[error_indices]
+
+            # The first particle that stops the execution or raised an error determines the outcome
+            interrupting = np.isin(error_states, _INTERRUPTING_STATUSCODES)
+            if interrupting.any():
+                p = ParticleDataAccessor(pset.particledata, error_indices[np.argmax(interrupting)])
                 if p.state == StatusCode.StopExecution:
                     return
                 if p.state == StatusCode.StopAllExecution:
                     return StatusCode.StopAllExecution
-                if p.state == StatusCode.Repeat:
-                    p.state = StatusCode.Evaluate
-                elif p.state == StatusCode.ErrorTimeExtrapolation:
+                if p.state == StatusCode.ErrorTimeExtrapolation:
                     raise TimeExtrapolationError(p.time)
                 elif p.state == StatusCode.ErrorOutOfBounds:
                     _raise_field_out_of_bound_error(p.depth, p.lat, p.lon)
@@ -653,26 +826,30 @@ class Kernel(BaseKernel):
                     _raise_field_out_of_bound_surface_error(p.depth, p.lat, p.lon)
                 elif p.state == StatusCode.Error:
                     _raise_field_sampling_error(p.depth, p.lat, p.lon)
-                elif p.state == StatusCode.Delete:
-                    pass
-                else:
-                    warnings.warn(
-                        f"Deleting particle {p.id} because of non-recoverable error",
-                        RuntimeWarning,
-                        stacklevel=2,
-                    )
-                    p.delete()
+
+            # Delete all particles with a non-recoverable status code
+            non_recoverable = error_indices[np.isin(error_states, [StatusCode.Repeat, StatusCode.Delete], invert=True)]
+            if len(non_recoverable) > 0:
+                warnings.warn(
+                    f"Deleting {len(non_recoverable)} particle(s) because of non-recoverable error "
+                    f"(ids: {pset.particledata.data['id'][non_recoverable]})",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+                state[non_recoverable] = StatusCode.Delete
 
             # Remove all particles that signalled deletion
             self.remove_deleted(pset)  # Generalizable version!
 
             # Execute core loop again to continue interrupted particles
+            repeat_indices = np.where(pset.particledata.state == StatusCode.Repeat)[0]
+            if len(repeat_indices) == 0:
+                break
+            pset.particledata.state[repeat_indices] = StatusCode.Evaluate
             if self.ptype.uses_jit:
-                self.execute_jit(pset, endtime, dt)
+                self.execute_jit(pset, endtime, dt, indices=repeat_indices)
             else:
-                self.execute_python(pset, endtime, dt)
-
-            n_error = pset._num_error_particles
+                self.execute_python(pset, endtime, dt, indices=repeat_indices)
 
     def evaluate_particle(self, p, endtime):
         """Execute the kernel evaluation of for an individual particle.
@@ -26,13 +26,19 @@ class Variable:
     to_write : bool, 'once', optional
         Boolean or 'once'. Controls whether Variable is written to NetCDF file.
         If to_write = 'once', the variable will be written as a time-independent 1D array
+    encoding : dict, optional
+        Compression, quantization and filter options of the output of the variable. See the
+        ``encoding`` argument of :class:`parcels.particlefile.ParticleFile` for the options
     """
 
-    def __init__(self, name, dtype=np.float32, initial=0, to_write: bool | Literal["once"] = True):
+    def __init__(
+        self, name, dtype=np.float32, initial=0, to_write: bool | Literal["once"] = True, encoding: dict | None = None
+    ):
         self._name = name
         self.dtype = dtype
         self.initial = initial
         self.to_write = to_write
+        self.encoding = encoding
 
     @property
     def name(self):
@@ -53,7 +59,10 @@ class Variable:
             setattr(instance, f"_{self.name}", value)
 
     def __repr__(self):
-        return f"Variable(name={self._name}, dtype={self.dtype}, initial={self.initial}, to_write={self.to_write})"
+        return (
+            f"Variable(name={self._name}, dtype={self.dtype}, initial={self.initial}, to_write={self.to_write}, "
+            f"encoding={self.encoding})"
+        )
 
     def is64bit(self):
         """Check whether variable is 64-bit."""
@@ -231,7 +240,8 @@ class ScipyParticle:
             dtype = kwargs.pop("dtype", np.float32)
             initial = kwargs.pop("initial", 0)
             to_write = kwargs.pop("to_write", True)
-            var = Variable(var, dtype=dtype, initial=initial, to_write=to_write)
+            encoding = kwargs.pop("encoding", None)
+            var = Variable(var, dtype=dtype, initial=initial, to_write=to_write, encoding=encoding)
 
         class NewParticle(cls):
             pass
@@ -8,6 +8,9 @@ from parcels._compat import MPI, KMeans
 from parcels.tools._helpers import deprecated
 from parcels.tools.statuscodes import StatusCode
 
+# State of particles that have been deleted, but not yet removed from the storage (see ParticleData._mark_deleted)
+_TOMBSTONE = -1
+
 
 def partitionParticlesMPI_default(coords, mpi_size=1):
     """This function takes the coordinates of the particle starting
@@ -38,6 +41,8 @@ def partitionParticlesMPI_default(coords, mpi_size=1):
 
 
 class ParticleData:
+    _compaction_threshold = 0.25  # fraction of deleted particles above which the storage is compacted
+
     def __init__(self, pclass, lon, lat, depth, time, lonlatdepth_dtype, pid_orig, ngrid=1, **kwargs):
         """
         Parameters
@@ -47,12 +52,16 @@ class ParticleData:
             field references of the ctypes-link of particles that are allocated
         """
         self._ncount = -1
+        self._ndeleted = 0
+        self._defer_deletion = False
         self._pu_indicators = None
         self._offset = 0
         self._pclass = None
         self._ptype = None
         self._latlondepth_dtype = np.float32
         self._data = None
+        self._buffers = None
+        self._capacity = 0
 
         assert pid_orig is not None, "particle IDs are None - incompatible with the ParticleData class. Invalid state."
         pid = pid_orig + pclass.lastID
@@ -185,6 +194,10 @@ class ParticleData:
         else:
             raise ValueError("Latitude and longitude required for generating ParticleSet")
 
+        # The variable arrays in _data are views on the first _ncount rows of the (over-allocated) buffers
+        self._buffers = dict(self._data)
+        self._capacity = self._ncount
+
     def __del__(self):
         pass
 
@@ -229,6 +242,11 @@ class ParticleData:
         """Return the length, in terms of 'number of elements, of a ParticleData instance."""
         return self._ncount
 
+    @property
+    def _nalive(self):
+        """Number of particles in the ParticleData instance that have not been marked as deleted."""
+        return self._ncount - self._ndeleted
+
     @deprecated(
         "Use iter(...) instead, or just use the object in an iterator context (e.g. for p in particledata: ...)."
     )  # TODO: Remove 6 months after v3.1.0 (or 9 months; doesn't contribute to code debt)
@@ -277,21 +295,58 @@ class ParticleData:
             return
 
         if self._ncount == 0:
-            self._data = same_class._data
+            self._buffers = dict(same_class._buffers)
+            self._capacity = same_class._capacity
             self._ncount = same_class._ncount
+            self._ndeleted = same_class._ndeleted
+            self._set_views()
             return
 
+        n = same_class._ncount
+        self._reserve(self._ncount + n)
+
         # Determine order of concatenation and update the sorted flag
         if self._sorted and same_class._sorted and self._data["id"][0] > same_class._data["id"][-1]:
-            for d in self._data:
-                self._data[d] = np.concatenate((same_class._data[d], self._data[d]))
-            self._ncount += same_class._ncount
+            for d, buf in self._buffers.items():
+                buf[n : self._ncount + n] = buf[: self._ncount]
+                buf[:n] = same_class._data[d]
         else:
             if not (same_class._sorted and self._data["id"][-1] < same_class._data["id"][0]):
                 self._sorted = False
-            for d in self._data:
-                self._data[d] = np.concatenate((self._data[d], same_class._data[d]))
-            self._ncount += same_class._ncount
+            for d, buf in self._buffers.items():
+                buf[self._ncount : self._ncount + n] = same_class._data[d]
+        self._ncount += n
+        self._ndeleted += same_class._ndeleted
+        self._set_views()
+
+    def _set_views(self):
+        """Point the variable arrays in _data to the first _ncount rows of the buffers."""
+        for d, buf in self._buffers.items():
+            self._data[d] = buf[: self._ncount]
+
+    def _reserve(self, size):
+        """Make sure that the buffers can hold at least size particles.
+
+        The capacity is (at least) doubled when the buffers are grown, so that repeatedly adding particles
+        (e.g. for every release of a ParticleSet with repeatdt) only takes amortized constant time per particle.
+        """
+        if size <= self._capacity:
+            return
+        capacity = max(size, 2 * self._capacity)
+        for d, buf in self._buffers.items():
+            newbuf = np.empty((capacity,) + buf.shape[1:], dtype=buf.dtype)
+            newbuf[: self._ncount] = buf[: self._ncount]
+            self._buffers[d] = newbuf
+        self._capacity = capacity
+        self._set_views()
+
+    def _keep_rows(self, keep):
+        """Move the particles selected by the boolean array keep to the front of the buffers, retaining their capacity."""
+        nkeep = np.count_nonzero(keep)
+        for buf in self._buffers.values():
+            buf[:nkeep] = buf[: self._ncount][keep]
+        self._ncount = nkeep
+        self._set_views()
 
     def __iadd__(self, instance):
         """Perform an incremental addition of ParticleData instances, such to allow a += b."""
@@ -306,10 +361,13 @@ class ParticleData:
             np.intp,
         ], f"Trying to remove a particle by index, but index {index} is not a 32-bit integer - invalid operation."
 
-        for d in self._data:
-            self._data[d] = np.delete(self._data[d], index, axis=0)
+        if self._defer_deletion:
+            self._mark_deleted([index])
+            return
 
-        self._ncount -= 1
+        keep = np.ones(self._ncount, dtype=bool)
+        keep[index] = False
+        self._keep_rows(keep)
 
     def remove_multi_by_indices(self, indices):
         """Remove particles from the ParticleData instance based on their indices."""
@@ -330,10 +388,35 @@ class ParticleData:
         if type(indices) is dict:
             indices = list(indices.values())
 
-        for d in self._data:
-            self._data[d] = np.delete(self._data[d], indices, axis=0)
+        if self._defer_deletion:
+            self._mark_deleted(indices)
+            return
+
+        keep = np.ones(self._ncount, dtype=bool)
+        keep[indices] = False
+        self._keep_rows(keep)
 
-        self._ncount -= len(indices)
+    def _mark_deleted(self, indices):
+        """Mark particles as deleted in place, instead of removing them from the storage.
+
+        Deleted particles keep their index, and are skipped by the Kernel loops and in the output.
+        The storage is only compacted once the fraction of deleted particles exceeds the compaction threshold,
+        so that a steady trickle of deletions does not copy all particle data at every Kernel execution.
+        """
+        indices = np.unique(np.asarray(indices, dtype=np.intp))
+        state = self._data["state"]
+        indices = indices[state[indices] != _TOMBSTONE]
+        state[indices] = _TOMBSTONE
+        self._ndeleted += len(indices)
+        if self._ndeleted > self._compaction_threshold * self._ncount:
+            self._compact()
+
+    def _compact(self):
+        """Remove all particles that have been marked as deleted from the storage."""
+        if self._ndeleted == 0:
+            return
+        self._keep_rows(self._data["state"] != _TOMBSTONE)
+        self._ndeleted = 0
 
     def cstruct(self):
         """Return the ctypes mapping of the particle data."""
@@ -342,6 +425,7 @@ class ParticleData:
             _fields_ = [(v.name, POINTER(np.ctypeslib.as_ctypes_type(v.dtype))) for v in self._ptype.variables]
 
         def flatten_dense_data_array(vname):
+            # A view on the buffers, so that the C code operates on the particle data without copying
             data_flat = self._data[vname].view()
             data_flat.shape = -1
             return np.ctypeslib.as_ctypes(data_flat)
@@ -361,6 +445,7 @@ class ParticleData:
             )
             & (np.isfinite(pd["id"]))
             & (np.isfinite(pd["time"]))
+            & (pd["state"] != _TOMBSTONE)
         )[0]
 
     def getvardata(self, var, indices=None):
@@ -479,6 +564,52 @@ class ParticleDataAccessor:
         self.state = StatusCode.Delete
 
 
+class ParticleDataArrayAccessor:
+    """Wrapper that provides access to the data of a subset of particles at once, as arrays.
+
+    This is the `particle` that is passed to a Kernel in vectorized execution (see :meth:`parcels.kernel.Kernel.execute_vectorized`).
+    Getting an attribute returns a copy of the data of all particles in the subset, and setting an attribute
+    writes (or broadcasts) the value back to the underlying data arrays.
+
+    Parameters
+    ----------
+    pcoll :
+        ParticleData that the particles belong to.
+    indices :
+        The indices at which the data for the particles is stored in the corresponding data arrays of the ParticleData instance.
+    """
+
+    _pcoll = None
+    _indices = None
+
+    def __init__(self, pcoll, indices):
+        """Initializes the ParticleDataArrayAccessor to provide access to a subset of particles."""
+        object.__setattr__(self, "_pcoll", pcoll)
+        object.__setattr__(self, "_indices", indices)
+
+    def __getattr__(self, name):
+        """Get the values of an attribute of all particles in the subset."""
+        return self._pcoll.data[name][self._indices]
+
+    def __setattr__(self, name, value):
+        """Set the values of an attribute of all particles in the subset."""
+        self._pcoll.data[name][self._indices] = value
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __getitem__(self, index):
+        """Get a ParticleDataAccessor for one particle in the subset."""
+        return ParticleDataAccessor(self._pcoll, self._indices[index])
+
+    def getPType(self):
+        return self._pcoll.ptype
+
+    def delete(self):
+        """Signal the particles for deletion."""
+        self.state = StatusCode.Delete
+
+
 class ParticleDataIterator:
     """Iterator for looping over the particles in the ParticleData.
 
@@ -2,18 +2,26 @@
 
 import os
 import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 
+import numcodecs
 import numpy as np
 import xarray as xr
 import zarr
+from numcodecs.abc import Codec
 
 import parcels
 from parcels._compat import MPI
 from parcels.tools._helpers import default_repr, deprecated, deprecated_made_private, timedelta_to_float
 from parcels.tools.warnings import FileWarning
 
-__all__ = ["ParticleFile"]
+__all__ = ["ParticleFile", "RaggedTrajectories"]
+
+ENCODING_OPTIONS = ["compressor", "clevel", "shuffle", "bitround", "quantize", "delta"]
+BLOSC_COMPRESSORS = ["blosclz", "lz4", "lz4hc", "zlib", "zstd"]
+BLOSC_SHUFFLES = {"none": numcodecs.Blosc.NOSHUFFLE, "byte": numcodecs.Blosc.SHUFFLE, "bit": numcodecs.Blosc.BITSHUFFLE}
 
 
 def _set_calendar(origin_calendar):
@@ -23,6 +31,185 @@ def _set_calendar(origin_calendar):
         return origin_calendar
 
 
+class _TrajectoryIndex:
+    """Mapping from particle ids to the rows (trajectories) of the output, in which new ids get the next rows.
+
+    While the ids are dense, i.e. span at most DENSE_SPAN times their number (e.g. the consecutive ids of a
+    ParticleSet with repeated releases), the rows are stored in a table that is indexed by id minus the lowest id.
+    Otherwise, the ids are stored as a sorted array, with the row of each id, and looked up with searchsorted.
+    """
+
+    DENSE_SPAN = 2
+
+    def __init__(self):
+        self._table = None  # row of each id from self._offset on, or -1 if the id is not in the index
+        self._offset = 0
+        self._ids = np.zeros(0, dtype=np.int64)  # sorted ids, when the table is not used
+        self._rows = np.zeros(0, dtype=np.int64)
+        self._len = 0
+        self._span = (0, 0)  # lowest and highest (plus one) id in the index
+
+    def __len__(self):
+        return self._len
+
+    def __contains__(self, pid):
+        return self._lookup(np.array([pid], dtype=np.int64))[0] >= 0
+
+    def __getitem__(self, pid):
+        row = self._lookup(np.array([pid], dtype=np.int64))[0]
+        if row < 0:
+            raise KeyError(pid)
+        return int(row)
+
+    def keys(self):
+        if self._table is not None:
+            return np.flatnonzero(self._table >= 0) + self._offset
+        return self._ids.copy()
+
+    def as_dict(self):
+        """The index as a dict from particle id to row."""
+        ids = self.keys()
+        return dict(zip(ids.tolist(), self._lookup(ids).tolist(), strict=True))
+
+    def _lookup(self, pids):
+        """The rows of pids, or -1 for the ids that are not in the index."""
+        rows = np.full(len(pids), -1, dtype=np.int64)
+        if self._table is not None:
+            i = pids - self._offset
+            inside = (i >= 0) & (i < len(self._table))
+            rows[inside] = self._table[i[inside]]
+        elif self._len > 0:
+            pos = np.minimum(np.searchsorted(self._ids, pids), self._len - 1)
+            found = self._ids[pos] == pids
+            rows[found] = self._rows[pos[found]]
+        return rows
+
+    def rows(self, pids):
+        """The rows of pids, adding the ids that are not in the index yet (in increasing order of id)."""
+        pids = np.asarray(pids, dtype=np.int64)
+        rows = self._lookup(pids)
+        missing = rows < 0
+        if np.any(missing):
+            new_ids = np.unique(pids[missing])
+            self._add(new_ids, np.arange(self._len, self._len + len(new_ids), dtype=np.int64))
+            rows[missing] = self._lookup(pids[missing])
+        return rows
+
+    def _add(self, ids, rows):
+        lo, hi = ids[0], ids[-1] + 1
+        if self._len > 0:
+            lo, hi = min(self._span[0], lo), max(self._span[1], hi)
+        self._span = (lo, hi)
+        self._len += len(ids)
+
+        if hi - lo <= self.DENSE_SPAN * self._len:
+            if self._table is None or lo < self._offset or hi > self._offset + len(self._table):
+                size = hi - lo
+                if self._table is not None:
+                    # grow the table geometrically (upward), as new ids are usually larger than the previous ones
+                    size = max(hi, self._offset + len(self._table)) - lo
+                    size = max(size, len(self._table) + len(self._table) // 2)
+                table = np.full(size, -1, dtype=np.int64)
+                if self._table is not None:
+                    table[self._offset - lo : self._offset - lo + len(self._table)] = self._table
+                else:
+                    table[self._ids - lo] = self._rows
+                self._table, self._offset = table, lo
+                self._ids, self._rows = self._ids[:0], self._rows[:0]
+            self._table[ids - self._offset] = rows
+            return
+
+        if self._table is not None:  # the ids became too sparse for the table
+            self._ids = np.flatnonzero(self._table >= 0) + self._offset
+            self._rows = self._table[self._ids - self._offset]
+            self._table = None
+        pos = np.searchsorted(self._ids, ids)
+        self._ids = np.insert(self._ids, pos, ids)
+        self._rows = np.insert(self._rows, pos, rows)
+
+
+class _WriteBuffer:
+    """Observations of ParticleFile.write that are collected in memory, until they are written to the store."""
+
+    def __init__(self):
+        self.steps = []  # (ids, obs, {var: data}) of each write
+        self.once = []  # (ids, {var: data}) of the variables that are written once
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self.steps)
+
+    def add(self, ids, obs, data, ids_once, data_once):
+        self.steps.append((ids, obs, data))
+        self.nbytes += ids.nbytes + obs.nbytes + sum(d.nbytes for d in data.values())
+        if len(ids_once) > 0:
+            self.once.append((ids_once, data_once))
+            self.nbytes += ids_once.nbytes + sum(d.nbytes for d in data_once.values())
+
+    def pop(self):
+        """Return the concatenated ids, obs and data of all collected writes, and empty the buffer."""
+        steps, once = self.steps, self.once
+        self.steps, self.once, self.nbytes = [], [], 0
+        ids = np.concatenate([ids for ids, _, _ in steps])
+        obs = np.concatenate([obs for _, obs, _ in steps])
+        data = {var: np.concatenate([d[var] for _, _, d in steps]) for var in steps[0][2]}
+        ids_once = np.concatenate([ids for ids, _ in once]) if once else np.zeros(0, dtype=int)
+        data_once = {var: np.concatenate([d[var] for _, d in once]) for var in once[0][1]} if once else {}
+        return ids, obs, data, ids_once, data_once
+
+
+def _zarr_encoding(var, options, dtype):
+    """The compressor and filters of the zarr array of the output of var, from its encoding options."""
+    unknown = set(options) - set(ENCODING_OPTIONS)
+    if unknown:
+        raise ValueError(
+            f"Unknown encoding options {sorted(unknown)} of Variable {var}. Choose from: {ENCODING_OPTIONS}"
+        )
+    is_float = np.issubdtype(dtype, np.floating)
+    filters = []
+    if "bitround" in options or "quantize" in options:
+        if "bitround" in options and "quantize" in options:
+            raise ValueError(f"Variable {var} can be quantized with either bitround or quantize, not both")
+        if not is_float:
+            raise ValueError(f"Quantization of Variable {var} requires a floating point dtype, not {np.dtype(dtype)}")
+        if "bitround" in options:
+            filters.append(numcodecs.BitRound(keepbits=options["bitround"]))
+        else:
+            filters.append(numcodecs.Quantize(digits=options["quantize"], dtype=dtype))
+    if options.get("delta", False):
+        if np.issubdtype(dtype, np.integer):
+            filters.append(numcodecs.Delta(dtype=dtype))
+        elif is_float:
+            # The differences of the floats themselves are rounded, so floats are delta encoded as the integers
+            # with the same bits. This is exact (also for the NaN fill values), and as these integers increase
+            # almost linearly with the floats, it makes e.g. the regularly spaced output times compress well.
+            filters.append(numcodecs.Delta(dtype=f"<i{np.dtype(dtype).itemsize}"))
+        else:
+            raise ValueError(f"Delta encoding of Variable {var} requires a numeric dtype, not {np.dtype(dtype)}")
+
+    encoding = {"filters": filters} if filters else {}
+    compressor = options.get("compressor")
+    clevel = options.get("clevel", 5)
+    shuffle = options.get("shuffle", "byte")
+    if shuffle not in BLOSC_SHUFFLES:
+        raise ValueError(f"Unknown shuffle {shuffle!r} of Variable {var}. Choose from: {list(BLOSC_SHUFFLES)}")
+    if isinstance(compressor, Codec):
+        encoding["compressor"] = compressor
+    elif compressor == "none" or ("compressor" in options and compressor is None):
+        encoding["compressor"] = None
+    elif compressor == "gzip":
+        encoding["compressor"] = numcodecs.GZip(level=clevel)
+    elif compressor in BLOSC_COMPRESSORS or (compressor is None and ("clevel" in options or "shuffle" in options)):
+        encoding["compressor"] = numcodecs.Blosc(
+            cname=compressor or "lz4", clevel=clevel, shuffle=BLOSC_SHUFFLES[shuffle]
+        )
+    elif compressor is not None:
+        raise ValueError(
+            f"Unknown compressor {compressor!r} of Variable {var}. Choose from: {BLOSC_COMPRESSORS + ['gzip', 'none']}"
+        )
+    return encoding
+
+
 class ParticleFile:
     """Initialise trajectory output.
 
@@ -40,6 +227,48 @@ class ParticleFile:
         Tuple (trajs, obs) to control the size of chunks in the zarr output.
     create_new_zarrfile : bool
         Whether to create a new file. Default is True
+    buffer_obs : int
+        Number of output steps that are collected in memory before they are written to the store,
+        in blocks that are aligned with its chunks. Default is None, which writes every output step
+        directly. Buffered output is also written when it exceeds max_buffer_size, at the end of
+        :meth:`parcels.particleset.ParticleSet.execute` (also when it raises an error) and on :meth:`close`
+    max_buffer_size : float
+        Maximum size in MB of the output that is collected in memory. Default is 256 MB
+    asynchronous : bool
+        Whether to write the output on a background thread, while the particles are advanced to the
+        next output step. :meth:`write` then only copies the data that is written. Default is False
+    max_pending_writes : int
+        Maximum number of writes that are queued for the background thread. When the queue is full,
+        :meth:`write` waits for the oldest write to finish. Errors of the background thread are raised
+        in the next call of :meth:`write` or :meth:`flush`. Default is 2
+    layout : str
+        Layout of the output:
+
+        1. dense (default): the Variables are stored in (trajectory, obs) arrays, in which the
+           observations that a trajectory does not have (e.g. before its release or after its
+           deletion) are fill values.
+        2. ragged: only the observations that are written are stored, in (obs) arrays, which are appended
+           to in order of writing. This is the CF indexed ragged array representation: the
+           ``trajectory_index`` variable holds the trajectory of each observation, and ``rowSize`` the
+           number of observations of each trajectory. The observations are chunked in chunks of
+           chunks[0] * chunks[1] observations. Use :class:`RaggedTrajectories` to read the trajectories.
+    encoding : dict
+        Compression, quantization and filter options of the output of each Variable, as
+        {variable name: options}. These override the ``encoding`` of the Variable. The options are:
+
+        1. compressor: a Blosc compressor ('blosclz', 'lz4', 'lz4hc', 'zlib' or 'zstd'), 'gzip', 'none'
+           (no compression) or a numcodecs Codec. Default is the compressor of zarr (Blosc with lz4)
+        2. clevel: compression level of the compressor. Default is 5
+        3. shuffle: shuffle of the Blosc compressor: 'none', 'byte' (default) or 'bit'
+        4. bitround: number of mantissa bits of floats that are kept, with all other bits rounded to
+           zero (numcodecs.BitRound)
+        5. quantize: number of decimal digits of floats that are kept, e.g. 5 for a precision of
+           1e-5 degrees of lon and lat (numcodecs.Quantize)
+        6. delta: whether to store the differences between consecutive values, e.g. of the
+           trajectory ids or the output times (numcodecs.Delta). Floats are delta encoded as the
+           integers with the same bits, so that their round-trip is exact
+
+        Quantization is lossy, but makes the output compress much better.
 
     Returns
     -------
@@ -47,21 +276,56 @@ class ParticleFile:
         ParticleFile object that can be used to write particle data to file
     """
 
-    def __init__(self, name, particleset, outputdt, chunks=None, create_new_zarrfile=True):
+    def __init__(
+        self,
+        name,
+        particleset,
+        outputdt,
+        chunks=None,
+        create_new_zarrfile=True,
+        buffer_obs=None,
+        max_buffer_size=256,
+        asynchronous=False,
+        max_pending_writes=2,
+        layout="dense",
+        encoding=None,
+    ):
+        if layout not in ["dense", "ragged"]:
+            raise ValueError(f"Unsupported ParticleFile layout {layout!r}. Choose either: 'dense' or 'ragged'")
+        self._layout = layout
         self._outputdt = timedelta_to_float(outputdt)
         self._chunks = chunks
+        self._buffer_obs = buffer_obs
+        self._max_buffer_size = max_buffer_size
+        self._buffer = _WriteBuffer()
+        # all observations from this number on are fill values in the store (None: read from the existing store)
+        self._nobs_stored = 0 if create_new_zarrfile else None
+        self._asynchronous = asynchronous
+        self._max_pending_writes = max_pending_writes
+        self._writer: ThreadPoolExecutor | None = None
+        self._pending_writes: deque = deque()  # futures of the writes on the writer thread, oldest first
         self._particleset = particleset
         self._parcels_mesh = "spherical"
         if self.particleset.fieldset is not None:
             self._parcels_mesh = self.particleset.fieldset.gridset.grids[0].mesh
         self.lonlatdepth_dtype = self.particleset.particledata.lonlatdepth_dtype
         self._maxids = 0
-        self._pids_written = {}
+        self._pids_written = _TrajectoryIndex()
         self._create_new_zarrfile = create_new_zarrfile
         self._vars_to_write = {}
         for var in self.particleset.particledata.ptype.variables:
             if var.to_write:
                 self.vars_to_write[var.name] = var.dtype
+        self._encoding = encoding
+        encoding = encoding or {}
+        not_written = set(encoding) - set(self.vars_to_write)
+        if not_written:
+            raise ValueError(f"ParticleFile encoding of Variables {sorted(not_written)} that are not written")
+        self._var_encodings = {}  # Variable name -> compressor and filters of its zarr array
+        for var in self.particleset.particledata.ptype.variables:
+            options = {**(var.encoding or {}), **encoding.get(var.name, {})}
+            if var.to_write and options:
+                self._var_encodings[var.name] = _zarr_encoding(var.name, options, var.dtype)
         self._mpi_rank = MPI.COMM_WORLD.Get_rank() if MPI else 0
         self.particleset.fieldset._particlefile = self
         self._is_analytical = False  # Flag to indicate if ParticleFile is used for analytical trajectories
@@ -75,6 +339,7 @@ class ParticleFile:
             "ncei_template_version": "NCEI_NetCDF_Trajectory_Template_v2.0",
             "parcels_version": parcels.__version__,
             "parcels_mesh": self._parcels_mesh,
+            "parcels_layout": self._layout,
         }
 
         # Create dictionary to translate datatypes and fill_values
@@ -123,9 +388,21 @@ class ParticleFile:
             f"particleset={default_repr(self.particleset)}, "
             f"outputdt={self.outputdt!r}, "
             f"chunks={self.chunks!r}, "
-            f"create_new_zarrfile={self.create_new_zarrfile!r})"
+            f"create_new_zarrfile={self.create_new_zarrfile!r}, "
+            f"buffer_obs={self._buffer_obs!r}, "
+            f"max_buffer_size={self._max_buffer_size!r}, "
+            f"asynchronous={self._asynchronous!r}, "
+            f"max_pending_writes={self._max_pending_writes!r}, "
+            f"layout={self._layout!r}, "
+            f"encoding={self._encoding!r})"
         )
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
     @property
     def create_new_zarrfile(self):
         return self._create_new_zarrfile
@@ -167,7 +444,7 @@ class ParticleFile:
     @property
     @deprecated_made_private  # TODO: Remove 6 months after v3.1.0
     def pids_written(self):
-        return self._pids_written
+        return self._pids_written.as_dict()
 
     @property
     @deprecated_made_private  # TODO: Remove 6 months after v3.1.0
@@ -216,6 +493,13 @@ class ParticleFile:
                     "units": "unknown",
                 }
 
+        if self._layout == "ragged":
+            attrs["trajectory_index"] = {
+                "long_name": "index of the trajectory of each observation",
+                "instance_dimension": "trajectory",
+            }
+            attrs["rowSize"] = {"long_name": "number of observations of each trajectory"}
+
         return attrs
 
     @deprecated(
@@ -248,21 +532,157 @@ class ParticleFile:
     def _write_once(self, var):
         return self.particleset.particledata.ptype[var].to_write == "once"
 
-    def _extend_zarr_dims(self, Z, store, dtype, axis):
+    def _extend_zarr_dims(self, Z, store, dtype, axis, nobs=1, ntrajs=None):
+        """Extend Z along axis to ntrajs (default all) trajectories, or by at least nobs observations (in whole chunks).
+
+        The metadata of the store must be consolidated after all variables are extended.
+        """
         if axis == 1:
-            a = np.full((Z.shape[0], self.chunks[1]), self._fill_value_map[dtype], dtype=dtype)
+            nobs = -(-nobs // self.chunks[1]) * self.chunks[1]
+            a = np.full((Z.shape[0], nobs), self._fill_value_map[dtype], dtype=dtype)
             obs = zarr.group(store=store, overwrite=False)["obs"]
             if len(obs) == Z.shape[1]:
-                obs.append(np.arange(self.chunks[1]) + obs[-1] + 1)
+                obs.append(np.arange(nobs) + obs[-1] + 1)
         else:
-            extra_trajs = self._maxids - Z.shape[0]
+            extra_trajs = (self._maxids if ntrajs is None else ntrajs) - Z.shape[0]
             if len(Z.shape) == 2:
                 a = np.full((extra_trajs, Z.shape[1]), self._fill_value_map[dtype], dtype=dtype)
             else:
                 a = np.full((extra_trajs,), self._fill_value_map[dtype], dtype=dtype)
         Z.append(a, axis=axis)
+
+    def _var_chunks(self, var):
+        """Chunks of the output of a Variable (or of the trajectory_index and rowSize of the ragged layout)."""
+        if var == "rowSize" or (var != "trajectory_index" and self._write_once(var)):
+            return self.chunks[0]  # type: ignore[index]
+        if self._layout == "ragged":
+            return self.chunks[0] * self.chunks[1]  # type: ignore[index]
+        return self.chunks
+
+    def _store(self):
+        # Either use the store that was provided directly or create a DirectoryStore:
+        if isinstance(self.fname, zarr.storage.Store):
+            return self.fname
+        return zarr.DirectoryStore(self.fname)
+
+    def _write_obs_blocks(self, Z, ids, obs, data, fill_value):
+        """Write the observations (ids, obs) of a variable in whole chunks of Z.
+
+        Only the chunks of the trajectories that have observations are written, with one read of
+        each chunk if it may already contain observations, and one write.
+        """
+        nrows, nobs = Z.chunks
+        o0 = obs.min() // nobs * nobs
+        o1 = min(-(-(obs.max() + 1) // nobs) * nobs, Z.shape[1])
+        rowchunk = ids // nrows
+        order = np.argsort(rowchunk, kind="stable")
+        for sel in np.split(order, np.flatnonzero(np.diff(rowchunk[order])) + 1):
+            r0 = rowchunk[sel[0]] * nrows
+            r1 = min(r0 + nrows, Z.shape[0])
+            if o0 < self._nobs_stored:
+                block = Z[r0:r1, o0:o1]
+            else:
+                block = np.full((r1 - r0, o1 - o0), fill_value, dtype=Z.dtype)
+            block[ids[sel] - r0, obs[sel] - o0] = data[sel]
+            Z[r0:r1, o0:o1] = block
+
+    def _write_buffer(self, buffer, ntrajs):
+        """Write the output steps in buffer to the store, which then has (at least) ntrajs trajectories."""
+        ids, obs, data, ids_once, data_once = buffer.pop()
+        store = self._store()
+        Z = zarr.group(store=store, overwrite=False)
+        if self._layout == "ragged":
+            self._append_ragged(Z, store, ids, obs, data, ids_once, data_once, ntrajs)
+            return
+        if self._nobs_stored is None:
+            self._nobs_stored = max(
+                Z[self._convert_varout_name(v)].shape[1] for v in self.vars_to_write if not self._write_once(v)
+            )
+        extended = False
+        for var, dtype in self.vars_to_write.items():
+            varout = self._convert_varout_name(var)
+            if ntrajs > Z[varout].shape[0]:
+                self._extend_zarr_dims(Z[varout], store, dtype=dtype, axis=0, ntrajs=ntrajs)
+                extended = True
+            if not self._write_once(var) and obs.max() >= Z[varout].shape[1]:
+                self._extend_zarr_dims(Z[varout], store, dtype=dtype, axis=1, nobs=obs.max() + 1 - Z[varout].shape[1])
+                extended = True
+        if extended:
+            zarr.consolidate_metadata(store)
+
+        for var, dtype in self.vars_to_write.items():
+            varout = self._convert_varout_name(var)
+            if self._write_once(var):
+                if len(ids_once) > 0:
+                    Z[varout].vindex[ids_once] = data_once[var]
+            else:
+                self._write_obs_blocks(Z[varout], ids, obs, data[var], self._fill_value_map[dtype])
+        self._nobs_stored = max(self._nobs_stored, obs.max() + 1)
+
+    def _append_ragged(self, Z, store, ids, obs, data, ids_once, data_once, ntrajs):
+        """Append the observations to the (obs) arrays of the ragged layout, and update the rowSize of their rows."""
+        for var, dtype in self.vars_to_write.items():
+            varout = self._convert_varout_name(var)
+            if not self._write_once(var):
+                Z[varout].append(data[var])
+            elif ntrajs > Z[varout].shape[0]:
+                self._extend_zarr_dims(Z[varout], store, dtype=dtype, axis=0, ntrajs=ntrajs)
+        Z["trajectory_index"].append(ids)
+        if ntrajs > Z["rowSize"].shape[0]:
+            Z["rowSize"].append(np.zeros(ntrajs - Z["rowSize"].shape[0], dtype=np.int32))
         zarr.consolidate_metadata(store)
 
+        for var in self.vars_to_write:
+            if self._write_once(var) and len(ids_once) > 0:
+                Z[self._convert_varout_name(var)].vindex[ids_once] = data_once[var]
+        # the observations of a trajectory are written in order, so its last one in the buffer is its latest
+        traj, last = np.unique(ids[::-1], return_index=True)
+        Z["rowSize"].vindex[traj] = obs[::-1][last] + 1
+
+    def _store_buffer(self):
+        """Write the collected output steps, on the writer thread if the ParticleFile is asynchronous."""
+        if len(self._buffer) == 0:
+            return
+        buffer, self._buffer = self._buffer, _WriteBuffer()
+        if not self._asynchronous:
+            self._write_buffer(buffer, self._maxids)
+            return
+        self._wait_pending_writes(self._max_pending_writes - 1)
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="parcels-output")
+        self._pending_writes.append(self._writer.submit(self._write_buffer, buffer, self._maxids))
+
+    def _wait_pending_writes(self, max_pending=0):
+        """Wait until at most max_pending writes are pending on the writer thread.
+
+        The error of a failed write is raised, after the writes that were queued after it are cancelled.
+        """
+        try:
+            while self._pending_writes and (self._pending_writes[0].done() or len(self._pending_writes) > max_pending):
+                self._pending_writes[0].result()
+                self._pending_writes.popleft()
+        except BaseException:
+            for future in self._pending_writes:
+                future.cancel()
+            self._pending_writes.clear()
+            raise
+
+    def flush(self):
+        """Write the output steps that are collected in memory (see buffer_obs) to the store,
+        and wait until all writes of the background thread (see asynchronous) are finished.
+        """
+        self._store_buffer()
+        self._wait_pending_writes()
+
+    def close(self):
+        """Write all output to the store, and stop the background thread."""
+        try:
+            self.flush()
+        finally:
+            if self._writer is not None:
+                self._writer.shutdown(wait=True)
+                self._writer = None
+
     def write(self, pset, time: float | timedelta | np.timedelta64 | None, indices=None):
         """Write all data from one time step to the zarr file,
         before the particle locations are updated.
@@ -276,7 +696,7 @@ class ParticleFile:
         """
         time = timedelta_to_float(time) if time is not None else None
 
-        if pset.particledata._ncount == 0:
+        if pset.particledata._nalive == 0:
             warnings.warn(
                 f"ParticleSet is empty on writing as array at time {time:g}",
                 RuntimeWarning,
@@ -293,10 +713,7 @@ class ParticleFile:
             return
 
         pids = pset.particledata.getvardata("id", indices_to_write)
-        to_add = sorted(set(pids) - set(self._pids_written.keys()))
-        for i, pid in enumerate(to_add):
-            self._pids_written[pid] = self._maxids + i
-        ids = np.array([self._pids_written[p] for p in pids], dtype=int)
+        ids = self._pids_written.rows(pids)
         self._maxids = len(self._pids_written)
 
         once_ids = np.where(pset.particledata.getvardata("obs_written", indices_to_write) == 0)[0]
@@ -319,10 +736,11 @@ class ParticleFile:
                 arrsize = (self._maxids, self.chunks[1])  # type: ignore[index]
             else:
                 arrsize = (len(ids), self.chunks[1])  # type: ignore[index]
-            ds = xr.Dataset(
-                attrs=self.metadata,
-                coords={"trajectory": ("trajectory", pids), "obs": ("obs", np.arange(arrsize[1], dtype=np.int32))},
-            )
+            coords = {"trajectory": ("trajectory", pids)}
+            if self._layout == "dense":
+                coords["obs"] = ("obs", np.arange(arrsize[1], dtype=np.int32))
+            ds = xr.Dataset(attrs=self.metadata, coords=coords)
+            ds["trajectory"].encoding.update(self._var_encodings.get("id", {}))
             attrs = self._create_variables_attribute_dict()
             obs = np.zeros((self._maxids), dtype=np.int32)
             for var in self.vars_to_write:
@@ -336,6 +754,9 @@ class ParticleFile:
                         )
                         data[ids_once] = pset.particledata.getvardata(var, indices_to_write_once)
                         dims = ["trajectory"]
+                    elif self._layout == "ragged":
+                        data = pset.particledata.getvardata(var, indices_to_write)
+                        dims = ["obs"]
                     else:
                         data = np.full(
                             arrsize, self._fill_value_map[self.vars_to_write[var]], dtype=self.vars_to_write[var]
@@ -343,28 +764,36 @@ class ParticleFile:
                         data[ids, 0] = pset.particledata.getvardata(var, indices_to_write)
                         dims = ["trajectory", "obs"]
                     ds[varout] = xr.DataArray(data=data, dims=dims, attrs=attrs[varout])
-                    ds[varout].encoding["chunks"] = self.chunks[0] if self._write_once(var) else self.chunks  # type: ignore[index]
+                    ds[varout].encoding["chunks"] = self._var_chunks(var)
+                    ds[varout].encoding.update(self._var_encodings.get(var, {}))
+            if self._layout == "ragged":
+                ds["trajectory_index"] = xr.DataArray(data=ids, dims=["obs"], attrs=attrs["trajectory_index"])
+                ds["trajectory_index"].encoding["chunks"] = self._var_chunks("trajectory_index")
+                ds["rowSize"] = xr.DataArray(
+                    data=np.ones(arrsize[0], dtype=np.int32), dims=["trajectory"], attrs=attrs["rowSize"]
+                )
+                ds["rowSize"].encoding["chunks"] = self._var_chunks("rowSize")
             ds.to_zarr(self.fname, mode="w")
             self._create_new_zarrfile = False
+            self._nobs_stored = 1
         else:
-            # Either use the store that was provided directly or create a DirectoryStore:
-            if isinstance(self.fname, zarr.storage.Store):
-                store = self.fname
-            else:
-                store = zarr.DirectoryStore(self.fname)
-            Z = zarr.group(store=store, overwrite=False)
             obs = pset.particledata.getvardata("obs_written", indices_to_write)
+            step_data, step_data_once = {}, {}
             for var in self.vars_to_write:
-                varout = self._convert_varout_name(var)
-                if self._maxids > Z[varout].shape[0]:
-                    self._extend_zarr_dims(Z[varout], store, dtype=self.vars_to_write[var], axis=0)
                 if self._write_once(var):
                     if len(once_ids) > 0:
-                        Z[varout].vindex[ids_once] = pset.particledata.getvardata(var, indices_to_write_once)
+                        step_data_once[var] = pset.particledata.getvardata(var, indices_to_write_once)
                 else:
-                    if max(obs) >= Z[varout].shape[1]:  # type: ignore[type-var]
-                        self._extend_zarr_dims(Z[varout], store, dtype=self.vars_to_write[var], axis=1)
-                    Z[varout].vindex[ids, obs] = pset.particledata.getvardata(var, indices_to_write)
+                    step_data[var] = pset.particledata.getvardata(var, indices_to_write)
+            self._buffer.add(ids, obs, step_data, ids_once if len(once_ids) > 0 else ids[:0], step_data_once)
+            if (
+                self._buffer_obs is None
+                or len(self._buffer) >= self._buffer_obs
+                or self._buffer.nbytes > self._max_buffer_size * 1024**2
+            ):
+                self._store_buffer()
+            else:
+                self._wait_pending_writes(self._max_pending_writes)  # only raises errors of finished writes
 
         pset.particledata.setvardata("obs_written", indices_to_write, obs + 1)
 
@@ -384,3 +813,68 @@ class ParticleFile:
             pset.particledata.setallvardata(f"{var}", pset.particledata.getvardata(f"{var}_nextloop"))
 
         self.write(pset, time)
+
+
+class RaggedTrajectories:
+    """Per-trajectory views on the output of a :class:`ParticleFile` with layout="ragged".
+
+    Only the ``trajectory_index`` of the observations is read when the trajectories are opened.
+    The data of a trajectory is read when the Variables of its view are accessed.
+
+    Parameters
+    ----------
+    store : str or zarr store
+        The output of the ParticleFile
+    **kwargs :
+        Keyword arguments passed to :func:`xarray.open_zarr`
+    """
+
+    def __init__(self, store, **kwargs):
+        self.ds = xr.open_zarr(store, **kwargs)
+        if self.ds.attrs.get("parcels_layout") != "ragged":
+            raise ValueError(f"{store} is not a ParticleFile output with the ragged layout")
+        index = self.ds["trajectory_index"].values
+        # the observations grouped by trajectory, in the order of writing within each trajectory
+        self._order = np.argsort(index, kind="stable")
+        self._row_size = np.bincount(index, minlength=self.ds.sizes["trajectory"])
+        self._start = np.concatenate(([0], np.cumsum(self._row_size)))
+
+    def __len__(self):
+        return self.ds.sizes["trajectory"]
+
+    def __getitem__(self, i):
+        """The observations of the i-th trajectory (in order of writing), as a lazy xarray Dataset."""
+        if not -len(self) <= i < len(self):
+            raise IndexError(f"Trajectory index {i} is out of range for {len(self)} trajectories")
+        i = i % len(self)
+        return self.ds.isel(trajectory=i, obs=self._order[self._start[i] : self._start[i + 1]])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_dense(self):
+        """All trajectories (loaded in memory) in the (trajectory, obs) layout of ParticleFile.
+
+        The observations after the last observation of each trajectory are NaN (or NaT, or the _FillValue of
+        integer Variables).
+        """
+        ds = self.ds.drop_vars(["trajectory_index", "rowSize"])
+        index = self.ds["trajectory_index"].values[self._order]
+        obs = np.arange(len(index)) - self._start[index]
+        dense = xr.Dataset(coords={"trajectory": ds["trajectory"], "obs": np.arange(self._row_size.max(initial=0))})
+        dense.attrs = {k: v for k, v in ds.attrs.items() if k != "parcels_layout"}
+        for name, var in ds.data_vars.items():
+            if "obs" not in var.dims:
+                dense[name] = var
+                continue
+            if var.dtype.kind == "f":
+                fill_value = np.nan
+            elif var.dtype.kind in "mM":
+                fill_value = np.array("NaT", dtype=var.dtype)
+            else:
+                fill_value = var.encoding.get("_FillValue", 0)
+            data = np.full((len(self), len(dense["obs"])), fill_value, dtype=var.dtype)
+            data[index, obs] = var.values[self._order]
+            dense[name] = xr.DataArray(data, dims=["trajectory", "obs"], attrs=var.attrs)
+        return dense
@@ -1,3 +1,4 @@
+import contextlib
 import os
 import sys
 import warnings
@@ -8,7 +9,6 @@ from datetime import date, datetime, timedelta
 import cftime
 import numpy as np
 import xarray as xr
-from scipy.spatial import KDTree
 from tqdm import tqdm
 
 from parcels._compat import MPI
@@ -25,14 +25,14 @@ from parcels.interaction.neighborsearch import (
 )
 from parcels.kernel import Kernel
 from parcels.particle import JITParticle, Variable
-from parcels.particledata import ParticleData, ParticleDataIterator
+from parcels.particledata import _TOMBSTONE, ParticleData, ParticleDataIterator
 from parcels.particlefile import ParticleFile
 from parcels.tools._helpers import deprecated, deprecated_made_private, particleset_repr, timedelta_to_float
 from parcels.tools.converters import _get_cftime_calendars, convert_to_flat_array
 from parcels.tools.global_statics import get_package_dir
 from parcels.tools.loggers import logger
 from parcels.tools.statuscodes import StatusCode
-from parcels.tools.warnings import ParticleSetWarning
+from parcels.tools.warnings import KernelWarning, ParticleSetWarning
 
 __all__ = ["ParticleSet"]
 
@@ -132,7 +132,7 @@ class ParticleSet:
                 self.ngrids = type(self).ngrids.initial
                 if self.ngrids >= 0:
                     for index in ["xi", "yi", "zi", "ti"]:
-                        if index != "ti":
+                        if index == "zi":
                             setattr(self, index, np.zeros(self.ngrids, dtype=np.int32))
                         else:
                             setattr(self, index, -1 * np.ones(self.ngrids, dtype=np.int32))
@@ -140,8 +140,8 @@ class ParticleSet:
 
             array_class_vdict = {
                 "ngrids": Variable("ngrids", dtype=np.int32, to_write=False, initial=-1),
-                "xi": Variable("xi", dtype=np.int32, to_write=False),
-                "yi": Variable("yi", dtype=np.int32, to_write=False),
+                "xi": Variable("xi", dtype=np.int32, to_write=False, initial=-1),
+                "yi": Variable("yi", dtype=np.int32, to_write=False, initial=-1),
                 "zi": Variable("zi", dtype=np.int32, to_write=False),
                 "ti": Variable("ti", dtype=np.int32, to_write=False, initial=-1),
                 "__init__": ArrayClass_init,
@@ -515,25 +515,16 @@ class ParticleSet:
 
     # TODO: This method is only tested in tutorial notebook. Add unit test?
     def populate_indices(self):
-        """Pre-populate guesses of particle xi/yi indices using a kdtree.
+        """Pre-populate guesses of particle xi/yi indices using the search index of the grids.
 
         This is only intended for curvilinear grids, where the initial index search
-        may be quite expensive.
+        may be quite expensive. See :attr:`parcels.grid.CurvilinearGrid.search_index`.
         """
         for i, grid in enumerate(self.fieldset.gridset.grids):
             if not isinstance(grid, CurvilinearGrid):
                 continue
 
-            tree_data = np.stack((grid.lon.flat, grid.lat.flat), axis=-1)
-            IN = np.all(~np.isnan(tree_data), axis=1)
-            tree = KDTree(tree_data[IN, :])
-            # stack all the particle positions for a single query
-            pts = np.stack((self.particledata.data["lon"], self.particledata.data["lat"]), axis=-1)
-            # query datatype needs to match tree datatype
-            _, idx_nan = tree.query(pts.astype(tree_data.dtype))
-
-            idx = np.where(IN)[0][idx_nan]
-            yi, xi = np.unravel_index(idx, grid.lon.shape)
+            yi, xi = grid.search_index.guess(self.particledata.data["lon"], self.particledata.data["lat"])
 
             self.particledata.data["xi"][:, i] = xi
             self.particledata.data["yi"][:, i] = yi
@@ -953,7 +944,7 @@ class ParticleSet:
         iterator
             ParticleDataIterator over error particles.
         """
-        error_indices = self.data_indices("state", [StatusCode.Success, StatusCode.Evaluate], invert=True)
+        error_indices = self.data_indices("state", [StatusCode.Success, StatusCode.Evaluate, _TOMBSTONE], invert=True)
         return ParticleDataIterator(self.particledata, subset=error_indices)
 
     @property
@@ -970,7 +961,9 @@ class ParticleSet:
         int
             Number of error particles.
         """
-        return np.sum(np.isin(self.particledata.data["state"], [StatusCode.Success, StatusCode.Evaluate], invert=True))
+        return np.sum(
+            np.isin(self.particledata.data["state"], [StatusCode.Success, StatusCode.Evaluate, _TOMBSTONE], invert=True)
+        )
 
     def set_variable_write_status(self, var, write_status):
         """Method to set the write status of a Variable.
@@ -996,6 +989,8 @@ class ParticleSet:
         postIterationCallbacks=None,
         callbackdt: float | timedelta | np.timedelta64 | None = None,
         delete_cfiles: bool = True,
+        nthreads: int | None = None,
+        vectorized: bool = False,
     ):
         """Execute a given kernel function over the particle set for multiple timesteps.
 
@@ -1030,6 +1025,16 @@ class ParticleSet:
             (Default value = None)
         delete_cfiles : bool
             Whether to delete the C-files after compilation in JIT mode (default is True)
+        nthreads : int
+            Number of OpenMP threads over which the particle loop is distributed in JIT mode.
+            The kernel is then compiled with ``-fopenmp``, and random numbers are drawn from
+            a per-particle stream so that results do not depend on the number of threads.
+            Ignored in Scipy mode. (Default value = None, i.e. a serial particle loop)
+        vectorized : bool
+            Whether to execute the kernel in Scipy mode on arrays of all particles at once, instead of
+            particle by particle. Kernels can then not branch per particle (e.g. with ``if`` statements),
+            and Kernels that do fall back to particle-by-particle execution with a warning.
+            Only available in Scipy mode. (Default value = False)
 
         Notes
         -----
@@ -1039,21 +1044,46 @@ class ParticleSet:
         if len(self) == 0:
             return
 
-        # check if pyfunc has changed since last compile. If so, recompile
-        if self._kernel is None or (self._kernel.pyfunc is not pyfunc and self._kernel is not pyfunc):
+        if nthreads is not None and nthreads < 1:
+            raise ValueError(f"nthreads should be a positive integer, got {nthreads}")
+        if vectorized and self.particledata.ptype.uses_jit:
+            raise ValueError("Vectorized execution is only available for ScipyParticles")
+
+        # check if pyfunc (or the threading mode) has changed since last compile. If so, recompile
+        if (
+            self._kernel is None
+            or (self._kernel.pyfunc is not pyfunc and self._kernel is not pyfunc)
+            or (self.particledata.ptype.uses_jit and (self._kernel.nthreads is None) != (nthreads is None))
+        ):
             # Generate and store Kernel
             if isinstance(pyfunc, Kernel):
                 self._kernel = pyfunc
-            else:
+            elif self._kernel is None or self._kernel.pyfunc is not pyfunc:
                 self._kernel = self.Kernel(pyfunc, delete_cfiles=delete_cfiles)
             # Prepare JIT kernel execution
             if self.particledata.ptype.uses_jit:
                 self._kernel.remove_lib()
-                cppargs = ["-DDOUBLE_COORD_VARIABLES"] if self.particledata.lonlatdepth_dtype else None
+                cppargs = ["-DDOUBLE_COORD_VARIABLES"] if self.particledata.lonlatdepth_dtype else []
+                ldargs = []
+                if nthreads is not None:
+                    cppargs += ["-fopenmp"]
+                    ldargs += ["-fopenmp"]
                 self._kernel.compile(
-                    compiler=GNUCompiler(cppargs=cppargs, incdirs=[os.path.join(get_package_dir(), "include"), "."])
+                    compiler=GNUCompiler(
+                        cppargs=cppargs, ldargs=ldargs, incdirs=[os.path.join(get_package_dir(), "include"), "."]
+                    )
                 )
                 self._kernel.load_lib()
+        if self.particledata.ptype.uses_jit:
+            self._kernel.nthreads = nthreads
+        elif vectorized and not self._kernel.vectorizable:
+            warnings.warn(
+                f"Kernel {self._kernel.funcname} branches per particle and can not be vectorized; "
+                "executing it particle by particle instead.",
+                KernelWarning,
+                stacklevel=2,
+            )
+        self._kernel.vectorized = vectorized
         if output_file:
             output_file.metadata["parcels_kernels"] = self._kernel.name
 
@@ -1157,97 +1187,117 @@ class ParticleSet:
         tol = 1e-12
         time = starttime
 
-        while (time < endtime and dt > 0) or (time > endtime and dt < 0):
-            # Check if we can fast-forward to the next time needed for the particles
-            if dt > 0:
-                skip_kernel = True if min(self.time) > (time + dt) else False
-            else:
-                skip_kernel = True if max(self.time) < (time + dt) else False
-
-            time_at_startofloop = time
-
-            next_input = self.fieldset.computeTimeChunk(time, dt)
+        # Particles that are deleted during the time loop are only marked as deleted, and the storage is
+        # compacted when too many have accumulated (or at the end of the loop), instead of at every deletion.
+        # The interaction kernels search neighbours over the full storage, so there particles are removed directly.
+        self.particledata._defer_deletion = self._interaction_kernel is None
+        execution_failed = False
+        try:
+            while (time < endtime and dt > 0) or (time > endtime and dt < 0):
+                # Check if we can fast-forward to the next time needed for the particles
+                if dt > 0:
+                    skip_kernel = True if min(self.time) > (time + dt) else False
+                else:
+                    skip_kernel = True if max(self.time) < (time + dt) else False
 
-            # Define next_time (the timestamp when the execution needs to be handed back to python)
-            if dt > 0:
-                next_time = min(next_prelease, next_input, next_output, next_callback, endtime)
-            else:
-                next_time = max(next_prelease, next_input, next_output, next_callback, endtime)
-
-            # If we don't perform interaction, only execute the normal kernel efficiently.
-            if self._interaction_kernel is None:
-                if not skip_kernel:
-                    res = self._kernel.execute(self, endtime=next_time, dt=dt)
-                    if res == StatusCode.StopAllExecution:
-                        return StatusCode.StopAllExecution
-            # Interaction: interleave the interaction and non-interaction kernel for each time step.
-            # E.g. Normal -> Inter -> Normal -> Inter if endtime-time == 2*dt
-            else:
-                cur_time = time
-                while (cur_time < next_time and dt > 0) or (cur_time > next_time and dt < 0):
-                    if dt > 0:
-                        cur_end_time = min(cur_time + dt, next_time)
-                    else:
-                        cur_end_time = max(cur_time + dt, next_time)
-                    self._kernel.execute(self, endtime=cur_end_time, dt=dt)
-                    self._interaction_kernel.execute(self, endtime=cur_end_time, dt=dt)
-                    cur_time += dt
-            # End of interaction specific code
-            time = next_time
-
-            # Check for empty ParticleSet
-            if np.isinf(next_prelease) and len(self) == 0:
-                return StatusCode.StopAllExecution
-
-            if abs(time - next_output) < tol:
-                for fld in self.fieldset.get_fields():
-                    if hasattr(fld, "to_write") and fld.to_write:
-                        if fld.grid.tdim > 1:
-                            raise RuntimeError(
-                                "Field writing during execution only works for Fields with one snapshot in time"
-                            )
-                        fldfilename = str(output_file.fname).replace(".zarr", f"_{fld.to_write:04d}")
-                        fld.write(fldfilename)
-                        fld.to_write += 1
-
-            if abs(time - next_output) < tol:
-                if output_file:
-                    if output_file._is_analytical:  # output analytical solution at later time
-                        output_file.write_latest_locations(self, time)
-                    else:
-                        output_file.write(self, time_at_startofloop)
-                if np.isfinite(outputdt):
-                    next_output += outputdt * np.sign(dt)
-
-            # ==== insert post-process here to also allow for memory clean-up via external func ==== #
-            if abs(time - next_callback) < tol:
-                if postIterationCallbacks is not None:
-                    for extFunc in postIterationCallbacks:
-                        extFunc()
-                next_callback += callbackdt * np.sign(dt)
-
-            if abs(time - next_prelease) < tol:
-                pset_new = self.__class__(
-                    fieldset=self.fieldset,
-                    time=time,
-                    lon=self._repeatlon,
-                    lat=self._repeatlat,
-                    depth=self._repeatdepth,
-                    pclass=self._repeatpclass,
-                    lonlatdepth_dtype=self.particledata.lonlatdepth_dtype,
-                    partition_function=False,
-                    pid_orig=self._repeatpid,
-                    **self._repeatkwargs,
-                )
-                for p in pset_new:
-                    p.dt = dt
-                self.add(pset_new)
-                next_prelease += self.repeatdt * np.sign(dt)
+                time_at_startofloop = time
 
-            if time != endtime:
+                self.fieldset._update_subset_windows(self)
                 next_input = self.fieldset.computeTimeChunk(time, dt)
-            if verbose_progress:
-                pbar.update(abs(time - time_at_startofloop))
+
+                # Define next_time (the timestamp when the execution needs to be handed back to python)
+                if dt > 0:
+                    next_time = min(next_prelease, next_input, next_output, next_callback, endtime)
+                else:
+                    next_time = max(next_prelease, next_input, next_output, next_callback, endtime)
+
+                # If we don't perform interaction, only execute the normal kernel efficiently.
+                if self._interaction_kernel is None:
+                    if not skip_kernel:
+                        res = self._kernel.execute(self, endtime=next_time, dt=dt)
+                        if res == StatusCode.StopAllExecution:
+                            return StatusCode.StopAllExecution
+                # Interaction: interleave the interaction and non-interaction kernel for each time step.
+                # E.g. Normal -> Inter -> Normal -> Inter if endtime-time == 2*dt
+                else:
+                    cur_time = time
+                    while (cur_time < next_time and dt > 0) or (cur_time > next_time and dt < 0):
+                        if dt > 0:
+                            cur_end_time = min(cur_time + dt, next_time)
+                        else:
+                            cur_end_time = max(cur_time + dt, next_time)
+                        self._kernel.execute(self, endtime=cur_end_time, dt=dt)
+                        self._interaction_kernel.execute(self, endtime=cur_end_time, dt=dt)
+                        cur_time += dt
+                # End of interaction specific code
+                time = next_time
+
+                # Check for empty ParticleSet
+                if np.isinf(next_prelease) and self.particledata._nalive == 0:
+                    return StatusCode.StopAllExecution
+
+                if abs(time - next_output) < tol:
+                    for fld in self.fieldset.get_fields():
+                        if hasattr(fld, "to_write") and fld.to_write:
+                            if fld.grid.tdim > 1:
+                                raise RuntimeError(
+                                    "Field writing during execution only works for Fields with one snapshot in time"
+                                )
+                            fldfilename = str(output_file.fname).replace(".zarr", f"_{fld.to_write:04d}")
+                            fld.write(fldfilename)
+                            fld.to_write += 1
+
+                if abs(time - next_output) < tol:
+                    if output_file:
+                        if output_file._is_analytical:  # output analytical solution at later time
+                            output_file.write_latest_locations(self, time)
+                        else:
+                            output_file.write(self, time_at_startofloop)
+                    if np.isfinite(outputdt):
+                        next_output += outputdt * np.sign(dt)
+
+                # ==== insert post-process here to also allow for memory clean-up via external func ==== #
+                if abs(time - next_callback) < tol:
+                    if postIterationCallbacks is not None:
+                        self.particledata._compact()
+                        for extFunc in postIterationCallbacks:
+                            extFunc()
+                    next_callback += callbackdt * np.sign(dt)
+
+                if abs(time - next_prelease) < tol:
+                    pset_new = self.__class__(
+                        fieldset=self.fieldset,
+                        time=time,
+                        lon=self._repeatlon,
+                        lat=self._repeatlat,
+                        depth=self._repeatdepth,
+                        pclass=self._repeatpclass,
+                        lonlatdepth_dtype=self.particledata.lonlatdepth_dtype,
+                        partition_function=False,
+                        pid_orig=self._repeatpid,
+                        **self._repeatkwargs,
+                    )
+                    for p in pset_new:
+                        p.dt = dt
+                    self.add(pset_new)
+                    next_prelease += self.repeatdt * np.sign(dt)
+
+                if time != endtime:
+                    next_input = self.fieldset.computeTimeChunk(time, dt)
+                if verbose_progress:
+                    pbar.update(abs(time - time_at_startofloop))
+        except BaseException:
+            execution_failed = True
+            raise
+        finally:
+            self.particledata._defer_deletion = False
+            self.particledata._compact()
+            # the output that is still in memory or on the writer thread
+            if output_file and not execution_failed:
+                output_file.flush()
+            elif output_file:
+                with contextlib.suppress(Exception):  # the error of the execution is raised, not that of the output
+                    output_file.flush()
 
         if verbose_progress:
             pbar.close()
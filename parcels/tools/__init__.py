@@ -1,3 +1,4 @@
+from .chunkmemory import *
 from .converters import *
 from .exampledata_utils import *
 from .global_statics import *
@@ -0,0 +1,126 @@
+"""Memory budget for the chunks of Fields that are loaded for JIT execution."""
+
+import os
+import weakref
+
+import dask.array as da
+import numpy as np
+
+__all__ = ["get_chunk_memory_stats", "set_chunk_memory_budget"]
+
+
+class _ChunkMemory:
+    """Book-keeping of the loaded chunks of all Fields with a chunksize in this process.
+
+    When the chunks exceed the budget after they are loaded for a JIT execution, the least recently
+    used chunks (that were not touched in this execution yet) are evicted. Evicted chunks are reloaded
+    on request, like chunks that were never loaded.
+    """
+
+    def __init__(self):
+        max_size = os.environ.get("PARCELS_CHUNK_MEMORY_BUDGET")
+        self.max_size = None if max_size is None else float(max_size) * 1024**2
+        self.evictions = 0
+        self.reloads = 0
+        self._fields = weakref.WeakSet()
+        self._tick = 0
+
+    def register(self, field):
+        if isinstance(field.data, da.core.Array):
+            self._fields.add(field)
+
+    def _chunked_fields(self):
+        return [f for f in list(self._fields) if f._chunk_set and isinstance(f.data, da.core.Array)]
+
+    def resident_size(self):
+        return sum(c.nbytes for f in self._chunked_fields() for c in f._data_chunks if c is not None)
+
+    def touch(self, grids):
+        """Mark the chunks that were loaded or touched in the last JIT execution as most recently used."""
+        self._tick += 1
+        for g in grids:
+            if len(g._chunk_last_used) == len(g._load_chunk):
+                g._chunk_last_used[g._load_chunk == g._chunk_loaded_touched] = self._tick
+
+    def enforce(self, grids):
+        """Evict the least recently used chunks until the loaded chunks fit in the budget.
+
+        On the grids of the current execution, only chunks that were not touched since its start are evicted,
+        as the particles that are repeated after a chunk was requested may need the other chunks that they
+        touched before. So the budget can be exceeded when the chunks that are needed in one execution do not
+        fit in it.
+        """
+        if self.max_size is None:
+            return
+        fields = self._chunked_fields()
+        loaded_grids, sizes = {}, {}
+        for f in fields:
+            g = f.grid
+            loaded_grids[id(g)] = g
+            nbytes = np.array([0 if c is None else c.nbytes for c in f._data_chunks])
+            sizes[id(g)] = sizes.get(id(g), 0) + nbytes
+        total = sum(int(s.sum()) for s in sizes.values())
+        if total <= self.max_size:
+            return
+
+        active = {id(g) for g in grids}
+        candidates = []
+        for gid, g in loaded_grids.items():
+            if len(g._chunk_last_used) != len(g._load_chunk):
+                continue
+            evictable = [g._chunk_deprecated] if gid in active else g._chunk_loaded
+            loaded = np.flatnonzero(np.isin(g._load_chunk, evictable) & (sizes[gid] > 0))
+            candidates += [(g._chunk_last_used[b], gid, b) for b in loaded]
+        for _, gid, block_id in sorted(candidates, key=lambda c: c[0]):
+            if total <= self.max_size:
+                break
+            g = loaded_grids[gid]
+            g._load_chunk[block_id] = g._chunk_not_loaded
+            for f in fields:
+                if f.grid is g and f._data_chunks[block_id] is not None:
+                    f._data_chunks[block_id] = None
+                    f._c_data_chunks[block_id] = None
+                    f._stale_time_slots[block_id] = -1
+                    f._chunk_evicted[block_id] = True
+                    self.evictions += 1
+            total -= int(sizes[gid][block_id])
+
+
+_chunk_memory = _ChunkMemory()
+
+
+def set_chunk_memory_budget(max_size):
+    """Set the maximum memory that the loaded chunks of Fields with a chunksize can use in JIT mode.
+
+    When the loaded chunks (of all Fields and FieldSets in this process) exceed the budget, the least
+    recently used chunks are evicted before the next execution of a kernel, and loaded again when particles
+    reach them. Chunks that particles touched in the current execution are always kept, so the budget is a
+    soft limit.
+
+    The default budget is the ``PARCELS_CHUNK_MEMORY_BUDGET`` environment variable (in MB), or otherwise
+    unlimited.
+
+    Parameters
+    ----------
+    max_size : float
+        Maximum memory in MB of the loaded chunks. Use None for an unlimited budget.
+    """
+    _chunk_memory.max_size = None if max_size is None else max_size * 1024**2
+
+
+def get_chunk_memory_stats():
+    """Statistics of the loaded chunks of Fields with a chunksize, see :func:`set_chunk_memory_budget`.
+
+    Returns
+    -------
+    dict
+        With the memory budget (``max_size``, in bytes, or None) and the memory that the loaded chunks use
+        (``resident_size``, in bytes). Also the number of chunks that were evicted (``evictions``) and that were
+        loaded again after having been evicted (``reloads``), since the start of the process.
+    """
+    return {
+        "max_size": _chunk_memory.max_size,
+        "resident_size": _chunk_memory.resident_size(),
+        "evictions": _chunk_memory.evictions,
+        "reloads": _chunk_memory.reloads,
+    }
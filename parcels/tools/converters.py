@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import inspect
 from datetime import timedelta
-from math import cos, pi
 
 import cftime
 import numpy as np
@@ -207,10 +206,10 @@ class GeographicPolar(UnitConverter):
     target_unit = "degree"
 
     def to_target(self, value, z, y, x):
-        return value / 1000.0 / 1.852 / 60.0 / cos(y * pi / 180)
+        return value / 1000.0 / 1.852 / 60.0 / np.cos(y * np.pi / 180)
 
     def to_source(self, value, z, y, x):
-        return value * 1000.0 * 1.852 * 60.0 * cos(y * pi / 180)
+        return value * 1000.0 * 1.852 * 60.0 * np.cos(y * np.pi / 180)
 
     def ccode_to_target(self, z, y, x):
         return f"(1.0 / (1000. * 1.852 * 60. * cos({y} * M_PI / 180)))"
@@ -247,10 +246,10 @@ class GeographicPolarSquare(UnitConverter):
     target_unit = "degree2"
 
     def to_target(self, value, z, y, x):
-        return value / pow(1000.0 * 1.852 * 60.0 * cos(y * pi / 180), 2)
+        return value / pow(1000.0 * 1.852 * 60.0 * np.cos(y * np.pi / 180), 2)
 
     def to_source(self, value, z, y, x):
-        return value * pow(1000.0 * 1.852 * 60.0 * cos(y * pi / 180), 2)
+        return value * pow(1000.0 * 1.852 * 60.0 * np.cos(y * np.pi / 180), 2)
 
     def ccode_to_target(self, z, y, x):
         return f"pow(1.0 / (1000. * 1.852 * 60. * cos({y} * M_PI / 180)), 2)"
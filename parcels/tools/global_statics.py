@@ -5,6 +5,8 @@ from pathlib import Path
 from tempfile import gettempdir
 from typing import Literal
 
+import platformdirs
+
 USER_ID: int | Literal["tmp"]
 try:
     from os import getuid
@@ -15,7 +17,14 @@ except:
     USER_ID = "tmp"
 
 
-__all__ = ["cleanup_remove_files", "cleanup_unload_lib", "get_cache_dir", "get_package_dir"]
+__all__ = [
+    "cleanup_remove_files",
+    "cleanup_unload_lib",
+    "get_cache_dir",
+    "get_kernel_cache_dir",
+    "get_metadata_index_dir",
+    "get_package_dir",
+]
 
 
 def cleanup_remove_files(lib_file, log_file):
@@ -40,3 +49,29 @@ def get_cache_dir():
     directory = os.path.join(gettempdir(), f"parcels-{USER_ID}")
     Path(directory).mkdir(exist_ok=True)
     return directory
+
+
+def get_kernel_cache_dir():
+    """Return the directory in which compiled kernel libraries are cached between runs.
+
+    Uses the directory specified by the ``PARCELS_KERNEL_CACHE`` environment variable (if it exists)
+    or otherwise defaults to a ``kernels`` folder in an OS-appropriate user cache location.
+    """
+    directory = os.environ.get("PARCELS_KERNEL_CACHE", os.path.join(platformdirs.user_cache_dir("parcels"), "kernels"))
+    directory = os.path.expanduser(directory)
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def get_metadata_index_dir():
+    """Return the directory in which the indices of the time stamps of data files are stored between runs.
+
+    Uses the directory specified by the ``PARCELS_METADATA_INDEX`` environment variable (if it exists)
+    or otherwise defaults to a ``metadata`` folder in an OS-appropriate user cache location.
+    """
+    directory = os.environ.get(
+        "PARCELS_METADATA_INDEX", os.path.join(platformdirs.user_cache_dir("parcels"), "metadata")
+    )
+    directory = os.path.expanduser(directory)
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    return directory
@@ -1,7 +1,9 @@
 import datetime
 import gc
+import json
 import os
 import sys
+import threading
 from datetime import timedelta
 
 import dask
@@ -21,16 +23,23 @@ from parcels import (
     ScipyParticle,
     TimeExtrapolationError,
     Variable,
+    get_chunk_memory_stats,
+    set_chunk_memory_budget,
 )
-from parcels.field import Field, VectorField
-from parcels.fieldfilebuffer import DaskFileBuffer
+from parcels._file_pool import _FilePool
+from parcels._snapshot_cache import _SnapshotCache
+from parcels._subset_window import _SubsetWindow
+from parcels.field import Field, VectorField, _chunk_lookup_table
+from parcels.fieldfilebuffer import DaskFileBuffer, NetcdfFileBuffer, ZarrFileBuffer, _netcdf_lock
+from parcels.kernel import Kernel
 from parcels.tools.converters import (
     GeographicPolar,
     TimeConverter,
     UnitConverter,
 )
+from parcels.tools.warnings import FileWarning
 from tests.common_kernels import DoNothing
-from tests.utils import TEST_DATA
+from tests.utils import TEST_DATA, create_uv_snapshot_files
 
 ptype = {"scipy": ScipyParticle, "jit": JITParticle}
 
@@ -728,6 +737,738 @@ def test_from_netcdf_chunking(mode, time_periodic, chunksize, deferLoad):
     pset.execute(AdvectionRK4, dt=1, runtime=1)
 
 
+def test_chunk_lookup_table():
+    assert _chunk_lookup_table((3, 2)) == [5, 0, 0, 0, 1, 0, 2, 1, 0, 1, 1]
+    assert _chunk_lookup_table((4,)) == [4, 0, 0, 0, 1, 0, 2, 0, 3]
+
+
+@pytest.mark.parametrize("mode", ["scipy", "jit"])
+def test_sampling_uneven_chunks(mode, tmpdir):
+    xdim, ydim = 50, 40
+    lon = np.linspace(0.0, 49.0, xdim, dtype=np.float32)
+    lat = np.linspace(0.0, 39.0, ydim, dtype=np.float32)
+    P = (lon[None, :] + 100 * lat[:, None]).astype(np.float32)
+    data = {"U": np.zeros((ydim, xdim), dtype=np.float32), "V": np.zeros((ydim, xdim), dtype=np.float32), "P": P}
+    filepath = tmpdir.join("test_uneven_chunks")
+    FieldSet.from_data(data, {"lon": lon, "lat": lat}, mesh="flat").write(filepath)
+
+    files = {v: filepath + f"{v}.nc" for v in ["U", "V", "P"]}
+    variables = {"U": "vozocrtx", "V": "vomecrty", "P": "P"}
+    dimensions = {"lon": "nav_lon", "lat": "nav_lat"}
+    fieldset = FieldSet.from_netcdf(
+        files, variables, dimensions, mesh="flat", chunksize={"lat": ("y", 7), "lon": ("x", 9)}
+    )
+
+    def SampleP(particle, fieldset, time):  # pragma: no cover
+        particle.p = fieldset.P[time, particle.depth, particle.lat, particle.lon]
+
+    MyParticle = ptype[mode].add_variable("p", dtype=np.float32, initial=0.0)
+    plon, plat = np.meshgrid(np.linspace(0.5, 48.5, 17), np.linspace(0.5, 38.5, 13))
+    pset = ParticleSet(fieldset, MyParticle, lon=plon.flatten(), lat=plat.flatten())
+    pset.execute(SampleP, runtime=1, dt=1)
+    if mode == "jit":
+        assert fieldset.P.grid.chunk_info[:3] == [2, 6, 6]
+    assert np.allclose(pset.p, pset.lon + 100 * pset.lat, rtol=1e-5)
+
+
+def test_prefetch_chunks(tmpdir, monkeypatch):
+    lon = np.linspace(0, 30, 300, dtype=np.float32)
+    lat = np.linspace(0, 20, 200, dtype=np.float32)
+    data = {
+        "U": 0.5 * np.ones((lat.size, lon.size), dtype=np.float32),
+        "V": 0.2 * np.ones((lat.size, lon.size), dtype=np.float32),
+    }
+    filepath = tmpdir.join("test_prefetch")
+    FieldSet.from_data(data, {"lon": lon, "lat": lat}, mesh="spherical").write(filepath)
+
+    calls = []
+    execute_jit = Kernel.execute_jit
+
+    def counting_execute_jit(self, *args, **kwargs):
+        calls.append(kwargs.get("indices"))
+        return execute_jit(self, *args, **kwargs)
+
+    monkeypatch.setattr(Kernel, "execute_jit", counting_execute_jit)
+
+    runs = {}
+    for chunksize in [False, {"lat": ("y", 16), "lon": ("x", 16)}]:
+        fieldset = FieldSet.from_parcels(filepath, chunksize=chunksize, allow_time_extrapolation=True)
+        pset = ParticleSet(fieldset, JITParticle, lon=np.linspace(1, 28, 50), lat=np.linspace(1, 18, 50))
+        calls.clear()
+        pset.execute(AdvectionRK4, runtime=timedelta(days=3), dt=timedelta(hours=1))
+        runs[bool(chunksize)] = pset.lon, pset.lat
+
+        if chunksize:
+            # all chunks that the particles reached were loaded before the kernel ran
+            assert calls == [None]
+            assert 1 < np.sum(fieldset.U.grid._load_chunk != 0) < len(fieldset.U.grid._load_chunk)
+    assert np.allclose(runs[True], runs[False])
+
+
+def test_request_chunks_range(tmpdir):
+    lon = np.linspace(0, 30, 300, dtype=np.float32)
+    lat = np.linspace(0, 20, 200, dtype=np.float32)
+    data = {
+        "U": np.zeros((lat.size, lon.size), dtype=np.float32),
+        "V": np.zeros((lat.size, lon.size), dtype=np.float32),
+    }
+    filepath = tmpdir.join("test_request_chunks_range")
+    FieldSet.from_data(data, {"lon": lon, "lat": lat}, mesh="spherical").write(filepath)
+    fieldset = FieldSet.from_parcels(filepath, chunksize={"lat": ("y", 16), "lon": ("x", 16)})
+    U = fieldset.U
+    U._chunk_setup()
+    ny, nx = U.nchunks[1:]
+
+    def requested_chunks():
+        requested = np.flatnonzero(U.grid._load_chunk == U.grid._chunk_loading_requested)
+        U.grid._load_chunk[:] = U.grid._chunk_not_loaded
+        return requested
+
+    # only the chunks of the particles themselves, also for particles outside of the grid (in its edge chunks)
+    U._request_chunks(np.zeros(3), np.array([1.0, 15.0, 10.0]), np.array([1.0, 25.0, -5.0]))
+    expected = [np.ravel_multi_index(c, (ny, nx)) for c in [(0, 0), (149 // 16, 249 // 16), (99 // 16, 0)]]
+    assert np.array_equal(requested_chunks(), sorted(expected))
+
+    # a box that spans many chunks in lon: also the chunks between the particle and the edges of the box
+    U._request_chunks(np.zeros(1), np.array([10.0]), np.array([15.0]), dy=0, dx=np.array([5.0]))
+    xi = np.searchsorted(lon, [10.0, 20.0], side="right") - 1
+    yi = np.searchsorted(lat, 10.0, side="right") - 1
+    expected = [np.ravel_multi_index((yi // 16, bx), (ny, nx)) for bx in range(xi[0] // 16, (xi[1] + 1) // 16 + 1)]
+    assert len(expected) > 3
+    assert np.array_equal(requested_chunks(), expected)
+
+    # a box that is larger than the grid requests all chunks, but not more
+    U._request_chunks(np.zeros(1), np.array([10.0]), np.array([15.0]), dy=np.array([90.0]), dx=np.array([180.0]))
+    assert np.all(U.grid._load_chunk == U.grid._chunk_loading_requested)
+
+
+def test_chunk_memory_budget(tmpdir):
+    lon = np.linspace(0, 30, 300, dtype=np.float32)
+    lat = np.linspace(0, 20, 200, dtype=np.float32)
+    data = {
+        "U": (0.5 + 0.2 * np.sin(lat[:, None] / 2) * np.cos(lon[None, :] / 3)).astype(np.float32),
+        "V": (0.2 * np.cos(lon[None, :] / 4) * np.ones((lat.size, 1))).astype(np.float32),
+    }
+    filepath = tmpdir.join("test_chunk_memory_budget")
+    FieldSet.from_data(data, {"lon": lon, "lat": lat}, mesh="spherical").write(filepath)
+
+    stats_before = get_chunk_memory_stats()
+    runs, peak_sizes = {}, {}
+    try:
+        for budget in [None, 0.01]:
+            set_chunk_memory_budget(budget)
+            fieldset = FieldSet.from_parcels(
+                filepath, chunksize={"lat": ("y", 16), "lon": ("x", 16)}, allow_time_extrapolation=True
+            )
+            # a cluster of particles, and a stray particle at the other side of the domain
+            lons = np.append(np.linspace(1, 4, 20), 25)
+            lats = np.append(np.linspace(1, 4, 20), 15)
+            pset = ParticleSet(fieldset, JITParticle, lon=lons, lat=lats)
+            peak_sizes[budget] = 0
+            for _ in range(12):
+                pset.execute(AdvectionRK4, runtime=timedelta(hours=12), dt=timedelta(hours=1))
+                size = sum(c.nbytes for f in [fieldset.U, fieldset.V] for c in f._data_chunks if c is not None)
+                peak_sizes[budget] = max(peak_sizes[budget], size)
+            runs[budget] = pset.lon, pset.lat
+    finally:
+        set_chunk_memory_budget(None)
+    stats = get_chunk_memory_stats()
+
+    assert np.allclose(runs[None], runs[0.01])
+    assert peak_sizes[0.01] < peak_sizes[None]
+    assert stats["evictions"] > stats_before["evictions"]
+    assert stats["reloads"] > stats_before["reloads"]
+    assert stats["max_size"] is None
+
+
+@pytest.mark.parametrize("time_periodic", [4 * 86400.0, False])
+@pytest.mark.parametrize("dt", [3600, -3600])
+def test_fieldset_prefetch(time_periodic, dt, monkeypatch):
+    files = {"U": [str(TEST_DATA / "perlinfieldsU.nc")] * 4, "V": [str(TEST_DATA / "perlinfieldsV.nc")] * 4}
+    variables = {"U": "vozocrtx", "V": "vomecrty"}
+    dimensions = {"lon": "nav_lon", "lat": "nav_lat"}
+    timestamps = np.expand_dims(np.arange(0, 4, 1) * 86400.0, 1)
+
+    main_thread_reads = []
+    read_time_snapshot = Field._read_time_snapshot
+
+    def counting_read_time_snapshot(self, *args, **kwargs):
+        if threading.current_thread() is threading.main_thread():
+            main_thread_reads.append(args[0])
+        return read_time_snapshot(self, *args, **kwargs)
+
+    monkeypatch.setattr(Field, "_read_time_snapshot", counting_read_time_snapshot)
+
+    lock_held = []
+    data_access = NetcdfFileBuffer.data_access
+
+    def locked_data_access(self):
+        lock_held.append(_netcdf_lock._is_owned())  # the netCDF files are read under the lock, on both threads
+        return data_access(self)
+
+    monkeypatch.setattr(NetcdfFileBuffer, "data_access", locked_data_access)
+
+    lons, nreads = {}, {}
+    for prefetch in [False, True]:
+        fieldset = FieldSet.from_netcdf(
+            files,
+            variables,
+            dimensions,
+            timestamps=timestamps,
+            time_periodic=time_periodic,
+            allow_time_extrapolation=not time_periodic,
+        )
+        fieldset.set_prefetch(prefetch)
+        main_thread_reads.clear()
+        lon = np.linspace(0.3, 0.7, 5) * fieldset.U.lon.max()
+        lat = np.full(5, 0.5) * fieldset.U.lat.max()
+        pset = ParticleSet(fieldset, JITParticle, lon=lon, lat=lat, time=0 if dt > 0 else 3 * 86400)
+        pset.execute(AdvectionRK4, runtime=timedelta(days=2), dt=dt)
+        fieldset.set_prefetch(False)
+        assert len(fieldset.U._prefetched) == 0
+        lons[prefetch], nreads[prefetch] = pset.lon, len(main_thread_reads)
+    assert np.allclose(lons[True], lons[False])
+    assert nreads[True] < nreads[False]
+    assert len(lock_held) > 0 and all(lock_held)
+
+
+def test_fieldset_prefetch_shutdown():
+    fieldset = FieldSet.from_netcdf(
+        {"U": [str(TEST_DATA / "perlinfieldsU.nc")] * 4, "V": [str(TEST_DATA / "perlinfieldsV.nc")] * 4},
+        {"U": "vozocrtx", "V": "vomecrty"},
+        {"lon": "nav_lon", "lat": "nav_lat"},
+        timestamps=np.expand_dims(np.arange(0, 4, 1) * 86400.0, 1),
+    )
+    fieldset.set_prefetch(True)
+    executor = fieldset._prefetch_executor
+    del fieldset
+    gc.collect()
+    with pytest.raises(RuntimeError):  # the executor was shut down when the FieldSet was garbage collected
+        executor.submit(print)
+
+
+def test_fieldset_prefetch_error(monkeypatch):
+    files = {"U": [str(TEST_DATA / "perlinfieldsU.nc")] * 4, "V": [str(TEST_DATA / "perlinfieldsV.nc")] * 4}
+    fieldset = FieldSet.from_netcdf(
+        files,
+        {"U": "vozocrtx", "V": "vomecrty"},
+        {"lon": "nav_lon", "lat": "nav_lat"},
+        timestamps=np.expand_dims(np.arange(0, 4, 1) * 86400.0, 1),
+    )
+    fieldset.set_prefetch(True)
+    read_time_snapshot = Field._read_time_snapshot
+
+    def failing_read_time_snapshot(self, *args, **kwargs):
+        if threading.current_thread() is not threading.main_thread():
+            raise OSError("unreadable snapshot")
+        return read_time_snapshot(self, *args, **kwargs)
+
+    monkeypatch.setattr(Field, "_read_time_snapshot", failing_read_time_snapshot)
+    pset = ParticleSet(fieldset, JITParticle, lon=[0.5 * fieldset.U.lon.max()], lat=[0.5 * fieldset.U.lat.max()])
+    with pytest.raises(OSError, match="unreadable snapshot"):  # raised when the snapshot is needed
+        pset.execute(AdvectionRK4, runtime=timedelta(days=2), dt=3600)
+    fieldset.set_prefetch(False)
+
+
+@pytest.mark.parametrize("max_size, spill", [(1024, False), (0.001, True), (0.001, False)])
+def test_fieldset_snapshot_cache(max_size, spill, tmpdir, monkeypatch):
+    lon = np.linspace(0, 1e5, 11, dtype=np.float32)
+    lat = np.linspace(0, 1e5, 11, dtype=np.float32)
+    U = [np.tile(0.01 * (t + 1) * (1 + lon / 1e5), (lat.size, 1)) for t in range(4)]
+    files = create_uv_snapshot_files(tmpdir, lon, lat, U, 0.3 * np.array(U))
+
+    reads = []
+    read_time_snapshot = Field._read_time_snapshot
+
+    def counting_read_time_snapshot(self, *args, **kwargs):
+        reads.append(args[0])
+        return read_time_snapshot(self, *args, **kwargs)
+
+    monkeypatch.setattr(Field, "_read_time_snapshot", counting_read_time_snapshot)
+
+    lons, nreads = {}, {}
+    for cache in [False, True]:
+        fieldset = FieldSet.from_netcdf(
+            {"U": files, "V": files},
+            {"U": "U", "V": "V"},
+            {"lon": "lon", "lat": "lat"},
+            timestamps=np.expand_dims(np.arange(4) * 86400.0, 1),
+            mesh="flat",
+            time_periodic=4 * 86400.0,
+        )
+        if cache:
+            fieldset.set_snapshot_cache(max_size, spill_dir=str(tmpdir.join("spill")) if spill else None)
+        reads.clear()
+        lons[cache] = []
+        for runtime in [7, 2]:  # the second ParticleSet only uses snapshots that were read before
+            pset = ParticleSet(fieldset, ScipyParticle, lon=[3e4, 5e4], lat=[5e4, 5e4], time=0)
+            pset.execute(AdvectionRK4, runtime=timedelta(days=runtime), dt=timedelta(minutes=10))
+            lons[cache].append(pset.lon)
+        nreads[cache] = len(reads)
+    assert np.allclose(lons[True], lons[False])
+    assert nreads[True] + fieldset._snapshot_cache.hits == nreads[False]
+    if max_size > 0.01 or spill:
+        assert nreads[True] == 8  # each snapshot of U and V is read only once
+    assert fieldset._snapshot_cache._memory_size <= max_size * 1024**2
+    fieldset.set_snapshot_cache(None)
+    assert fieldset.U._snapshot_cache is None
+
+
+def test_snapshot_cache_eviction(tmpdir):
+    snapshots = {k: np.full(1024 * 128, k, dtype=np.float64) for k in range(4)}  # 1 MB each
+    cache = _SnapshotCache(2.5)
+    for k in range(4):
+        cache.put(k, snapshots[k])
+    assert cache.get(0) is None and cache.get(1) is None  # the least recently used are discarded
+    assert np.array_equal(cache.get(3), snapshots[3]) and not cache.get(3).flags.writeable
+    cache.put(4, np.zeros(1024 * 512))  # larger than the cache
+    assert 4 not in cache and cache._memory_size <= cache.max_size
+
+    cache = _SnapshotCache(1.5, spill_dir=str(tmpdir), max_spill_size=2.5)
+    for k in range(4):
+        cache.put(k, snapshots[k])
+    assert 0 not in cache and len(cache._disk) == 2  # the oldest spilled snapshot is discarded from disk too
+    assert np.array_equal(cache.get(1), snapshots[1])  # read back from disk, spilling the one in memory
+    assert list(cache._memory) == [1] and list(cache._disk) == [2, 3]
+    cache.put(4, np.zeros(1024 * 512))  # too large for both tiers
+    assert 4 not in cache
+    spill_dir = cache._spill_dir
+    cache.clear()
+    assert len(cache) == 0 and os.listdir(spill_dir) == []
+
+
+@pytest.mark.parametrize("chunksize", [False, {"lat": ("lat", 4), "lon": ("lon", 4)}])
+def test_fieldset_file_pool(chunksize, tmpdir, monkeypatch):
+    lon = np.linspace(0, 1e5, 11, dtype=np.float32)
+    lat = np.linspace(0, 1e5, 11, dtype=np.float32)
+    U = [np.tile(0.01 * (t + 1) * (1 + lon / 1e5), (lat.size, 1)) for t in range(4)]
+    files = create_uv_snapshot_files(tmpdir, lon, lat, U, 0.3 * np.array(U), times=np.arange(4) * 86400.0)
+
+    opened = []
+    open_dataset = xr.open_dataset
+
+    def counting_open_dataset(filename, *args, **kwargs):
+        opened.append(filename)
+        return open_dataset(filename, *args, **kwargs)
+
+    monkeypatch.setattr(xr, "open_dataset", counting_open_dataset)
+
+    lons, nopened = {}, {}
+    for max_open in [None, 2]:
+        opened.clear()
+        fieldset = FieldSet.from_netcdf(
+            {"U": files, "V": files},
+            {"U": "U", "V": "V"},
+            {"lon": "lon", "lat": "lat", "time": "time"},
+            mesh="flat",
+            chunksize=chunksize,
+        )
+        if max_open is None:
+            # U and V share the open file (and decoded coordinates and chunking) while the FieldSet is created
+            assert len([f for f in opened if f == files[0]]) == 1
+        fieldset.set_file_pool(max_open)
+        opened.clear()
+        pset = ParticleSet(fieldset, ScipyParticle, lon=[3e4, 5e4], lat=[5e4, 5e4], time=0)
+        pset.execute(AdvectionRK4, runtime=timedelta(days=3), dt=timedelta(minutes=10))
+        lons[max_open], nopened[max_open] = pset.lon, len(opened)
+        if max_open is not None:
+            assert len(fieldset.U._file_pool) <= max_open + 2  # the two snapshots in use, plus the unused ones
+            assert fieldset.U._file_pool.hits > 0
+            # each file is opened once, after its chunking is determined once (which opens it twice) for U and V
+            assert nopened[max_open] == len(files) * (3 if chunksize else 1)
+    assert np.allclose(lons[2], lons[None])
+    assert nopened[2] < nopened[None]
+    fieldset.set_file_pool(None)
+    assert fieldset.U._file_pool is None
+
+
+def test_file_pool_lru():
+    class Dataset:
+        def __init__(self, name):
+            self.name, self.closed = name, False
+
+        def close(self):
+            self.closed = True
+
+    pool = _FilePool(max_open=1)
+    a = pool.acquire("a", lambda: Dataset("a"))
+    b = pool.acquire("b", lambda: Dataset("b"))
+    assert pool.acquire("a", lambda: Dataset("other")) is a and pool.hits == 1
+    pool.release("a")
+    pool.release("b")
+    assert not b.closed  # a is still used once, and is not counted as unused
+    pool.release("a")
+    assert b.closed and not a.closed  # only the least recently used of the unused datasets is closed
+    assert len(pool) == 1
+
+    pool.max_open = 0
+    c = pool.acquire("c", lambda: Dataset("c"))
+    assert a.closed and not c.closed  # datasets that are in use are never closed
+    pool.clear()
+    assert not c.closed and len(pool) == 1
+    pool.release("c")
+    assert c.closed and len(pool) == 0
+
+    def failing_compute():
+        raise OSError("unreadable")
+
+    with pytest.raises(OSError):
+        pool.metadata("m", failing_compute)
+    assert pool.metadata("m", lambda: 1) == 1  # failures are not kept
+    assert pool.metadata("m", failing_compute) == 1
+    pool.clear()
+    assert pool.metadata("m", lambda: 2) == 2
+
+
+@pytest.mark.parametrize("mode", ["scipy", "jit"])
+@pytest.mark.parametrize("compressed", [False, True])
+def test_fieldset_from_zarr(mode, compressed, tmpdir, monkeypatch):
+    lon = np.linspace(0, 1e5, 21, dtype=np.float32)
+    lat = np.linspace(0, 1e5, 11, dtype=np.float32)
+    time = np.arange(4) * 86400.0
+    X, Y = np.meshgrid(lon, lat)
+    # slow enough that the particles (at most 0.075 m/s, for 2 days) stay within the domain
+    U = np.stack([0.025 * np.cos(Y / 3e4 + t) + 0.05 for t in range(4)]).astype(np.float32)
+    V = np.stack([0.025 * np.sin(X / 3e4 - t) for t in range(4)]).astype(np.float32)
+    U[:, 0, 0] = np.nan
+    ds = xr.Dataset(
+        {"U": (("time", "lat", "lon"), U), "V": (("time", "lat", "lon"), V)},
+        coords={"lon": lon, "lat": lat, "time": time},
+    )
+    ds.to_netcdf(str(tmpdir.join("uv.nc")))
+    encoding = {v: {"chunks": (1, lat.size, lon.size)} for v in ["U", "V"]}
+    if not compressed:
+        for v in encoding:
+            encoding[v]["compressor"] = None
+    ds.to_zarr(str(tmpdir.join("uv.zarr")), encoding=encoding)
+
+    read_into_slot = []
+    read_time_snapshot = Field._read_time_snapshot
+
+    def recording_read_time_snapshot(self, ti, tindex=None, out=None):
+        filebuffer, data = read_time_snapshot(self, ti, tindex, out=out)
+        if out is not None:
+            read_into_slot.append(np.shares_memory(data, out))
+        return filebuffer, data
+
+    monkeypatch.setattr(Field, "_read_time_snapshot", recording_read_time_snapshot)
+
+    lons = {}
+    for fname in ["uv.nc", "uv.zarr"]:
+        read_into_slot.clear()
+        fieldset = FieldSet.from_netcdf(
+            str(tmpdir.join(fname)),
+            {"U": "U", "V": "V"},
+            {"lon": "lon", "lat": "lat", "time": "time"},
+            mesh="flat",
+            deferred_load=True,
+        )
+        assert fieldset.U.netcdf_engine == ("zarr" if fname.endswith(".zarr") else "netcdf4")
+        pset = ParticleSet(fieldset, ptype[mode], lon=[2e4, 5e4, 8e4], lat=[3e4, 5e4, 7e4])
+        pset.execute(AdvectionRK4, runtime=timedelta(days=2), dt=timedelta(hours=1))
+        lons[fname] = pset.lon
+        assert fieldset.U.data[0, 0, 0] == 0  # the NaN fill values are read as NaN, and then set to 0
+        # uncompressed Zarr chunks are read straight into the time slots of the Field data
+        assert len(read_into_slot) > 0 and all(read_into_slot) == (fname == "uv.zarr" and not compressed)
+    assert np.all(lons["uv.nc"] > [2e4, 5e4, 8e4])  # the particles were advected
+    assert np.allclose(lons["uv.zarr"], lons["uv.nc"])
+
+    with ZarrFileBuffer(str(tmpdir.join("uv.zarr")), {"lon": "lon", "lat": "lat", "time": "time"}, {}) as fb:
+        fb.name, fb.ti, fb.data_full_zdim = "U", 2, 1
+        fb.indices["depth"] = [0]
+        data = fb.data
+        assert np.allclose(data, U[2], equal_nan=True)
+        if not compressed:
+            assert data.base is not None and not data.flags.writeable  # a view on the stored chunk
+            fb.out = np.empty((1, lat.size, lon.size), dtype=np.float32)
+            data = fb.data
+            assert np.shares_memory(data, fb.out) and np.allclose(data, U[2], equal_nan=True)
+            fb.out = None
+        fb.indices.update(lat=range(2, 6), lon=range(3, 9))
+        fb.nolonlatindices = False
+        assert np.allclose(fb.data, U[2, 2:6, 3:9])
+
+
+def test_fieldset_metadata_index(tmpdir, monkeypatch):
+    lon = np.linspace(0, 1e5, 11, dtype=np.float32)
+    lat = np.linspace(0, 1e5, 11, dtype=np.float32)
+    U = [np.full((lat.size, lon.size), 0.01 * (t + 1)) for t in range(6)]
+    times = np.datetime64("2000-01-01") + np.arange(6) * np.timedelta64(1, "D")
+    files = create_uv_snapshot_files(tmpdir, lon, lat, U, U, times=times)
+
+    opened = []
+    open_dataset = xr.open_dataset
+
+    def counting_open_dataset(filename, *args, **kwargs):
+        opened.append(filename)
+        return open_dataset(filename, *args, **kwargs)
+
+    monkeypatch.setattr(xr, "open_dataset", counting_open_dataset)
+
+    def create_fieldset(metadata_index):
+        opened.clear()
+        return FieldSet.from_netcdf(
+            files,
+            {"U": "U", "V": "V"},
+            {"lon": "lon", "lat": "lat", "time": "time"},
+            mesh="flat",
+            metadata_index=metadata_index,
+        )
+
+    index_dir = str(tmpdir.join("index"))
+    os.makedirs(index_dir)
+    monkeypatch.setenv("PARCELS_METADATA_INDEX", index_dir)
+    opened.clear()
+    fieldset = FieldSet.from_netcdf(
+        files, {"U": "U", "V": "V"}, {"lon": "lon", "lat": "lat", "time": "time"}, mesh="flat"
+    )
+    time_full = fieldset.U.grid.time_full
+    assert set(opened) == set(files)
+    assert len(os.listdir(index_dir)) == 0  # the index is opt-in
+
+    def read_index():
+        assert len(os.listdir(index_dir)) == 1
+        with open(os.path.join(index_dir, os.listdir(index_dir)[0])) as f:
+            return json.load(f)
+
+    # the files are scanned in worker processes, so they are counted through the entries of the index
+    fieldset = create_fieldset(True)  # cold index (in PARCELS_METADATA_INDEX): all files are scanned
+    assert set(read_index()) == set(files)
+    os.remove(os.path.join(index_dir, os.listdir(index_dir)[0]))
+
+    fieldset = create_fieldset(index_dir)  # cold index: all files are scanned
+    assert set(read_index()) == set(files)
+    assert np.allclose(fieldset.U.grid.time_full, time_full)
+    entry = read_index()[files[1]]
+    assert entry["coords"].keys() == {"lon", "lat"} and entry["coords"] == read_index()[files[0]]["coords"]
+    assert entry["variables"]["U"] == {"dims": ["time", "lat", "lon"], "shape": [1, 11, 11], "dtype": "float32"}
+
+    fieldset = create_fieldset(index_dir)  # warm index: only the coordinates are read
+    assert set(opened) == {files[0]}
+    assert np.allclose(fieldset.U.grid.time_full, time_full)
+    assert fieldset.U.grid.time_origin.time_origin == np.datetime64("2000-01-01")
+
+    ds = xr.load_dataset(files[5])
+    ds["time"] = [np.datetime64("2000-01-08")]
+    ds.to_netcdf(files[5])  # a changed file is scanned again
+    fieldset = create_fieldset(index_dir)
+    assert set(opened) == {files[0], files[5]}
+    assert fieldset.U.grid.time_full[-1] == 7 * 86400
+
+    index = read_index()
+    del index[files[2]]["coords"]  # an entry without the coordinates of the file is not used
+    with open(os.path.join(index_dir, os.listdir(index_dir)[0]), "w") as f:
+        json.dump(index, f)
+    create_fieldset(index_dir)
+    assert set(opened) == {files[0], files[2]}
+
+    ds = xr.load_dataset(files[3])
+    ds["lon"] = ds["lon"] + 1
+    ds.to_netcdf(files[3])  # a file on another grid than the first file is scanned, and warned about
+    with pytest.warns(FileWarning, match="snapshot3.nc differ from those of"):
+        create_fieldset(index_dir)
+    assert set(opened) == {files[0], files[3]}
+
+
+def test_fieldset_metadata_index_unusable(tmpdir, monkeypatch):
+    lon = np.linspace(0, 1e5, 11, dtype=np.float32)
+    lat = np.linspace(0, 1e5, 11, dtype=np.float32)
+    U = [np.full((lat.size, lon.size), 0.01 * (t + 1)) for t in range(3)]
+    files = create_uv_snapshot_files(tmpdir, lon, lat, U, U, times=np.arange(3) * 86400.0)
+
+    opened = []
+    open_dataset = xr.open_dataset
+
+    def counting_open_dataset(filename, *args, **kwargs):
+        opened.append(filename)
+        return open_dataset(filename, *args, **kwargs)
+
+    monkeypatch.setattr(xr, "open_dataset", counting_open_dataset)
+
+    def create_fieldset(metadata_index):
+        opened.clear()
+        return FieldSet.from_netcdf(
+            files, {"U": "U", "V": "V"}, {"lon": "lon", "lat": "lat", "time": "time"}, metadata_index=metadata_index
+        )
+
+    # an index that can not be written (here, because its directory does not exist) is not used
+    fieldset = create_fieldset(str(tmpdir.join("missing")))
+    assert np.allclose(fieldset.U.grid.time_full, np.arange(3) * 86400.0)
+    assert not os.path.exists(str(tmpdir.join("missing")))
+
+    # a corrupt index is ignored, and replaced
+    index_dir = str(tmpdir.join("index"))
+    os.makedirs(index_dir)
+    create_fieldset(index_dir)
+    index_file = os.path.join(index_dir, os.listdir(index_dir)[0])
+    with open(index_file, "w") as f:
+        f.write("{not json")
+    fieldset = create_fieldset(index_dir)
+    with open(index_file) as f:
+        assert set(json.load(f)) == set(files)  # all files were scanned again
+    assert np.allclose(fieldset.U.grid.time_full, np.arange(3) * 86400.0)
+    assert os.listdir(index_dir) == [os.path.basename(index_file)]  # without temporary files
+    create_fieldset(index_dir)
+    assert set(opened) == {files[0]}
+
+
+@pytest.mark.parametrize("mode", ["scipy", "jit"])
+@pytest.mark.parametrize("chunksize", [False, {"lat": ("lat", 4), "lon": ("lon", 4)}])
+@pytest.mark.parametrize("dt", [3600, -3600])
+def test_deferred_load_time_slots(mode, chunksize, dt, tmpdir, monkeypatch):
+    lon = np.linspace(0, 1, 9, dtype=np.float32)
+    lat = np.linspace(0, 1, 9, dtype=np.float32)
+    snapshots = [np.random.RandomState(t).random_sample((1, lat.size, lon.size)).astype(np.float32) for t in range(4)]
+    files = create_uv_snapshot_files(tmpdir, lon, lat, np.concatenate(snapshots), np.concatenate(snapshots))
+    fieldset = FieldSet.from_netcdf(
+        {"U": files, "V": files},
+        {"U": "U", "V": "V"},
+        {"lon": "lon", "lat": "lat"},
+        timestamps=np.expand_dims(np.arange(4) * 86400.0, 1),
+        mesh="flat",
+        chunksize=chunksize,
+    )
+    read_into_data = []  # whether each new snapshot of U was read straight into the slot in its data
+    compute_time_chunk = Field.computeTimeChunk
+
+    def recording_compute_time_chunk(self, data, tindex):
+        if self is fieldset.U:
+            read_into_data.append(isinstance(self.data, np.ndarray) and np.shares_memory(data, self.data))
+        return compute_time_chunk(self, data, tindex)
+
+    monkeypatch.setattr(Field, "computeTimeChunk", recording_compute_time_chunk)
+
+    SampleParticle = ptype[mode].add_variables(
+        [Variable("u", dtype=np.float32, initial=np.nan), Variable("tsample", dtype=np.float64, initial=np.nan)]
+    )
+
+    def SampleU(particle, fieldset, time):  # pragma: no cover
+        particle.u = fieldset.U[time, particle.depth, particle.lat, particle.lon]
+        particle.tsample = time
+
+    yi, xi = np.meshgrid(np.arange(1, 8), np.arange(1, 8), indexing="ij")
+    pset = ParticleSet(
+        fieldset, pclass=SampleParticle, lon=lon[xi.ravel()], lat=lat[yi.ravel()], time=0 if dt > 0 else 3 * 86400
+    )
+    swapped = False
+    for _ in range(6):
+        pset.execute(SampleU, runtime=timedelta(hours=11), dt=dt)
+        swapped |= fieldset.U._time_slots is not None and fieldset.U._time_slots[0] == 1
+        ti = fieldset.U.grid._ti
+        for k in range(2):  # Field.data is in time order, whatever the order of the slots in memory
+            assert np.allclose(fieldset.U.data[k], snapshots[ti + k][0])
+
+        tj = min(int(pset.tsample[0] // 86400), 2)
+        w = pset.tsample[0] / 86400 - tj
+        expected = (1 - w) * snapshots[tj][0] + w * snapshots[tj + 1][0]
+        assert np.allclose(pset.u, expected[yi.ravel(), xi.ravel()], rtol=1e-5)
+    assert swapped
+    if isinstance(fieldset.U.data, np.ndarray):
+        # the two snapshots of the first load are read into a new array, and each next one into the slot it replaces
+        assert len(read_into_data) > 2 and all(read_into_data[2:])
+
+
+@pytest.mark.parametrize("mode", ["scipy", "jit"])
+@pytest.mark.parametrize("lat_flipped", [False, True])
+def test_fieldset_spatial_subsetting(mode, lat_flipped, tmpdir, monkeypatch):
+    lon = np.linspace(0, 10, 51, dtype=np.float32)
+    lat = np.linspace(0, 10, 41, dtype=np.float32)
+    lat = lat[::-1] if lat_flipped else lat
+    X, Y = np.meshgrid(lon, lat)
+    U = [3 * np.cos(Y / 3 + t) + 2 for t in range(3)]
+    V = [3 * np.sin(X / 3 - t) for t in range(3)]
+    files = create_uv_snapshot_files(tmpdir, lon, lat, U, V)
+
+    read_sizes = []
+    read_time_snapshot = Field._read_time_snapshot
+
+    def counting_read_time_snapshot(self, *args, **kwargs):
+        filebuffer, data = read_time_snapshot(self, *args, **kwargs)
+        read_sizes.append(data.size)
+        return filebuffer, data
+
+    monkeypatch.setattr(Field, "_read_time_snapshot", counting_read_time_snapshot)
+
+    grown_while_sampling = []
+    include = _SubsetWindow.include
+
+    def recording_include(self, yi, xi):
+        bounds = self.bounds
+        include(self, yi, xi)
+        grown_while_sampling.append(self.bounds != bounds)
+
+    monkeypatch.setattr(_SubsetWindow, "include", recording_include)
+
+    lons, lats, sizes = {}, {}, {}
+    for halo in [None, 2]:
+        fieldset = FieldSet.from_netcdf(
+            {"U": files, "V": files},
+            {"U": "U", "V": "V"},
+            {"lon": "lon", "lat": "lat"},
+            timestamps=np.expand_dims(np.arange(3) * 86400.0, 1),
+        )
+        fieldset.set_spatial_subsetting(halo)
+        pset = ParticleSet(fieldset, ptype[mode], lon=np.linspace(2, 2.5, 5), lat=np.linspace(4, 4.5, 5))
+        read_sizes.clear()
+        for _ in range(4):  # the particles move out of the initial window, which then grows
+            pset.execute(AdvectionRK4, runtime=timedelta(hours=12), dt=timedelta(minutes=30))
+        lons[halo], lats[halo], sizes[halo] = pset.lon, pset.lat, sum(read_sizes)
+
+        window = fieldset.U.grid._subset_window
+        assert (window is None) == (halo is None)
+        if window is not None:
+            y0, y1, x0, x1 = window.bounds
+            assert (y1 - y0) * (x1 - x0) < lat.size * lon.size / 2
+            outside = np.ones(fieldset.U.data.shape[1:], dtype=bool)
+            outside[y0:y1, x0:x1] = False
+            assert np.all(fieldset.U.data[:, outside] == 0)
+    assert np.allclose(lons[2], lons[None]) and np.allclose(lats[2], lats[None])
+    assert sizes[2] < sizes[None] / 2
+    # in Scipy mode, the window grows before each step, not while the Kernel samples the Fields
+    assert len(grown_while_sampling) > 0 or mode == "jit"
+    assert not any(grown_while_sampling)
+
+
+@pytest.mark.parametrize("mode", ["scipy", "jit"])
+@pytest.mark.parametrize("lat_flipped", [False, True])
+def test_fieldset_raw_store(mode, lat_flipped, tmpdir):
+    lon = np.linspace(0, 10, 21, dtype=np.float32)
+    lat = np.linspace(0, 10, 17, dtype=np.float32)
+    lat = lat[::-1] if lat_flipped else lat
+    X, Y = np.meshgrid(lon, lat)
+    U = np.stack([3 * np.cos(Y / 3 + t) + 2 for t in range(4)]).astype(np.float32)
+    V = np.stack([3 * np.sin(X / 3 - t) for t in range(4)]).astype(np.float32)
+    U[:, 0, 0] = np.nan
+    ds = xr.Dataset(
+        {"U": (("time", "lat", "lon"), U), "V": (("time", "lat", "lon"), V)},
+        coords={"lon": lon, "lat": lat, "time": np.arange(4) * 86400.0},
+    )
+    ds.to_netcdf(str(tmpdir.join("uv.nc")))
+
+    fieldset = FieldSet.from_netcdf(
+        str(tmpdir.join("uv.nc")), {"U": "U", "V": "V"}, {"lon": "lon", "lat": "lat", "time": "time"}
+    )
+    fieldset.write_raw_store(str(tmpdir.join("raw")), chunksize={"lat": 8, "lon": 8})
+    assert len(os.listdir(str(tmpdir.join("raw", "U")))) == 9
+
+    lons, lats = {}, {}
+    for name in ["netcdf", "raw"]:
+        if name == "raw":
+            fieldset = FieldSet.from_raw_store(str(tmpdir.join("raw")))
+            assert fieldset.U.grid is fieldset.V.grid
+            assert fieldset.U.data.numblocks == (1, 3, 3)
+        pset = ParticleSet(fieldset, ptype[mode], lon=np.linspace(2, 2.5, 5), lat=np.linspace(4, 4.5, 5))
+        pset.execute(AdvectionRK4, runtime=timedelta(days=2), dt=timedelta(minutes=30))
+        lons[name], lats[name] = pset.lon, pset.lat
+    assert np.allclose(lons["raw"], lons["netcdf"]) and np.allclose(lats["raw"], lats["netcdf"])
+
+    if mode == "jit":  # the chunks of the kernel are the memory-mapped tiles themselves
+        loaded = [c for c in fieldset.U._data_chunks if c is not None]
+        assert len(loaded) > 0
+        assert all(any(c is t for t in fieldset.U._raw_tiles) for c in loaded)
+        assert all(isinstance(c, np.memmap) and c.shape[0] == 4 for c in loaded)
+
+
 @pytest.mark.parametrize("datetype", ["float", "datetime64"])
 def test_timestamps(datetype, tmpdir):
     data1, dims1 = generate_fieldset_data(10, 10, 1, 10)
@@ -10,6 +10,7 @@ from parcels import (
     AdvectionRK4,
     AdvectionRK4_3D,
     Field,
+    FieldOutOfBoundError,
     FieldSet,
     Geographic,
     JITParticle,
@@ -17,6 +18,7 @@ from parcels import (
     ParticleSet,
     ScipyParticle,
     StatusCode,
+    TimeExtrapolationError,
     Variable,
 )
 from tests.utils import create_fieldset_global
@@ -933,3 +935,110 @@ def test_fieldset_sampling_updating_order(mode, tmp_zarrfile):
                 ds["p"].values[i, t],
                 calc_p(float(ds["time"].values[i, t]) / 1e9, ds["lat"].values[i, t], ds["lon"].values[i, t]),
             )
+
+
+@pytest.mark.parametrize("interp_method", ["linear", "nearest", "linear_invdist_land_tracer"])
+@pytest.mark.parametrize("gridindexingtype", ["nemo", "pop", "mom5"])
+def test_eval_many(interp_method, gridindexingtype):
+    lon = np.linspace(0, 10, 21)
+    lat = np.linspace(-5, 5, 15)
+    depth = np.linspace(5, 55, 6)
+    time = np.arange(4) * 100.0
+    T, Z, Y, X = np.meshgrid(time, depth, lat, lon, indexing="ij")
+    data = np.sin(X) * np.cos(Y) + Z / 50 + T / 1000
+    data[:, :, ::3, ::2] = 0  # land points for linear_invdist_land_tracer
+    dims = {"lon": lon, "lat": lat, "depth": depth, "time": time}
+    fieldset = FieldSet.from_data({"U": data, "V": 2 * data}, dims, mesh="spherical", gridindexingtype=gridindexingtype)
+    fieldset.add_field(Field("P", data, **dims, mesh="spherical", interp_method=interp_method))
+
+    rng = np.random.default_rng(1234)
+    npart = 200
+    t = rng.uniform(0, 300, npart)
+    z = rng.uniform(5, 55, npart)
+    y = rng.uniform(-5, 5, npart)
+    x = rng.uniform(0, 10, npart)
+    y[:5], x[:5] = lat[3], lon[4]  # exactly on grid points
+
+    p = fieldset.P.eval_many(t, z, y, x)
+    u, v = fieldset.UV.eval_many(t, z, y, x)
+    for i in range(npart):
+        assert np.isclose(p[i], fieldset.P.eval(t[i], z[i], y[i], x[i]))
+        assert np.allclose((u[i], v[i]), fieldset.UV.eval(t[i], z[i], y[i], x[i]))
+
+
+def test_eval_many_curvilinear_hints():
+    i, j = np.meshgrid(np.arange(30.0), np.arange(25.0))
+    angle = 0.3
+    lon = 10 + 0.2 * (i * np.cos(angle) - j * np.sin(angle))
+    lat = -2 + 0.2 * (i * np.sin(angle) + j * np.cos(angle))
+    fieldset = FieldSet.from_data({"U": np.sin(lon) + lat, "V": lat}, {"lon": lon, "lat": lat}, mesh="flat")
+
+    rng = np.random.default_rng(1234)
+    ii, jj = rng.uniform(1, 28, 100), rng.uniform(1, 23, 100)
+    x = 10 + 0.2 * (ii * np.cos(angle) - jj * np.sin(angle))
+    y = -2 + 0.2 * (ii * np.sin(angle) + jj * np.cos(angle))
+
+    xi = np.zeros(len(x), dtype=np.int32)
+    yi = np.zeros(len(x), dtype=np.int32)
+    u, v = fieldset.UV.eval_many(0, 0, y, x, xi=xi, yi=yi)
+    assert np.array_equal(xi, np.floor(ii)) and np.array_equal(yi, np.floor(jj))
+    for k in range(len(x)):
+        assert np.allclose((u[k], v[k]), fieldset.UV.eval(0, 0, y[k], x[k]))
+    assert np.allclose(fieldset.U.eval_many(0, 0, y, x, xi=xi, yi=yi), u)
+
+    # hints in non-contiguous arrays, of which no flat view exists, are updated as well
+    hints = np.zeros((2, 10, 10), dtype=np.int32)
+    xi, yi = hints[0].T, hints[1].T
+    fieldset.UV.eval_many(0, 0, y.reshape(10, 10), x.reshape(10, 10), xi=xi, yi=yi)
+    assert np.array_equal(xi.ravel(), np.floor(ii)) and np.array_equal(yi.ravel(), np.floor(jj))
+
+
+def test_eval_many_errors():
+    fieldset = create_fieldset_global()
+    x = np.array([[10, 20, 400], [30, 40, 50]])
+    y = np.array([[0, 10, 10], [np.nan, 20, 30]])
+    u, v = fieldset.UV.eval_many(0, 0, y, x, fill_value=np.nan)
+    assert u.shape == (2, 3)
+    assert np.array_equal(np.isnan(u), [[False, False, True], [True, False, False]])
+    assert np.isclose(u[1, 2], fieldset.UV.eval(0, 0, 30, 50)[0])
+
+    with pytest.raises(FieldOutOfBoundError):
+        fieldset.U.eval_many(0, 0, y, x)
+    fieldset.U.allow_time_extrapolation = False
+    with pytest.raises(TimeExtrapolationError):
+        fieldset.U.eval_many([0, 1e10], 0, 0, 0)
+
+
+@pytest.mark.parametrize("mode", ["scipy", "jit"])
+@pytest.mark.parametrize("mesh", ["flat", "spherical"])
+def test_sampling_index_search_far_from_hint(mode, mesh):
+    """Particles released far from their initial index (0) on large uniform and non-uniform axes."""
+    lon = np.linspace(-180, 180, 4001, dtype=np.float32)  # uniform
+    lat = (np.sinh(np.linspace(-3, 3, 1501)) * 80 / np.sinh(3)).astype(np.float32)  # non-uniform
+    depth = (np.linspace(0, 1, 11) ** 2 * 1000).astype(np.float32)  # non-uniform
+    P = np.zeros((depth.size, lat.size, lon.size), dtype=np.float32)
+    P += lon[np.newaxis, np.newaxis, :] + 2 * lat[np.newaxis, :, np.newaxis] + 0.1 * depth[:, np.newaxis, np.newaxis]
+    dims = {"lon": lon, "lat": lat, "depth": depth}
+    fieldset = FieldSet.from_data({"U": np.zeros_like(P), "V": np.zeros_like(P), "P": P}, dims, mesh=mesh)
+
+    def SampleP(particle, fieldset, time):  # pragma: no cover
+        particle.p = fieldset.P[time, particle.depth, particle.lat, particle.lon]
+
+    npart = 50
+    rng = np.random.default_rng(1234)
+    x = rng.uniform(-179, 179, npart)
+    y = rng.uniform(-79, 79, npart)
+    z = rng.uniform(1, 999, npart)
+    pset = ParticleSet(fieldset, pclass=pclass(mode), lon=x, lat=y, depth=z)
+    pset.execute(SampleP, runtime=1, dt=1)
+    assert np.allclose(pset.p, pset.lon + 2 * pset.lat + 0.1 * pset.depth, rtol=1e-5, atol=1e-3)
+
+    def Jump(particle, fieldset, time):  # pragma: no cover
+        """Jump far from the cell in which the particle was found before."""
+        particle_dlon += -2 * particle.lon  # noqa
+        particle_dlat += -2 * particle.lat  # noqa
+        particle_ddepth += 1000 - 2 * particle.depth  # noqa
+
+    pset.execute([SampleP, Jump], runtime=2, dt=1)
+    assert np.allclose(pset.lon, -x, atol=1e-3)
+    assert np.allclose(pset.p, pset.lon + 2 * pset.lat + 0.1 * pset.depth, rtol=1e-5, atol=1e-3)
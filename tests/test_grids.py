@@ -369,6 +369,77 @@ def test_curvilinear_grids(mode):
     assert np.allclose(pset.speed[0], 1000)
 
 
+@pytest.mark.parametrize("mode", ["scipy", "jit"])
+def test_curvilinear_search_index(mode, tmpdir):
+    x = np.linspace(0, 1e5, 201)
+    y = np.linspace(0, 1e5, 151)
+    (xx, yy) = np.meshgrid(x, y)
+    r = np.sqrt(xx * xx + yy * yy)
+    theta = np.arctan2(yy, xx) + np.pi / 6.0
+    lon = r * np.cos(theta)
+    lat = r * np.sin(theta)
+    grid = CurvilinearZGrid(lon, lat)
+
+    # The search index gives a cell next to the cell that contains the position
+    xp = np.array([1.2e4, 5.5e4, 9.1e4, 3.3e4])
+    yp = np.array([8.7e4, 2.1e4, 6.4e4, 4.9e4])
+    lonp = xp * np.cos(np.pi / 6.0) - yp * np.sin(np.pi / 6.0)
+    latp = xp * np.sin(np.pi / 6.0) + yp * np.cos(np.pi / 6.0)
+    yi, xi = grid.search_index.guess(lonp, latp)
+    assert np.all(np.abs(xi - np.floor(xp / 500)) <= 1)
+    assert np.all(np.abs(yi - np.floor(yp / (1e5 / 150))) <= 1)
+
+    fname = str(tmpdir.join("search_index.npz"))
+    grid.save_search_index(fname)
+    grid2 = CurvilinearZGrid(lon, lat)
+    grid2.load_search_index(fname)
+    assert np.array_equal(grid2.search_index.cells, grid.search_index.cells)
+    with pytest.raises(ValueError):
+        CurvilinearZGrid(lon, lat + 1).load_search_index(fname)
+
+    data = (lon + 2 * lat).astype(np.float32)
+    fieldset = FieldSet.from_data({"U": data, "V": data, "P": data}, {"lon": lon, "lat": lat}, mesh="flat")
+
+    def SampleP(particle, fieldset, time):  # pragma: no cover
+        particle.p = fieldset.P[time, particle.depth, particle.lat, particle.lon]
+
+    def Jump(particle, fieldset, time):  # pragma: no cover
+        # point reflection through the centre of the grid
+        particle_dlon += -2 * particle.lon + 1e5 * (math.cos(math.pi / 6.0) - math.sin(math.pi / 6.0))  # noqa
+        particle_dlat += -2 * particle.lat + 1e5 * (math.sin(math.pi / 6.0) + math.cos(math.pi / 6.0))  # noqa
+
+    MyParticle = ptype[mode].add_variable("p", dtype=np.float32, initial=0.0)
+    pset = ParticleSet(fieldset, MyParticle, lon=lonp, lat=latp)
+    pset.execute([SampleP, Jump], runtime=2, dt=1)
+    assert np.allclose(pset.p, pset.lon + 2 * pset.lat, rtol=1e-5)
+    assert not np.allclose(pset.lon, lonp)
+
+
+def test_curvilinear_search_index_new_particles():
+    lon, lat = np.meshgrid(np.linspace(0, 10, 11), np.linspace(0, 5, 6))
+    lon = lon + 0.1 * lat
+    fieldset = FieldSet.from_data({"U": lon, "V": lat, "P": lon}, {"lon": lon, "lat": lat}, mesh="flat")
+    search_index = fieldset.U.grid.search_index
+    guessed = []
+
+    def counting_guess(x, y):
+        guessed.append(np.size(x))
+        return type(search_index).guess(search_index, x, y)
+
+    search_index.guess = counting_guess
+
+    def SampleP(particle, fieldset, time):  # pragma: no cover
+        particle.p = fieldset.P[time, particle.depth, particle.lat, particle.lon, particle]
+
+    # only the new particle (with xi = yi = -1) starts from the search index, not the one found in cell (0, 0)
+    MyParticle = ScipyParticle.add_variable("p", dtype=np.float32, initial=0.0)
+    pset = ParticleSet(fieldset, MyParticle, lon=[0.5], lat=[0.5])
+    assert np.all(pset.xi == -1) and np.all(pset.yi == -1)
+    pset.execute(SampleP, runtime=3, dt=1)
+    assert np.all(pset.xi == 0) and np.all(pset.yi == 0)
+    assert sum(guessed) == 1
+
+
 @pytest.mark.parametrize("mode", ["scipy", "jit"])
 def test_nemo_grid(mode):
     filenames = {
@@ -16,6 +16,8 @@ from parcels import (
     ScipyParticle,
     StatusCode,
 )
+from parcels.compilation.codecompiler import CCompiler_SS
+from parcels.compilation.kernelcache import evict_kernel_cache, kernel_cache_key
 from tests.common_kernels import DeleteParticle, DoNothing, MoveEast, MoveNorth
 from tests.utils import assert_empty_folder, create_fieldset_unit_mesh, create_fieldset_zeros_simple
 
@@ -194,6 +196,22 @@ def test_execution_check_all_errors(fieldset_unit_mesh, mode):
     assert len(pset) == 0
 
 
+@pytest.mark.parametrize("mode", ["scipy", "jit"])
+def test_execution_delete_non_recoverable_errors(fieldset_unit_mesh, mode):
+    npart = 10
+
+    def FailEast(particle, fieldset, time):  # pragma: no cover
+        if particle.lon > 0.5:
+            particle.state = StatusCode.ErrorInterpolation
+
+    lon = np.linspace(0.05, 0.95, npart)
+    pset = ParticleSet(fieldset_unit_mesh, pclass=ptype[mode], lon=lon, lat=0.5 * np.ones(npart))
+    with pytest.warns(RuntimeWarning, match="Deleting 5 particle\\(s\\) because of non-recoverable error"):
+        pset.execute(FailEast, endtime=1.0, dt=1.0)
+    assert len(pset) == 5
+    assert np.allclose(pset.lon, lon[:5])
+
+
 @pytest.mark.parametrize("mode", ["scipy", "jit"])
 def test_execution_check_stopallexecution(fieldset_unit_mesh, mode):
     def addoneLon(particle, fieldset, time):  # pragma: no cover
@@ -210,6 +228,53 @@ def test_execution_check_stopallexecution(fieldset_unit_mesh, mode):
     assert pset[1].time == 0
 
 
+@pytest.mark.parametrize("nthreads", [1, 4])
+def test_execution_nthreads(fieldset_unit_mesh, nthreads):
+    npart = 200
+
+    def Sample(particle, fieldset, time):  # pragma: no cover
+        u, v = fieldset.UV[time, particle.depth, particle.lat, particle.lon, particle]
+        particle_dlon += u * particle.dt * 1e-2  # noqa
+        particle_dlat += v * particle.dt * 1e-2  # noqa
+
+    def Nudge(particle, fieldset, time):  # pragma: no cover
+        particle_dlon += ParcelsRandom.uniform(-1e-3, 1e-3)  # noqa
+
+    lon = np.linspace(0.1, 0.9, npart)
+    lat = np.linspace(0.9, 0.1, npart)
+    results = []
+    for threads in [None, nthreads]:
+        pset = ParticleSet(fieldset_unit_mesh, pclass=JITParticle, lon=lon, lat=lat)
+        pset.execute(Sample, runtime=5, dt=1, nthreads=threads)
+        results.append((pset.lon, pset.lat))
+    assert np.array_equal(results[0][0], results[1][0])
+    assert np.array_equal(results[0][1], results[1][1])
+
+    # random draws are seeded per particle id in threaded mode, so independent of the number of threads
+    lons = []
+    for threads in [1, nthreads]:
+        parcels.ParcelsRandom.seed(1234)
+        JITParticle.setLastID(0)
+        pset = ParticleSet(fieldset_unit_mesh, pclass=JITParticle, lon=lon, lat=lat)
+        pset.execute(Nudge, runtime=5, dt=1, nthreads=threads)
+        lons.append(pset.lon)
+    assert np.array_equal(lons[0], lons[1])
+    assert not np.allclose(lons[0], lon)
+
+
+def test_execution_nthreads_stopallexecution(fieldset_unit_mesh):
+    def addoneLon(particle, fieldset, time):  # pragma: no cover
+        particle_dlon += 1  # noqa
+
+        if particle.lon + particle_dlon >= 10:
+            particle.state = StatusCode.StopAllExecution
+
+    pset = ParticleSet(fieldset_unit_mesh, pclass=JITParticle, lon=[0, 1], lat=[0, 0])
+    pset.execute(addoneLon, endtime=20.0, dt=1.0, nthreads=2)
+    assert pset[0].lon == 9
+    assert pset[0].time == 9
+
+
 @pytest.mark.parametrize("mode", ["scipy", "jit"])
 def test_execution_delete_out_of_bounds(fieldset_unit_mesh, mode):
     npart = 10
@@ -454,3 +519,132 @@ def test_kernel_file_cleanup(parcels_cache):
     del pset  # cleans up compiled C files on deletion
 
     assert_empty_folder(parcels_cache)
+
+
+def test_kernel_cache_reuse(fieldset_unit_mesh, tmp_path, monkeypatch):
+    monkeypatch.setenv("PARCELS_KERNEL_CACHE", str(tmp_path))
+    lib_files = []
+    for _ in range(2):
+        pset = ParticleSet(fieldset_unit_mesh, pclass=JITParticle, lon=[0.5], lat=[0.5])
+        pset.execute(MoveEast, runtime=1, dt=1)
+        lib_files.append(pset._kernel.lib_file)
+    assert lib_files[0] == lib_files[1]
+    assert [f.name for f in tmp_path.iterdir()] == [os.path.basename(lib_files[0])]
+
+
+def test_kernel_cache_key_compiler(tmp_path):
+    gcc = tmp_path / "gcc"
+    gcc.write_text("#!/bin/sh\necho 'gcc 1.0'\n")
+    gcc.chmod(0o755)
+    compiler = CCompiler_SS(cc=str(gcc))
+    key = kernel_cache_key("void f(void) {}", compiler)
+    assert key == kernel_cache_key("void f(void) {}", CCompiler_SS(cc=str(gcc)))
+
+    class OtherCompiler(CCompiler_SS):
+        pass
+
+    assert key != kernel_cache_key("void f(void) {}", OtherCompiler(cc=str(gcc)))
+
+    newer_gcc = tmp_path / "newer" / "gcc"
+    newer_gcc.parent.mkdir()
+    newer_gcc.write_text("#!/bin/sh\necho 'gcc 2.0'\n")
+    newer_gcc.chmod(0o755)
+    assert key != kernel_cache_key("void f(void) {}", CCompiler_SS(cc=str(newer_gcc)))
+
+
+def test_kernel_cache_eviction(tmp_path):
+    for i in range(4):
+        lib_file = tmp_path / f"lib{i}.so"
+        lib_file.write_bytes(b"0" * 1024**2)
+        os.utime(lib_file, (i, i))
+
+    evict_kernel_cache(tmp_path, max_size=2.5, keep=tmp_path / "lib0.so")
+    assert sorted(f.name for f in tmp_path.iterdir()) == ["lib0.so", "lib3.so"]
+
+
+def _fieldset_vectorized(mesh="flat", zdim=1):
+    lon = np.linspace(0, 10, 21, dtype=np.float32)
+    lat = np.linspace(0, 8, 17, dtype=np.float32)
+    depth = np.linspace(0, 100, zdim, dtype=np.float32)
+    time = np.arange(3) * 3600.0
+    T, Z, Y, X = np.meshgrid(time, depth, lat, lon, indexing="ij")
+    scale = 1e-5 if mesh == "spherical" else 1e-4
+    data = {
+        "U": np.squeeze(scale * np.cos(Y / 2 + T / 3600)).astype(np.float32),
+        "V": np.squeeze(scale * np.sin(X / 2 + Z / 100)).astype(np.float32),
+        "P": np.squeeze(X + Y + Z / 10).astype(np.float32),
+    }
+    dimensions = {"lon": lon, "lat": lat, "time": time}
+    if zdim > 1:
+        data["W"] = (1e-3 * np.cos(X / 3)).astype(np.float32)
+        dimensions["depth"] = depth
+    return FieldSet.from_data(data, dimensions, mesh=mesh)
+
+
+@pytest.mark.parametrize("mesh", ["flat", "spherical"])
+@pytest.mark.parametrize("zdim", [1, 4])
+def test_execution_vectorized(mesh, zdim):
+    SampleParticle = ScipyParticle.add_variable("p", dtype=np.float32, initial=0.0)
+
+    def SampleP(particle, fieldset, time):  # pragma: no cover
+        particle.p = fieldset.P[time, particle.depth, particle.lat, particle.lon]
+
+    advection = parcels.AdvectionRK4 if zdim == 1 else parcels.AdvectionRK4_3D
+    psets = []
+    for vectorized in [False, True]:
+        fieldset = _fieldset_vectorized(mesh, zdim)
+        npart = 12
+        pset = ParticleSet(
+            fieldset,
+            pclass=SampleParticle,
+            lon=np.linspace(1, 9, npart),
+            lat=np.linspace(1, 7, npart),
+            depth=np.linspace(10, 80, npart) if zdim > 1 else None,
+            time=np.arange(npart) * 100.0,
+        )
+        pset.execute([advection, SampleP], runtime=3000, dt=300, vectorized=vectorized)
+        psets.append(pset)
+
+    for var in ["lon", "lat", "depth", "time", "p"]:
+        assert np.allclose(getattr(psets[0], var), getattr(psets[1], var), rtol=1e-6)
+    assert np.allclose(psets[1].p, psets[1].lon + psets[1].lat + psets[1].depth / 10, rtol=1e-5)
+
+
+def test_execution_vectorized_diffusion():
+    fieldset = _fieldset_vectorized()
+    fieldset.add_constant_field("Kh_zonal", 1e-6, mesh="flat")
+    fieldset.add_constant_field("Kh_meridional", 1e-6, mesh="flat")
+    fieldset.add_constant("dres", 0.01)
+
+    lons = []
+    for _ in range(2):
+        parcels.ParcelsRandom.seed(1234)
+        pset = ParticleSet(fieldset, pclass=ScipyParticle, lon=np.full(100, 5.0), lat=np.full(100, 4.0))
+        pset.execute(parcels.AdvectionDiffusionM1, runtime=1000, dt=100, vectorized=True)
+        lons.append(pset.lon)
+    assert np.array_equal(lons[0], lons[1])  # reproducible with the Parcels seed
+    assert len(np.unique(lons[0])) == 100  # particles draw independent random numbers
+
+
+def test_execution_vectorized_errors():
+    fieldset = _fieldset_vectorized()
+
+    def MoveEast(particle, fieldset, time):  # pragma: no cover
+        particle_dlon += 1  # noqa
+
+    pset = ParticleSet(fieldset, pclass=ScipyParticle, lon=[1, 8], lat=[1, 1])
+    with pytest.raises(FieldOutOfBoundError):
+        pset.execute([MoveEast, AdvectionRK4], runtime=5, dt=1, vectorized=True)
+
+    def DeleteOutOfBounds(particle, fieldset, time):  # pragma: no cover
+        if particle.state == StatusCode.ErrorOutOfBounds:
+            particle.delete()
+
+    pset = ParticleSet(fieldset, pclass=ScipyParticle, lon=[1, 8], lat=[1, 1])
+    with pytest.warns(parcels.KernelWarning, match="can not be vectorized"):
+        pset.execute([MoveEast, AdvectionRK4, DeleteOutOfBounds], runtime=5, dt=1, vectorized=True)
+    assert len(pset) == 1 and pset.lon[0] > 4
+
+    pset = ParticleSet(fieldset, pclass=JITParticle, lon=[1], lat=[1])
+    with pytest.raises(ValueError, match="only available for ScipyParticles"):
+        pset.execute(AdvectionRK4, runtime=5, dt=1, vectorized=True)
@@ -1,11 +1,14 @@
 import os
 import tempfile
+import threading
 from datetime import timedelta
 
 import cftime
+import numcodecs
 import numpy as np
 import pytest
 import xarray as xr
+import zarr
 from zarr.storage import MemoryStore
 
 import parcels
@@ -18,7 +21,7 @@ from parcels import (
     ScipyParticle,
     Variable,
 )
-from parcels.particlefile import _set_calendar
+from parcels.particlefile import _set_calendar, _TrajectoryIndex
 from parcels.tools.converters import _get_cftime_calendars, _get_cftime_datetimes
 from tests.common_kernels import DoNothing
 from tests.utils import create_fieldset_zeros_simple
@@ -245,6 +248,244 @@ def test_pfile_chunks_repeatedrelease(fieldset, mode, repeatdt, nump, tmp_zarrfi
     assert ds["time"].shape == (int(nump * runtime / repeatdt), chunks[1])
 
 
+@pytest.mark.parametrize("mode", ["scipy", "jit"])
+@pytest.mark.parametrize("buffer_obs, max_buffer_size", [(3, 256), (100, 256), (100, 1e-4)])
+def test_pfile_buffered_write(fieldset, mode, buffer_obs, max_buffer_size, tmp_path):
+    MyParticle = ptype[mode].add_variables(
+        [Variable("sample_var", initial=0.0), Variable("v_once", dtype=np.float64, initial=0.0, to_write="once")]
+    )
+
+    def IncrVar(particle, fieldset, time):  # pragma: no cover
+        particle.sample_var += 1.0
+        if particle.sample_var > 5:
+            particle.delete()
+
+    stores = {}
+    for buffered in [False, True]:
+        MyParticle.setLastID(0)
+        pset = ParticleSet(fieldset, lon=[0, 0.5], lat=[0, 0.5], pclass=MyParticle, repeatdt=2)
+        kwargs = dict(buffer_obs=buffer_obs, max_buffer_size=max_buffer_size) if buffered else {}
+        stores[buffered] = str(tmp_path / f"buffered{buffered}.zarr")
+        pfile = pset.ParticleFile(stores[buffered], outputdt=1, chunks=(3, 2), **kwargs)
+        for _ in range(3):
+            pset.execute(IncrVar, dt=1, runtime=4, output_file=pfile)
+        assert len(pfile._buffer) == 0  # written at the end of each execute
+
+    ds, ds_buffered = (xr.open_zarr(stores[buffered]) for buffered in [False, True])
+    assert ds.sizes == ds_buffered.sizes
+    for var in ["time", "lon", "sample_var", "v_once", "trajectory"]:
+        assert ds[var].encoding["chunks"] == ds_buffered[var].encoding["chunks"]
+        np.testing.assert_array_equal(ds[var].values, ds_buffered[var].values)
+
+
+def test_pfile_buffered_write_existing_store(fieldset, tmp_path):
+    def IncrLon(particle, fieldset, time):  # pragma: no cover
+        particle_dlon += 0.1  # noqa
+
+    store = str(tmp_path / "existing.zarr")
+    ScipyParticle.setLastID(0)
+    pset = ParticleSet(fieldset, pclass=ScipyParticle, lon=[0, 0.5], lat=[0, 0.5])
+    pset.execute(IncrLon, dt=1, runtime=3, output_file=pset.ParticleFile(store, outputdt=1, chunks=(2, 4)))
+    lon = xr.open_zarr(store)["lon"].values
+
+    ScipyParticle.setLastID(0)
+    pset = ParticleSet(fieldset, pclass=ScipyParticle, lon=[0.2, 0.7], lat=[0, 0.5])
+    pfile = pset.ParticleFile(store, outputdt=1, chunks=(2, 4), create_new_zarrfile=False, buffer_obs=2)
+    pset.execute(IncrLon, dt=1, runtime=1, output_file=pfile)
+    lon[:, 0] = [0.2, 0.7]
+    np.testing.assert_allclose(xr.open_zarr(store)["lon"].values, lon)  # the later observations are kept
+
+
+def test_pfile_buffered_write_failing_kernel(fieldset, tmp_path, monkeypatch):
+    def FailingKernel(particle, fieldset, time):  # pragma: no cover
+        if time >= 2:
+            raise RuntimeError("kernel failed")
+
+    flushes = []
+
+    def failing_flush(self):
+        flushes.append(self)
+        raise OSError("disk full")
+
+    monkeypatch.setattr(parcels.ParticleFile, "flush", failing_flush)
+    pset = ParticleSet(fieldset, pclass=ScipyParticle, lon=[0.2, 0.7], lat=[0, 0.5])
+    pfile = pset.ParticleFile(str(tmp_path / "failing.zarr"), outputdt=1, buffer_obs=10)
+    with pytest.raises(RuntimeError, match="kernel failed"):  # not hidden by the error of the flush
+        pset.execute(FailingKernel, dt=1, runtime=5, output_file=pfile)
+    assert len(flushes) == 1  # the output was still flushed
+
+
+@pytest.mark.parametrize("mode", ["scipy", "jit"])
+@pytest.mark.parametrize("buffer_obs", [None, 3])
+def test_pfile_asynchronous_write(fieldset, mode, buffer_obs, tmp_path):
+    def IncrLon(particle, fieldset, time):  # pragma: no cover
+        particle_dlon += 0.01  # noqa
+
+    stores = {}
+    for asynchronous in [False, True]:
+        ptype[mode].setLastID(0)
+        pset = ParticleSet(fieldset, pclass=ptype[mode], lon=np.zeros(5), lat=np.linspace(0, 1, 5), repeatdt=3)
+        stores[asynchronous] = str(tmp_path / f"async{asynchronous}.zarr")
+        pfile = pset.ParticleFile(
+            stores[asynchronous], outputdt=1, chunks=(4, 2), buffer_obs=buffer_obs, asynchronous=asynchronous
+        )
+        pset.execute(IncrLon, dt=1, runtime=10, output_file=pfile)
+        assert len(pfile._pending_writes) == 0  # execute waits for the writer thread
+        pfile.close()
+        assert pfile._writer is None
+    ds, ds_async = (xr.open_zarr(stores[asynchronous]) for asynchronous in [False, True])
+    for var in ["time", "lon", "lat", "trajectory"]:
+        np.testing.assert_array_equal(ds[var].values, ds_async[var].values)
+
+
+@pytest.mark.parametrize("buffer_obs", [None, 3])
+def test_pfile_asynchronous_write_failing(fieldset, buffer_obs, tmp_path, monkeypatch):
+    def IncrLon(particle, fieldset, time):  # pragma: no cover
+        particle_dlon += 0.01  # noqa
+
+    threads = []
+
+    def failing_write_buffer(self, buffer, ntrajs):
+        threads.append(threading.current_thread())
+        raise OSError("disk full")
+
+    monkeypatch.setattr(parcels.ParticleFile, "_write_buffer", failing_write_buffer)
+    pset = ParticleSet(fieldset, pclass=ScipyParticle, lon=np.zeros(5), lat=np.linspace(0, 1, 5))
+    pfile = pset.ParticleFile(str(tmp_path / "failing.zarr"), outputdt=1, buffer_obs=buffer_obs, asynchronous=True)
+    with pytest.raises(OSError, match="disk full"):
+        pset.execute(IncrLon, dt=1, runtime=10, output_file=pfile)
+    assert threads and all(thread is not threading.main_thread() for thread in threads)
+    assert len(pfile._pending_writes) == 0  # the writes after the failed write are cancelled or waited for
+    pfile.close()
+    assert pfile._writer is None
+
+
+@pytest.mark.parametrize("mode", ["scipy", "jit"])
+@pytest.mark.parametrize("buffer_obs", [None, 4])
+def test_pfile_ragged_layout(fieldset, mode, buffer_obs, tmp_path):
+    MyParticle = ptype[mode].add_variables(
+        [Variable("sample_var", initial=0.0), Variable("v_once", dtype=np.float64, initial=0.0, to_write="once")]
+    )
+
+    def IncrVar(particle, fieldset, time):  # pragma: no cover
+        particle.sample_var += 1.0
+        if particle.sample_var > 4:
+            particle.delete()
+
+    stores = {}
+    for layout in ["dense", "ragged"]:
+        MyParticle.setLastID(0)
+        pset = ParticleSet(fieldset, lon=[0, 0.5], lat=[0, 0.5], pclass=MyParticle, repeatdt=2)
+        stores[layout] = str(tmp_path / f"{layout}.zarr")
+        pfile = pset.ParticleFile(stores[layout], outputdt=1, chunks=(3, 2), buffer_obs=buffer_obs, layout=layout)
+        for _ in range(2):
+            pset.execute(IncrVar, dt=1, runtime=6, output_file=pfile)
+
+    ds = xr.open_zarr(stores["dense"])
+    ragged = xr.open_zarr(stores["ragged"])
+    nobs = int(np.isfinite(ds["lon"].values).sum())
+    assert ragged.sizes["obs"] == nobs  # only the real observations are stored
+    assert np.all(np.isfinite(ragged["lon"].values))
+    assert ragged["trajectory_index"].attrs["instance_dimension"] == "trajectory"
+    assert ragged["rowSize"].values.sum() == nobs
+
+    trajectories = parcels.RaggedTrajectories(stores["ragged"])
+    assert len(trajectories) == ds.sizes["trajectory"]
+    for i in [0, 3, -1]:
+        lon = ds["lon"].values[i]
+        np.testing.assert_array_equal(trajectories[i]["lon"].values, lon[np.isfinite(lon)])
+    for i in [len(trajectories), -len(trajectories) - 1]:
+        with pytest.raises(IndexError, match="out of range"):
+            trajectories[i]
+    assert [t["trajectory"].item() for t in trajectories] == list(ds["trajectory"].values)
+    dense = trajectories.to_dense()
+    for var in ["time", "lon", "sample_var", "v_once", "trajectory"]:
+        expected = ds[var].values if "obs" not in ds[var].dims else ds[var].values[:, : dense.sizes["obs"]]
+        np.testing.assert_array_equal(dense[var].values, expected)
+
+    with pytest.raises(ValueError, match="ragged layout"):
+        parcels.RaggedTrajectories(stores["dense"])
+
+
+@pytest.mark.parametrize("layout", ["dense", "ragged"])
+def test_pfile_encoding(fieldset, layout, tmp_path):
+    MyParticle = ScipyParticle.add_variable(
+        Variable("sample_var", initial=0.0, encoding={"compressor": "zstd", "clevel": 3, "shuffle": "bit"})
+    )
+
+    def Move(particle, fieldset, time):  # pragma: no cover
+        particle.lon += 0.0123457
+        particle.lat -= 0.0234567
+        particle.sample_var += 1.0
+
+    encoding = {
+        "lon": {"quantize": 3},
+        "lat": {"bitround": 10, "compressor": "none"},
+        "id": {"delta": True},
+        "time": {"delta": True},
+    }
+    stores = {}
+    for name, enc in [("reference", None), ("encoded", encoding)]:
+        MyParticle.setLastID(0)
+        pset = ParticleSet(fieldset, lon=[0, 0.5], lat=[0.5, 0], pclass=MyParticle, repeatdt=2)
+        stores[name] = str(tmp_path / f"{name}.zarr")
+        pfile = pset.ParticleFile(stores[name], outputdt=1, chunks=(3, 2), layout=layout, encoding=enc)
+        pset.execute(Move, dt=1, runtime=6, output_file=pfile)
+
+    ref, ds = xr.open_zarr(stores["reference"]), xr.open_zarr(stores["encoded"])
+    np.testing.assert_allclose(ds["lon"].values, ref["lon"].values, atol=1e-3)
+    np.testing.assert_allclose(ds["lat"].values, ref["lat"].values, rtol=2**-10)
+    assert not np.array_equal(ds["lon"].values, ref["lon"].values, equal_nan=True)
+    for var in ["time", "sample_var", "trajectory"]:
+        np.testing.assert_array_equal(ds[var].values, ref[var].values)
+    if layout == "dense":
+        assert np.isnat(ds["time"].values).any()  # the fill values of the delta encoded times round-trip as well
+
+    Z = zarr.open_group(stores["encoded"], mode="r")
+    assert Z["sample_var"].compressor == numcodecs.Blosc("zstd", clevel=3, shuffle=numcodecs.Blosc.BITSHUFFLE)
+    assert Z["lat"].compressor is None and isinstance(Z["lat"].filters[0], numcodecs.BitRound)
+    assert isinstance(Z["lon"].filters[0], numcodecs.Quantize)
+    assert isinstance(Z["trajectory"].filters[0], numcodecs.Delta)
+    assert Z["time"].dtype == np.float64 and Z["time"].filters == [numcodecs.Delta(dtype="<i8")]
+
+
+@pytest.mark.parametrize(
+    "encoding, error",
+    [
+        ({"lon": {"precision": 3}}, "Unknown encoding options"),
+        ({"id": {"quantize": 3}}, "Quantization"),
+        ({"lon": {"bitround": 10, "quantize": 3}}, "either bitround or quantize"),
+        ({"lon": {"shuffle": "word"}}, "Unknown shuffle"),
+        ({"lon": {"compressor": "lzma"}}, "Unknown compressor"),
+        ({"obs_written": {"compressor": "zstd"}}, "not written"),
+    ],
+)
+def test_pfile_encoding_invalid(fieldset, encoding, error, tmp_path):
+    pset = ParticleSet(fieldset, lon=[0], lat=[0], pclass=ScipyParticle)
+    with pytest.raises(ValueError, match=error):
+        pset.ParticleFile(tmp_path / "invalid.zarr", outputdt=1, encoding=encoding)
+
+
+@pytest.mark.parametrize("spacing", [1, 3, 10**9])
+def test_trajectory_index(spacing):
+    rng = np.random.default_rng(1)
+    index, reference = _TrajectoryIndex(), {}
+    for step in range(20):
+        # the particles that are alive: some of the earlier ones, and a release of new ones
+        pids = np.concatenate([rng.choice(step * 10, size=step * 5), np.arange(step * 10, step * 10 + 10)])
+        pids = rng.permutation(pids * spacing + 5)
+        for pid in sorted(set(pids) - set(reference.keys())):
+            reference[pid] = len(reference)  # new rows are given in order of id
+        rows = index.rows(pids)
+        assert rows.dtype == np.int64
+        assert np.array_equal(rows, [reference[p] for p in pids])
+        assert len(index) == len(reference)
+    assert (index._table is not None) == (spacing < _TrajectoryIndex.DENSE_SPAN)
+    assert np.array_equal(index.keys(), sorted(reference.keys()))
+    assert index[pids[0]] == reference[pids[0]] and -1 not in index
+    assert index.as_dict() == reference
+
+
 @pytest.mark.parametrize("mode", ["scipy", "jit"])
 def test_write_timebackward(fieldset, mode, tmp_zarrfile):
     def Update_lon(particle, fieldset, time):  # pragma: no cover
@@ -277,7 +518,7 @@ def test_write_xiyi(fieldset, mode, tmp_zarrfile):
     def Get_XiYi(particle, fieldset, time):  # pragma: no cover
         """Kernel to sample the grid indices of the particle.
         Note that this sampling should be done _before_ the advection kernel
-        and that the first outputted value is zero.
+        and that the first outputted value is -1 (i.e. not searched yet).
         Be careful when using multiple grids, as the index may be different for the grids.
         """
         particle.pxi0 = particle.xi[0]
@@ -300,8 +541,8 @@ def test_write_xiyi(fieldset, mode, tmp_zarrfile):
     lats = ds["lat"][:].values
 
     for p in range(pyi.shape[0]):
-        assert (pxi0[p, 0] == 0) and (pxi0[p, -1] == pset[p].pxi0)  # check that particle has moved
-        assert np.all(pxi1[p, :6] == 0)  # check that particle has not been sampled on grid 1 until time 6
+        assert (pxi0[p, 0] == -1) and (pxi0[p, -1] == pset[p].pxi0)  # check that particle has moved
+        assert np.all(pxi1[p, :6] == -1)  # check that particle has not been sampled on grid 1 until time 6
         assert np.all(pxi1[p, 6:] > 0)  # check that particle has not been sampled on grid 1 after time 6
         for xi, lon in zip(pxi0[p, 1:], lons[p, 1:], strict=True):
             assert fieldset.U.grid.lon[xi] <= lon < fieldset.U.grid.lon[xi + 1]
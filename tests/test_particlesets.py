@@ -1,5 +1,8 @@
+import ctypes
+
 import numpy as np
 import pytest
+import xarray as xr
 
 from parcels import (
     CurvilinearZGrid,
@@ -12,6 +15,7 @@ from parcels import (
     StatusCode,
     Variable,
 )
+from parcels.particledata import ParticleData
 from tests.common_kernels import DoNothing
 from tests.utils import create_fieldset_zeros_simple
 
@@ -230,6 +234,22 @@ def test_pset_repeatdt_custominit(fieldset, mode):
     assert np.allclose([p.sample_var for p in pset], 5.0)
 
 
+@pytest.mark.parametrize("mode", ["scipy", "jit"])
+def test_pset_repeatdt_growable_storage(fieldset, mode):
+    def IncrLon(particle, fieldset, time):  # pragma: no cover
+        particle_dlon += 0.01  # noqa
+
+    pset = ParticleSet(fieldset, lon=[0, 0], lat=[0, 0], pclass=ptype[mode], repeatdt=1)
+    pset.execute(IncrLon, dt=1, runtime=40)
+    assert pset.size == 82
+    assert pset.particledata._capacity == 128  # capacity is doubled when the storage is full
+    assert np.allclose(pset.lon, np.append(np.repeat(np.arange(39, -1, -1), 2), [0, 0]) * 0.01)
+
+    # the ctypes struct points directly to the buffers
+    cstruct = pset.particledata.cstruct()
+    assert ctypes.addressof(cstruct.lon.contents) == pset.particledata._buffers["lon"].ctypes.data
+
+
 @pytest.mark.parametrize("mode", ["scipy", "jit"])
 def test_pset_stop_simulation(fieldset, mode):
     pset = ParticleSet(fieldset, lon=0, lat=0, pclass=ptype[mode])
@@ -373,6 +393,49 @@ def test_pset_remove_kernel(fieldset, mode):
     assert pset.size == 40
 
 
+@pytest.mark.parametrize("mode", ["scipy", "jit"])
+def test_pset_remove_kernel_deferred(fieldset, mode, tmp_path, monkeypatch):
+    """Particles deleted during execute are marked as deleted and only compacted when needed."""
+    npart = 100
+
+    def DeleteKernel(particle, fieldset, time):  # pragma: no cover
+        if particle.lon < time / 20:
+            particle.delete()
+
+    results = {}
+    for threshold in [0, 0.25]:
+        monkeypatch.setattr(ParticleData, "_compaction_threshold", threshold)
+        sizes = []
+        pset = ParticleSet(fieldset, pclass=ptype[mode], lon=np.linspace(0, 0.99, npart), lat=np.zeros(npart))
+        pfile = pset.ParticleFile(tmp_path / f"deferred{threshold}.zarr", outputdt=1)
+        pset.execute(
+            DeleteKernel,
+            runtime=10,
+            dt=1,
+            output_file=pfile,
+            callbackdt=5,
+            postIterationCallbacks=[lambda: sizes.append((len(pset), pset.particledata._ndeleted))],  # noqa: B023
+        )
+        assert pset.particledata._ndeleted == 0
+        assert np.all(pset.lon >= 0.45)
+        ds = xr.open_zarr(tmp_path / f"deferred{threshold}.zarr")
+        results[threshold] = (sizes, pset.size, np.isfinite(ds["lon"].values).sum(axis=1))
+
+    assert results[0][0] == results[0.25][0]
+    assert results[0][1] == results[0.25][1] == 54
+    assert np.array_equal(results[0][2], results[0.25][2])
+
+    # Deleted particles keep their index until the dead fraction exceeds the threshold
+    pset = ParticleSet(fieldset, pclass=ptype[mode], lon=np.linspace(0, 0.99, npart), lat=np.zeros(npart))
+    pset.particledata._defer_deletion = True
+    pset.remove_indices(np.arange(20))
+    assert len(pset) == npart and pset.particledata._ndeleted == 20
+    assert pset[20].lon == pset.lon[20]
+    pset.remove_indices(np.arange(20, 30))
+    assert len(pset) == 70 and pset.particledata._ndeleted == 0
+    assert np.isclose(pset.lon[0], 0.3)
+
+
 @pytest.mark.parametrize("mode", ["scipy", "jit"])
 def test_pset_multi_execute(fieldset, mode):
     npart = 10
@@ -1,5 +1,6 @@
 """General helper functions and utilies for test suite."""
 
+import os
 from pathlib import Path
 
 import numpy as np
@@ -116,3 +117,22 @@ def create_fieldset_zeros_simple(xdim=40, ydim=100, withtime=False):
 
 def assert_empty_folder(path: Path):
     assert [p.name for p in path.iterdir()] == []
+
+
+def create_uv_snapshot_files(directory, lon, lat, U, V, times=None):
+    """Write U and V, as (time, lat, lon) arrays, to one netCDF file per time snapshot, and return the file names."""
+    files = []
+    for t in range(len(U)):
+        coords = {"lon": lon, "lat": lat}
+        if times is not None:
+            coords["time"] = [times[t]]
+        ds = xr.Dataset(
+            {
+                "U": (("time", "lat", "lon"), np.asarray(U[t : t + 1], dtype=np.float32)),
+                "V": (("time", "lat", "lon"), np.asarray(V[t : t + 1], dtype=np.float32)),
+            },
+            coords=coords,
+        )
+        files.append(os.path.join(str(directory), f"snapshot{t}.nc"))
+        ds.to_netcdf(files[-1])
+    return files